@@ -0,0 +1,265 @@
+# app/aio.py
+"""
+Asyncio counterparts of the authentication, student, course and reporting
+services, for embedding the system in an event loop.
+
+sqlite3 and bcrypt both block, so nothing here runs on the loop itself:
+database work goes to a dedicated thread pool whose threads each use their
+own pooled connection, and bcrypt goes to a separate pool sized to the CPU
+count (bcrypt releases the GIL, so threads hash in parallel). Keeping the
+two apart means a burst of logins can't starve queries of workers, and vice
+versa. Unlike app.services these never prompt or print; they return data
+and raise on errors.
+
+    async with AsyncRuntime():
+        session = await AsyncAuthenticationService.login("alice", "secret")
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.database import get_pool, transaction
+from app.models import Course, Enrollment, Student, User
+from app.reports import cohort_standings, course_statistics, instructor_workloads
+from app.search import search_courses, search_students
+from app.sessions import session_store
+from app.transcripts import fetch_transcripts
+from app.utils import DEFAULT_BCRYPT_ROUNDS, hash_password, verify_password
+
+DEFAULT_PAGE_LIMIT = 100
+
+
+class AsyncRuntime:
+    """
+    The executors that async services run their blocking work on. Used as an
+    async context manager it becomes the default runtime until exit.
+    """
+    def __init__(self, db_workers=None, hash_workers=None):
+        # One connection per DB worker, so don't start more workers than the pool allows.
+        self.db_workers = min(db_workers or get_pool().max_size, get_pool().max_size)
+        self.hash_workers = hash_workers or os.cpu_count() or 1
+        self.db_executor = ThreadPoolExecutor(self.db_workers, thread_name_prefix="aio-db")
+        self.hash_executor = ThreadPoolExecutor(self.hash_workers, thread_name_prefix="aio-bcrypt")
+        self._previous = None
+
+    async def run_db(self, function, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.db_executor, functools.partial(function, *args, **kwargs))
+
+    async def run_hash(self, function, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.hash_executor, functools.partial(function, *args, **kwargs))
+
+    def close(self, wait=True):
+        self.db_executor.shutdown(wait=wait)
+        self.hash_executor.shutdown(wait=wait)
+
+    async def __aenter__(self):
+        self._previous = set_runtime(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        set_runtime(self._previous)
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime():
+    """
+    Returns the default runtime, creating one on first use.
+    """
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = AsyncRuntime()
+        return _runtime
+
+
+def set_runtime(runtime):
+    """
+    Makes `runtime` the default and returns the previous one (which may be None).
+    """
+    global _runtime
+    with _runtime_lock:
+        previous, _runtime = _runtime, runtime
+    return previous
+
+
+def _require(row, message):
+    if not row:
+        raise LookupError(message)
+    return row
+
+
+class AsyncAuthenticationService:
+    @staticmethod
+    async def login(username, password):
+        """
+        Verifies the password and returns a new Session, or None.
+        """
+        runtime = get_runtime()
+        user = await runtime.run_db(User.find_by_username, username)
+        if not user or not await runtime.run_hash(verify_password, password, user[2]):
+            return None
+        return await runtime.run_db(session_store.create, user)
+
+    @staticmethod
+    async def logout(token):
+        return session_store.revoke(token)
+
+    @staticmethod
+    async def get_session(token):
+        return session_store.get(token)
+
+    @staticmethod
+    async def register_user(username, password, role="student", rounds=DEFAULT_BCRYPT_ROUNDS):
+        """
+        Creates a user; returns False if the username is taken.
+        """
+        runtime = get_runtime()
+        if await runtime.run_db(User.find_by_username, username):
+            return False
+        password_hash = await runtime.run_hash(hash_password, password, rounds)
+        await runtime.run_db(lambda: User(username, password_hash, role).create())
+        return True
+
+
+def _create_student(username, password_hash, reg_no, first_name, last_name, admission_date, major, status):
+    with transaction():
+        user = User(username, password_hash, "student")
+        user.create()
+        Student(user.cursor.lastrowid, reg_no, first_name, last_name, admission_date, major, status).create()
+    return Student.find_by_reg_no(reg_no)
+
+
+def _update_student(reg_no, changes):
+    student = _require(Student.find_by_reg_no(reg_no), "Student not found.")
+    current = {'first_name': student[3], 'last_name': student[4], 'major': student[6], 'status': student[7]}
+    current.update({name: value for name, value in changes.items() if value is not None})
+    Student(*student[1:]).update(**current)
+    return Student.find_by_reg_no(reg_no)
+
+
+class AsyncStudentService:
+    @staticmethod
+    async def add_student(username, password, reg_no, first_name, last_name, admission_date, major,
+                          status="active", rounds=DEFAULT_BCRYPT_ROUNDS):
+        """
+        Creates the student's user account and profile in one transaction and
+        returns the Students row.
+        """
+        runtime = get_runtime()
+        if await runtime.run_db(User.find_by_username, username):
+            raise ValueError("Username already exists.")
+        password_hash = await runtime.run_hash(hash_password, password, rounds)
+        return await runtime.run_db(_create_student, username, password_hash, reg_no, first_name, last_name,
+                                    admission_date, major, status)
+
+    @staticmethod
+    async def get_student(reg_no):
+        return await get_runtime().run_db(Student.find_by_reg_no, reg_no)
+
+    @staticmethod
+    async def list_students(status=None, major=None, limit=DEFAULT_PAGE_LIMIT, after=None):
+        """
+        One page of Students rows; pass the last row's student_id as `after`
+        to get the next page.
+        """
+        def first_page():
+            return next(Student.find_pages(status=status, major=major, page_size=limit, after=after), [])
+
+        return await get_runtime().run_db(first_page)
+
+    @staticmethod
+    async def search_students(text, status=None):
+        return await get_runtime().run_db(search_students, text, status=status)
+
+    @staticmethod
+    async def update_student(reg_no, first_name=None, last_name=None, major=None, status=None):
+        changes = {'first_name': first_name, 'last_name': last_name, 'major': major, 'status': status}
+        return await get_runtime().run_db(_update_student, reg_no, changes)
+
+    @staticmethod
+    async def delete_student(reg_no):
+        await get_runtime().run_db(Student.delete, reg_no)
+
+    @staticmethod
+    async def get_transcript(reg_no):
+        def load():
+            student = _require(Student.find_by_reg_no(reg_no), "Student not found.")
+            return fetch_transcripts([student[0]])[0]
+
+        return await get_runtime().run_db(load)
+
+
+def _create_course(course_code, title, credits, max_enrollment, instructor_id, status):
+    Course(course_code, title, credits, max_enrollment, instructor_id, status).create()
+    return Course.find_by_course_code(course_code)
+
+
+def _update_course(course_code, changes):
+    course = _require(Course.find_by_course_code(course_code), "Course not found.")
+    current = {'title': course[2], 'credits': course[3], 'max_enrollment': course[4], 'status': course[6]}
+    current.update({name: value for name, value in changes.items() if value is not None})
+    Course(course_code, current['title'], current['credits'], current['max_enrollment'], course[5],
+           current['status']).update(**current)
+    return Course.find_by_course_code(course_code)
+
+
+class AsyncCourseService:
+    @staticmethod
+    async def add_course(course_code, title, credits, max_enrollment, instructor_id=None, status="active"):
+        return await get_runtime().run_db(_create_course, course_code, title, credits, max_enrollment,
+                                          instructor_id, status)
+
+    @staticmethod
+    async def get_course(course_code):
+        return await get_runtime().run_db(Course.find_by_course_code, course_code)
+
+    @staticmethod
+    async def list_courses(status='active'):
+        return await get_runtime().run_db(lambda: list(Course.stream(status=status)))
+
+    @staticmethod
+    async def search_courses(text, status='active'):
+        return await get_runtime().run_db(search_courses, text, status=status)
+
+    @staticmethod
+    async def update_course(course_code, title=None, credits=None, max_enrollment=None, status=None):
+        changes = {'title': title, 'credits': credits, 'max_enrollment': max_enrollment, 'status': status}
+        return await get_runtime().run_db(_update_course, course_code, changes)
+
+    @staticmethod
+    async def assign_instructor(course_code, instructor_id):
+        await get_runtime().run_db(Course.assign_instructor, course_code, instructor_id)
+
+    @staticmethod
+    async def delete_course(course_code):
+        await get_runtime().run_db(Course.delete, course_code)
+
+
+class AsyncReportingService:
+    @staticmethod
+    async def course_statistics(course_code=None, instructor_id=None, by_term=False):
+        return await get_runtime().run_db(course_statistics, course_code=course_code,
+                                          instructor_id=instructor_id, by_term=by_term)
+
+    @staticmethod
+    async def cohort_standings(major=None, admission_year=None, status=None):
+        return await get_runtime().run_db(cohort_standings, major=major, admission_year=admission_year,
+                                          status=status)
+
+    @staticmethod
+    async def instructor_workloads():
+        return await get_runtime().run_db(instructor_workloads)
+
+    @staticmethod
+    async def enrollment_statistics(course_code=None):
+        if course_code is None:
+            return await get_runtime().run_db(Enrollment.get_enrollment_statistics_for_all_courses)
+        return await get_runtime().run_db(Enrollment.get_enrollment_statistics_for_course, course_code)
@@ -0,0 +1,496 @@
+# app/api.py
+"""
+HTTP/JSON API over the models and reporting queries, built on http.server.
+
+Requests are handled on a bounded thread pool: the accept loop hands each
+connection to one of `workers` threads and stops accepting once 2 * workers
+connections are in flight, leaving the rest in the listen backlog. Each
+worker thread keeps its own pooled SQLite connection, so the connection pool
+is sized to the number of workers.
+
+Clients log in with POST /login and send the returned token as
+"Authorization: Bearer <token>". Sessions live in app.sessions, so role
+checks never touch the database.
+
+Usage: python -m app.api [--host HOST] [--port PORT] [--workers N] [--db PATH]
+                         [--query-stats] [--slow-query-ms MS]
+"""
+import json
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from app.database import DB_NAME, configure_pool, get_pool_stats, initialize_db, transaction
+from app.grade_upload import upload_grades
+from app.instrumentation import enable_query_monitoring, query_monitor
+from app.models import Course, Enrollment, Student, User
+from app.reports import cohort_standings, course_statistics, instructor_workloads
+from app.search import search_courses, search_students
+from app.sessions import session_store
+from app.transcripts import fetch_transcripts
+from app.utils import hash_password, verify_password
+
+DEFAULT_WORKERS = 8
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+MAX_BODY_BYTES = 1024 * 1024
+IDLE_TIMEOUT = 5
+
+STUDENT_FIELDS = ('student_id', 'user_id', 'reg_no', 'first_name', 'last_name', 'admission_date', 'major', 'status')
+COURSE_FIELDS = ('course_id', 'course_code', 'title', 'credits', 'max_enrollment', 'instructor_id', 'status', 'created_at')
+TRANSCRIPT_COURSE_FIELDS = ('year', 'semester', 'course_code', 'title', 'credits', 'status', 'grade', 'mark')
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiRequest:
+    def __init__(self, method, path_params, query, body, session):
+        self.method = method
+        self.path_params = path_params
+        self.query = query
+        self.body = body
+        self.session = session
+
+    def arg(self, name, default=None, convert=str):
+        if name not in self.query:
+            return default
+        value = self.query[name]
+        try:
+            return convert(value)
+        except ValueError:
+            raise ApiError(400, f"Invalid value for {name}: {value!r}")
+
+    def field(self, name, required=True):
+        if name in self.body and self.body[name] not in (None, ""):
+            return self.body[name]
+        if required:
+            raise ApiError(400, f"Missing field: {name}")
+        return None
+
+
+ROUTES = []
+
+
+def route(method, pattern, roles=None):
+    """
+    Registers a handler for `method` and a path such as "/students/{reg_no}".
+    `roles` lists the roles allowed to call it; None means no login needed.
+    Routes are matched in registration order.
+    """
+    regex = re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", pattern) + "$")
+
+    def register(handler):
+        ROUTES.append((method, regex, roles, handler))
+        return handler
+
+    return register
+
+
+def _as_dict(fields, row):
+    return dict(zip(fields, row)) if row is not None else None
+
+
+def _require_student_access(request, reg_no):
+    """
+    Admins may see any student; a student may only see their own record.
+    """
+    student = Student.find_by_reg_no(reg_no)
+    if not student:
+        raise ApiError(404, "Student not found.")
+    if request.session.role != "admin" and student[0] != request.session.student_id:
+        raise ApiError(403, "Not allowed to view this student.")
+    return student
+
+
+def _find_course(course_code):
+    course = Course.find_by_course_code(course_code)
+    if not course:
+        raise ApiError(404, "Course not found.")
+    return course
+
+
+@route("GET", "/health")
+def health(request):
+    return {"status": "ok", "pool": get_pool_stats(), "sessions": len(session_store)}
+
+
+@route("POST", "/login")
+def login(request):
+    user = User.find_by_username(request.field("username"))
+    if not user or not verify_password(request.field("password"), user[2]):
+        raise ApiError(401, "Invalid username or password.")
+    session = session_store.create(user)
+    return {"token": session.token, "user_id": session.user_id, "role": session.role,
+            "expires_in": session_store.ttl}
+
+
+@route("POST", "/logout", roles=("admin", "instructor", "student"))
+def logout(request):
+    session_store.revoke(request.session.token)
+    return {"logged_out": True}
+
+
+@route("GET", "/students", roles=("admin",))
+def list_students(request):
+    limit = min(request.arg("limit", DEFAULT_PAGE_LIMIT, int), MAX_PAGE_LIMIT)
+    pages = Student.find_pages(status=request.arg("status"), major=request.arg("major"),
+                               page_size=limit, after=request.arg("after", None, int))
+    rows = next(pages, [])
+    return {
+        "students": [_as_dict(STUDENT_FIELDS, row) for row in rows],
+        "next_after": rows[-1][0] if len(rows) == limit else None,
+    }
+
+
+@route("GET", "/students/search", roles=("admin",))
+def find_students(request):
+    fields = ('student_id', 'reg_no', 'first_name', 'last_name', 'major', 'status')
+    rows = search_students(request.arg("q", ""), status=request.arg("status"))
+    return {"students": [_as_dict(fields, row) for row in rows]}
+
+
+@route("POST", "/students", roles=("admin",))
+def create_student(request):
+    username, password = request.field("username"), request.field("password")
+    values = [request.field(name) for name in ('reg_no', 'first_name', 'last_name', 'admission_date', 'major')]
+    status = request.field("status", required=False) or "active"
+    if User.find_by_username(username):
+        raise ApiError(409, "Username already exists.")
+    password_hash = hash_password(password)
+    with transaction():
+        user = User(username, password_hash, "student")
+        user.create()
+        Student(user.cursor.lastrowid, *values, status).create()
+    return 201, _as_dict(STUDENT_FIELDS, Student.find_by_reg_no(values[0]))
+
+
+@route("GET", "/students/{reg_no}", roles=("admin", "student"))
+def get_student(request):
+    return _as_dict(STUDENT_FIELDS, _require_student_access(request, request.path_params["reg_no"]))
+
+
+@route("PUT", "/students/{reg_no}", roles=("admin",))
+def update_student(request):
+    student = Student.find_by_reg_no(request.path_params["reg_no"])
+    if not student:
+        raise ApiError(404, "Student not found.")
+    current = _as_dict(STUDENT_FIELDS, student)
+    changes = {name: request.body.get(name) or current[name] for name in ('first_name', 'last_name', 'major', 'status')}
+    Student(*student[1:]).update(**changes)
+    return _as_dict(STUDENT_FIELDS, Student.find_by_reg_no(current["reg_no"]))
+
+
+@route("DELETE", "/students/{reg_no}", roles=("admin",))
+def delete_student(request):
+    if not Student.find_by_reg_no(request.path_params["reg_no"]):
+        raise ApiError(404, "Student not found.")
+    Student.delete(request.path_params["reg_no"])
+    return {"deleted": request.path_params["reg_no"]}
+
+
+@route("GET", "/students/{reg_no}/transcript", roles=("admin", "student"))
+def get_transcript(request):
+    student = _require_student_access(request, request.path_params["reg_no"])
+    transcript = fetch_transcripts([student[0]])[0]
+    return {
+        "reg_no": transcript.reg_no, "name": transcript.name, "major": transcript.major,
+        "admission_date": transcript.admission_date, "status": transcript.status,
+        "gpa": transcript.gpa, "weighted_gpa": transcript.weighted_gpa, "honours": transcript.honours,
+        "courses": [_as_dict(TRANSCRIPT_COURSE_FIELDS, course) for course in transcript.courses],
+    }
+
+
+@route("GET", "/courses", roles=("admin", "instructor", "student"))
+def list_courses(request):
+    fields = ('course_code', 'title', 'credits', 'max_enrollment', 'staff_no', 'instructor_name')
+    limit = min(request.arg("limit", DEFAULT_PAGE_LIMIT, int), MAX_PAGE_LIMIT)
+    pages = Course.find_pages(status=request.arg("status", "active"), page_size=limit,
+                              after=request.arg("after", None, int), with_key=True)
+    rows = next(pages, [])
+    return {
+        "courses": [_as_dict(fields, row[1:]) for row in rows],
+        "next_after": rows[-1][0] if len(rows) == limit else None,
+    }
+
+
+@route("GET", "/courses/search", roles=("admin", "instructor", "student"))
+def find_courses(request):
+    fields = ('course_id', 'course_code', 'title', 'credits', 'status')
+    return {"courses": [_as_dict(fields, row) for row in search_courses(request.arg("q", ""))]}
+
+
+@route("POST", "/courses", roles=("admin",))
+def create_course(request):
+    course_code = request.field("course_code")
+    Course(course_code, request.field("title"), int(request.field("credits")),
+           int(request.field("max_enrollment")), request.field("instructor_id", required=False),
+           request.field("status", required=False) or "active").create()
+    return 201, _as_dict(COURSE_FIELDS, Course.find_by_course_code(course_code))
+
+
+@route("GET", "/courses/{course_code}", roles=("admin", "instructor", "student"))
+def get_course(request):
+    return _as_dict(COURSE_FIELDS, _find_course(request.path_params["course_code"]))
+
+
+@route("PUT", "/courses/{course_code}", roles=("admin",))
+def update_course(request):
+    current = _as_dict(COURSE_FIELDS, _find_course(request.path_params["course_code"]))
+    changes = {name: request.body.get(name) or current[name] for name in ('title', 'credits', 'max_enrollment', 'status')}
+    with transaction():
+        Course(current["course_code"], changes["title"], changes["credits"], changes["max_enrollment"],
+               current["instructor_id"], changes["status"]).update(**changes)
+        if request.body.get("instructor_id") is not None:
+            Course.assign_instructor(current["course_code"], int(request.body["instructor_id"]))
+    course = Course.find_by_course_code(current["course_code"])
+    return _as_dict(COURSE_FIELDS, course) if course else {"course_code": current["course_code"], "status": changes["status"]}
+
+
+@route("DELETE", "/courses/{course_code}", roles=("admin",))
+def delete_course(request):
+    _find_course(request.path_params["course_code"])
+    Course.delete(request.path_params["course_code"])
+    return {"deleted": request.path_params["course_code"]}
+
+
+@route("POST", "/enrollments", roles=("admin",))
+def enroll(request):
+    """
+    Enrolls the students listed in "reg_nos" (or, without it, the active
+    students of the "major"/"admission_year" cohort) in "course_codes".
+    """
+    course_ids = []
+    for course_code in request.field("course_codes"):
+        course_ids.append(_find_course(course_code)[0])
+    reg_nos = request.field("reg_nos", required=False)
+    if reg_nos:
+        found = Student.find_ids_by_reg_nos(reg_nos)
+        missing = [reg_no for reg_no in reg_nos if reg_no not in found]
+        if missing:
+            raise ApiError(404, f"Unknown students: {', '.join(missing[:10])}")
+        student_ids = list(found.values())
+    else:
+        student_ids = Student.find_ids_by_cohort(major=request.field("major", required=False),
+                                                 admission_year=request.field("admission_year", required=False))
+    return Enrollment.bulk_enroll(student_ids, course_ids, int(request.field("year")), request.field("semester"))
+
+
+@route("POST", "/grades", roles=("instructor",))
+def submit_grades(request):
+    """
+    Submits [reg_no, course_code, mark(, comments)] rows for the logged-in instructor.
+    """
+    rows = [tuple(row) for row in request.field("rows")]
+    year = request.field("year", required=False)
+    result = upload_grades(rows, request.session.instructor_id, int(year) if year else None,
+                           request.field("semester", required=False))
+    return {"rows": result.rows, "imported": result.imported,
+            "rejects": [{"line": line, "reason": reason} for line, reason in result.rejects]}
+
+
+@route("GET", "/reports/courses/{course_code}", roles=("admin", "instructor"))
+def course_report(request):
+    course = _find_course(request.path_params["course_code"])
+    if request.session.role == "instructor" and course[5] != request.session.instructor_id:
+        raise ApiError(403, "Course not among your assigned courses.")
+    by_term = request.arg("by_term", "false").lower() in ("1", "true", "yes")
+    return {"statistics": [stats._asdict() for stats in course_statistics(course_code=course[1], by_term=by_term)]}
+
+
+@route("GET", "/reports/cohort", roles=("admin",))
+def cohort_report(request):
+    standings = cohort_standings(major=request.arg("major"), admission_year=request.arg("admission_year", None, int),
+                                 status=request.arg("status"))
+    return {"standings": [standing._asdict() for standing in standings]}
+
+
+@route("GET", "/reports/instructors", roles=("admin",))
+def workload_report(request):
+    return {"instructors": [workload._asdict() for workload in instructor_workloads()]}
+
+
+@route("GET", "/admin/queries", roles=("admin",))
+def query_report(request):
+    return {"enabled": query_monitor.enabled, "slow_query_ms": query_monitor.slow_query_seconds * 1000,
+            "queries": query_monitor.get_stats(), "slow_queries": query_monitor.get_slow_queries()}
+
+
+@route("GET", "/metrics", roles=("admin",))
+def metrics(request):
+    # Prometheus text exposition format; returned as text/plain.
+    return query_monitor.to_prometheus()
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = IDLE_TIMEOUT
+    # Headers and body go out in separate writes; without TCP_NODELAY, Nagle's
+    # algorithm and delayed ACKs add ~40 ms to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        try:
+            status, payload = 200, self._handle(method)
+            if isinstance(payload, tuple):
+                status, payload = payload
+        except ApiError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (ValueError, TypeError) as e:
+            status, payload = 400, {"error": str(e)}
+        except sqlite3.IntegrityError as e:
+            status, payload = 409, {"error": str(e)}
+        except Exception as e:
+            self.log_error("Unhandled error on %s %s: %r", method, self.path, e)
+            status, payload = 500, {"error": "Internal server error."}
+        if isinstance(payload, str):
+            self._send(status, payload.encode(), "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send(status, json.dumps(payload, default=str).encode(), "application/json")
+
+    def _handle(self, method):
+        # Read the body before anything can fail, so a keep-alive connection
+        # never has an unread request body left on it.
+        body = self._read_body()
+        url = urlsplit(self.path)
+        path = unquote(url.path).rstrip("/") or "/"
+        allowed = False
+        for route_method, regex, roles, handler in ROUTES:
+            match = regex.match(path)
+            if not match:
+                continue
+            allowed = True
+            if route_method != method:
+                continue
+            session = None
+            if roles is not None:
+                session = session_store.get(self._token())
+                if session is None:
+                    raise ApiError(401, "Login required.")
+                if session.role not in roles:
+                    raise ApiError(403, f"Requires role: {', '.join(roles)}.")
+            query = {name: values[0] for name, values in parse_qs(url.query).items()}
+            return handler(ApiRequest(method, match.groupdict(), query, body, session))
+        raise ApiError(405 if allowed else 404, "Method not allowed." if allowed else "Not found.")
+
+    def _token(self):
+        header = self.headers.get("Authorization", "")
+        return header[7:].strip() if header.startswith("Bearer ") else None
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(413, "Request body too large.")
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            raise ApiError(400, "Request body must be JSON.")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Request body must be a JSON object.")
+        return body
+
+    def _send(self, status, data, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class ApiServer(HTTPServer):
+    """
+    HTTPServer that handles connections on a fixed-size thread pool.
+    """
+    request_queue_size = 128
+
+    def __init__(self, address, workers=DEFAULT_WORKERS, quiet=False):
+        super().__init__(address, ApiRequestHandler)
+        self.workers = workers
+        self.quiet = quiet
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-worker")
+        self._slots = threading.BoundedSemaphore(workers * 2)
+
+    def process_request(self, request, client_address):
+        self._slots.acquire()
+        try:
+            self._executor.submit(self._process, request, client_address)
+        except RuntimeError:
+            # The executor is shutting down.
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+def create_server(host="127.0.0.1", port=8000, workers=DEFAULT_WORKERS, db_name=DB_NAME, profile=None, quiet=False):
+    """
+    Points the connection pool at `db_name` with one connection per worker,
+    brings the schema up to date and returns an unstarted ApiServer.
+    """
+    configure_pool(db_name, max_size=workers, profile=profile)
+    initialize_db()
+    return ApiServer((host, port), workers=workers, quiet=quiet)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the student management JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--db", default=DB_NAME)
+    parser.add_argument("--profile", default=None, help="database performance profile")
+    parser.add_argument("--quiet", action="store_true", help="don't log each request")
+    parser.add_argument("--query-stats", action="store_true",
+                        help="collect per-query statistics (GET /admin/queries, /metrics)")
+    parser.add_argument("--slow-query-ms", type=float, default=None, help="slow-query log threshold")
+    args = parser.parse_args()
+
+    if args.query_stats or args.slow_query_ms is not None:
+        enable_query_monitoring(args.slow_query_ms)
+
+    server = create_server(args.host, args.port, args.workers, args.db, args.profile, args.quiet)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
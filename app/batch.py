@@ -0,0 +1,330 @@
+# app/batch.py
+"""
+Runs scripts of administrative operations without the interactive menus.
+
+A script is either JSON lines (one {"op": ..., ...} object per line; blank
+lines and lines starting with # are skipped) or, for .yaml/.yml files, a YAML
+list of the same objects:
+
+    {"op": "add_course", "course_code": "CS101", "title": "Intro", "credits": 3, "max_enrollment": 60}
+    {"op": "enroll", "course_codes": ["CS101"], "year": 2024, "semester": "Fall", "major": "CS"}
+    {"op": "submit_grades", "staff_no": "S001", "csv": "grades.csv"}
+    {"op": "report", "kind": "course_statistics", "course_code": "CS101"}
+
+Operations run in order on one pooled connection. Consecutive operations are
+grouped `batch_size` at a time into a transaction, each inside its own
+savepoint so a failing operation can be skipped (keep_going) without losing
+the rest of its batch. Passwords for a batch are hashed in parallel up
+front. A dry run wraps the whole script in one transaction, so each batch
+becomes a savepoint that later batches can build on, and rolls it back at
+the end: the script is fully validated against the database without
+changing it.
+"""
+import json
+import time
+from collections import defaultdict
+
+from app.database import transaction
+from app.grade_upload import upload_grades, upload_grades_csv
+from app.models import Course, Enrollment, Instructor, Student, User
+from app.reports import cohort_standings, course_statistics, instructor_workloads
+from app.utils import DEFAULT_BCRYPT_ROUNDS, hash_passwords
+
+try:
+    import yaml
+except ImportError:  # YAML scripts are optional; JSON lines always work.
+    yaml = None
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class BatchError(Exception):
+    pass
+
+
+class _RollBack(Exception):
+    """
+    Raised to discard a batch's writes after a failure or in a dry run.
+    """
+
+
+def load_script(path):
+    """
+    Returns the script's operations as (line_number, operation) pairs.
+    """
+    with open(path, encoding='utf-8') as script:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise BatchError("PyYAML is required for YAML scripts.")
+            documents = [document for document in yaml.safe_load_all(script) if document is not None]
+            operations = [item for document in documents
+                          for item in (document if isinstance(document, list) else [document])]
+            numbered = list(enumerate(operations, start=1))
+        else:
+            numbered = []
+            for line_number, line in enumerate(script, start=1):
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    try:
+                        numbered.append((line_number, json.loads(line)))
+                    except json.JSONDecodeError as e:
+                        raise BatchError(f"line {line_number}: invalid JSON ({e})")
+    for line_number, operation in numbered:
+        if not isinstance(operation, dict) or operation.get("op") not in OPERATIONS:
+            raise BatchError(f"line {line_number}: unknown operation {operation!r}")
+    return numbered
+
+
+def _require(operation, *names):
+    missing = [name for name in names if operation.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    return [operation[name] for name in names]
+
+
+def _instructor_id(staff_no):
+    instructor = Instructor.find_by_staff_no(staff_no)
+    if not instructor:
+        raise ValueError(f"instructor {staff_no} not found")
+    return instructor[0]
+
+
+def _course_id(course_code):
+    course = Course.find_by_course_code(course_code)
+    if not course:
+        raise ValueError(f"course {course_code} not found or inactive")
+    return course[0]
+
+
+def _create_user(operation, role):
+    username, password = _require(operation, "username", "password")
+    if User.find_by_username(username):
+        raise ValueError(f"username {username} already exists")
+    user = User(username, operation["_password_hash"], role)
+    user.create()
+    return user.cursor.lastrowid
+
+
+def add_user(operation):
+    _create_user(operation, operation.get("role") or "student")
+    return f"user {operation['username']}"
+
+
+def add_student(operation):
+    values = _require(operation, "reg_no", "first_name", "last_name", "admission_date", "major")
+    user_id = _create_user(operation, "student")
+    Student(user_id, *values, operation.get("status") or "active").create()
+    return f"student {values[0]}"
+
+
+def add_instructor(operation):
+    values = _require(operation, "staff_no", "first_name", "last_name", "hire_date")
+    user_id = _create_user(operation, "instructor")
+    Instructor(user_id, *values).create()
+    return f"instructor {values[0]}"
+
+
+def add_course(operation):
+    course_code, title, credits, max_enrollment = _require(operation, "course_code", "title", "credits", "max_enrollment")
+    instructor_id = _instructor_id(operation["staff_no"]) if operation.get("staff_no") else None
+    Course(course_code, title, int(credits), int(max_enrollment), instructor_id, operation.get("status") or "active").create()
+    return f"course {course_code}"
+
+
+def update_course(operation):
+    course_code, = _require(operation, "course_code")
+    course = Course.find_by_course_code(course_code)
+    if not course:
+        raise ValueError(f"course {course_code} not found or inactive")
+    fields = {"title": course[2], "credits": course[3], "max_enrollment": course[4], "status": course[6]}
+    fields.update({name: operation[name] for name in fields if operation.get(name) is not None})
+    Course(course_code, fields["title"], fields["credits"], fields["max_enrollment"], course[5], fields["status"]).update(**fields)
+    return f"course {course_code}"
+
+
+def assign_instructor(operation):
+    course_code, staff_no = _require(operation, "course_code", "staff_no")
+    _course_id(course_code)
+    Course.assign_instructor(course_code, _instructor_id(staff_no))
+    return f"{staff_no} -> {course_code}"
+
+
+def enroll(operation):
+    """
+    Enrolls "reg_nos", or the active students of a "major"/"admission_year"
+    cohort, in "course_codes" for one term.
+    """
+    year, semester = _require(operation, "year", "semester")
+    course_codes = operation.get("course_codes") or _require(operation, "course_code")
+    course_ids = [_course_id(course_code) for course_code in course_codes]
+    if operation.get("reg_nos"):
+        found = Student.find_ids_by_reg_nos(operation["reg_nos"])
+        missing = [reg_no for reg_no in operation["reg_nos"] if reg_no not in found]
+        if missing:
+            raise ValueError(f"unknown students: {', '.join(missing[:10])}")
+        student_ids = list(found.values())
+    else:
+        student_ids = Student.find_ids_by_cohort(major=operation.get("major"), admission_year=operation.get("admission_year"))
+    summary = Enrollment.bulk_enroll(student_ids, course_ids, int(year), semester)
+    return ", ".join(f"{count} {name}" for name, count in summary.items())
+
+
+def submit_grades(operation):
+    """
+    Submits "rows" of [reg_no, course_code, mark(, comments)], or a "csv"
+    file, on behalf of instructor "staff_no".
+    """
+    staff_no, = _require(operation, "staff_no")
+    submitted_by = _instructor_id(staff_no)
+    year = int(operation["year"]) if operation.get("year") else None
+    if operation.get("csv"):
+        result = upload_grades_csv(operation["csv"], submitted_by, year, operation.get("semester"))
+    else:
+        rows = [tuple(row) for row in _require(operation, "rows")[0]]
+        result = upload_grades(rows, submitted_by, year, operation.get("semester"))
+    message = f"{result.imported} of {result.rows} grades"
+    if result.rejects:
+        message += "; rejected " + "; ".join(f"row {line}: {reason}" for line, reason in result.rejects[:5])
+    return message
+
+
+REPORTS = {
+    "course_statistics": lambda op: course_statistics(
+        course_code=op.get("course_code"), instructor_id=_instructor_id(op["staff_no"]) if op.get("staff_no") else None,
+        by_term=bool(op.get("by_term"))),
+    "cohort": lambda op: cohort_standings(
+        major=op.get("major"), admission_year=op.get("admission_year"), status=op.get("status")),
+    "instructor_workloads": lambda op: instructor_workloads(),
+    "enrollment": lambda op: (Enrollment.get_enrollment_statistics_for_course(op["course_code"])
+                              if op.get("course_code") else Enrollment.get_enrollment_statistics_for_all_courses()),
+}
+
+
+def report(operation):
+    """
+    Runs report "kind" and returns its rows as dicts (for namedtuple reports)
+    or lists.
+    """
+    kind, = _require(operation, "kind")
+    if kind not in REPORTS:
+        raise ValueError(f"unknown report {kind}; expected one of {', '.join(REPORTS)}")
+    rows = REPORTS[kind](operation)
+    return [row._asdict() if hasattr(row, "_asdict") else list(row) for row in rows]
+
+
+OPERATIONS = {
+    "add_user": add_user,
+    "add_student": add_student,
+    "add_instructor": add_instructor,
+    "add_course": add_course,
+    "update_course": update_course,
+    "assign_instructor": assign_instructor,
+    "enroll": enroll,
+    "submit_grades": submit_grades,
+    "report": report,
+}
+
+
+class BatchResult:
+    """
+    Per-operation outcomes and timings for a script run.
+    """
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.succeeded = 0
+        self.failures = []
+        self.outputs = []
+        self.timings = defaultdict(list)
+        self.elapsed = 0.0
+        # Line of the first operation in a batch that was rolled back after a failure.
+        self.rolled_back_from = None
+
+    def record(self, line_number, name, seconds, output=None, error=None):
+        self.timings[name].append(seconds)
+        if error is not None:
+            self.failures.append((line_number, name, error))
+        else:
+            self.succeeded += 1
+            self.outputs.append((line_number, name, output))
+
+    def summary(self):
+        """
+        Lines describing count, total, mean and max time per operation type.
+        """
+        mode = " (dry run, rolled back)" if self.dry_run else ""
+        lines = [f"{self.succeeded} operations succeeded, {len(self.failures)} failed in {self.elapsed:.2f}s{mode}"]
+        if self.rolled_back_from is not None and not self.dry_run:
+            lines.append(f"Stopped at the first failure; changes from line {self.rolled_back_from} on were rolled back.")
+        lines.append(f"{'Operation':<20} {'Count':>7} {'Total s':>9} {'Mean ms':>9} {'Max ms':>9}")
+        for name, durations in sorted(self.timings.items(), key=lambda item: -sum(item[1])):
+            lines.append(f"{name:<20} {len(durations):>7} {sum(durations):>9.3f} "
+                         f"{sum(durations) / len(durations) * 1000:>9.2f} {max(durations) * 1000:>9.2f}")
+        return lines
+
+
+def _hash_batch(batch, rounds, workers):
+    """
+    Hashes every password in the batch in parallel, before any writes start.
+    Returns the number hashed.
+    """
+    pending = [operation for _, operation in batch if operation.get("password") and "_password_hash" not in operation]
+    hashes = hash_passwords((operation["password"] for operation in pending), rounds, workers, use_threads=True)
+    for operation, password_hash in zip(pending, hashes):
+        operation["_password_hash"] = password_hash
+    return len(pending)
+
+
+def _run_batches(operations, result, batch_size, keep_going, hash_rounds, hash_workers, progress):
+    for batch_start in range(0, len(operations), batch_size):
+        batch = operations[batch_start:batch_start + batch_size]
+        hash_start = time.perf_counter()
+        if _hash_batch(batch, hash_rounds, hash_workers):
+            result.timings["(password hashing)"].append(time.perf_counter() - hash_start)
+        stopped = False
+        try:
+            with transaction():
+                for line_number, operation in batch:
+                    name = operation["op"]
+                    op_start = time.perf_counter()
+                    try:
+                        with transaction():
+                            output = OPERATIONS[name](operation)
+                    except Exception as e:
+                        result.record(line_number, name, time.perf_counter() - op_start, error=str(e))
+                        if not keep_going:
+                            stopped = True
+                            break
+                    else:
+                        result.record(line_number, name, time.perf_counter() - op_start, output)
+                if stopped:
+                    raise _RollBack()
+        except _RollBack:
+            result.rolled_back_from = batch[0][0]
+        if progress:
+            progress(result)
+        if stopped:
+            break
+
+
+def run_script(operations, dry_run=False, batch_size=DEFAULT_BATCH_SIZE, keep_going=False,
+               hash_rounds=DEFAULT_BCRYPT_ROUNDS, hash_workers=None, progress=None):
+    """
+    Executes (line_number, operation) pairs as described in the module
+    docstring and returns a BatchResult. Without keep_going the first failure
+    rolls back its batch and stops the run; batches before it stay committed
+    (unless dry_run).
+    """
+    result = BatchResult(dry_run)
+    operations = list(operations)
+    start = time.perf_counter()
+    if dry_run:
+        try:
+            with transaction():
+                _run_batches(operations, result, batch_size, keep_going, hash_rounds, hash_workers, progress)
+                raise _RollBack()
+        except _RollBack:
+            pass
+    else:
+        _run_batches(operations, result, batch_size, keep_going, hash_rounds, hash_workers, progress)
+    result.elapsed = time.perf_counter() - start
+    return result
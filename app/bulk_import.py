@@ -0,0 +1,238 @@
+# app/bulk_import.py
+"""
+Streaming bulk import of student accounts from CSV.
+
+Each CSV row describes one Users row and its Students row:
+
+    username,password,reg_no,first_name,last_name,admission_date,major,status
+
+`password_hash` may be given instead of `password` for pre-hashed credentials,
+and `status` defaults to 'active'. Rows are read lazily, validated with the
+same rules as the models, and written with executemany one chunk per
+transaction, so memory use is bounded by the chunk size.
+"""
+import csv
+import itertools
+import sqlite3
+import time
+
+from app.database import get_connection, transaction
+from app.models import BaseModel
+from app.utils import hash_passwords, DEFAULT_BCRYPT_ROUNDS
+
+DEFAULT_CHUNK_SIZE = 1000
+STUDENT_STATUSES = ('active', 'inactive', 'graduated', 'suspended')
+
+# Stay under SQLite's bound-parameter limit when checking for existing keys.
+_MAX_LOOKUP_PARAMS = 900
+
+INSERT_USER_SQL = """
+    INSERT INTO Users (username, password_hash, role)
+    VALUES (?, ?, 'student')
+"""
+
+INSERT_STUDENT_SQL = """
+    INSERT INTO Students (user_id, reg_no, first_name, last_name, admission_date, major, status)
+    SELECT user_id, ?, ?, ?, ?, ?, ?
+    FROM Users
+    WHERE username = ?
+"""
+
+
+class ImportResult:
+    """
+    Outcome of an import: counts, timing and the rejected rows as
+    (line_number, reason) pairs.
+    """
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.rejects = []
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def reject(self, line_number, reason):
+        self.rejects.append((line_number, reason))
+
+    def __repr__(self):
+        return (
+            f"ImportResult(rows={self.rows}, imported={self.imported}, "
+            f"rejected={len(self.rejects)}, rows_per_sec={self.rows_per_sec:.0f})"
+        )
+
+
+def validate_student_row(row):
+    """
+    Checks one CSV row and returns the normalised values, or raises ValueError.
+    """
+    username = (row.get('username') or '').strip()
+    password = row.get('password')
+    password_hash = row.get('password_hash')
+    reg_no = (row.get('reg_no') or '').strip()
+    first_name = (row.get('first_name') or '').strip()
+    last_name = (row.get('last_name') or '').strip()
+    admission_date = (row.get('admission_date') or '').strip()
+    major = (row.get('major') or '').strip()
+    status = (row.get('status') or 'active').strip().lower()
+
+    BaseModel.validate_fields([username, password or password_hash])
+    BaseModel.validate_fields([reg_no, first_name, last_name, admission_date, major])
+    if status not in STUDENT_STATUSES:
+        raise ValueError(f"Invalid status '{status}'.")
+
+    return {
+        'username': username,
+        'password': password,
+        'password_hash': password_hash,
+        'reg_no': reg_no,
+        'first_name': first_name,
+        'last_name': last_name,
+        'admission_date': admission_date,
+        'major': major,
+        'status': status,
+    }
+
+
+def _find_existing(cursor, query, values):
+    """
+    Returns the subset of `values` already present, querying in batches.
+    """
+    found = set()
+    values = list(values)
+    for start in range(0, len(values), _MAX_LOOKUP_PARAMS):
+        batch = values[start:start + _MAX_LOOKUP_PARAMS]
+        placeholders = ", ".join("?" for _ in batch)
+        cursor.execute(query.format(placeholders=placeholders), batch)
+        found.update(row[0] for row in cursor.fetchall())
+    return found
+
+
+def _hash_passwords(records, hashing):
+    """
+    Fills in password_hash for records that only carry a plain password,
+    hashing the whole chunk in parallel.
+    """
+    pending = [record for record in records if not record['password_hash']]
+    hashes = hash_passwords((record['password'] for record in pending), **hashing)
+    for record, password_hash in zip(pending, hashes):
+        record['password_hash'] = password_hash
+        record['password'] = None
+
+
+def _insert_records(cursor, records):
+    cursor.executemany(INSERT_USER_SQL, (
+        (record['username'], record['password_hash']) for record in records
+    ))
+    cursor.executemany(INSERT_STUDENT_SQL, (
+        (
+            record['reg_no'], record['first_name'], record['last_name'],
+            record['admission_date'], record['major'], record['status'], record['username'],
+        )
+        for record in records
+    ))
+
+
+def _import_chunk(chunk, result, hashing):
+    """
+    Validates and writes one chunk of (line_number, row) pairs in a single transaction.
+    """
+    records = []
+    seen_usernames = set()
+    seen_reg_nos = set()
+    for line_number, row in chunk:
+        try:
+            record = validate_student_row(row)
+        except ValueError as e:
+            result.reject(line_number, str(e))
+            continue
+        if record['username'] in seen_usernames:
+            result.reject(line_number, f"Duplicate username '{record['username']}' in file.")
+            continue
+        if record['reg_no'] in seen_reg_nos:
+            result.reject(line_number, f"Duplicate registration number '{record['reg_no']}' in file.")
+            continue
+        seen_usernames.add(record['username'])
+        seen_reg_nos.add(record['reg_no'])
+        record['line_number'] = line_number
+        records.append(record)
+
+    if not records:
+        return
+
+    connection = get_connection()
+    cursor = connection.cursor()
+    existing_usernames = _find_existing(
+        cursor, "SELECT username FROM Users WHERE username IN ({placeholders})", seen_usernames
+    )
+    existing_reg_nos = _find_existing(
+        cursor, "SELECT reg_no FROM Students WHERE reg_no IN ({placeholders})", seen_reg_nos
+    )
+    connection.close()
+
+    accepted = []
+    for record in records:
+        if record['username'] in existing_usernames:
+            result.reject(record['line_number'], f"Username '{record['username']}' already exists.")
+        elif record['reg_no'] in existing_reg_nos:
+            result.reject(record['line_number'], f"Registration number '{record['reg_no']}' already exists.")
+        else:
+            accepted.append(record)
+
+    _hash_passwords(accepted, hashing)
+
+    try:
+        with transaction() as connection:
+            _insert_records(connection.cursor(), accepted)
+        result.imported += len(accepted)
+    except sqlite3.IntegrityError:
+        # Something changed under us; retry row by row to isolate the offenders.
+        with transaction() as connection:
+            for record in accepted:
+                try:
+                    with transaction():
+                        _insert_records(connection.cursor(), [record])
+                    result.imported += 1
+                except sqlite3.IntegrityError as e:
+                    result.reject(record['line_number'], str(e))
+
+
+def import_students(rows, chunk_size=DEFAULT_CHUNK_SIZE, progress=None,
+                    hash_rounds=DEFAULT_BCRYPT_ROUNDS, hash_workers=None, hash_threads=False):
+    """
+    Imports students from an iterable of CSV-style dicts. Line numbers in the
+    result count the header as line 1.
+
+    `progress`, if given, is called with the running ImportResult after each chunk.
+    Plain passwords are hashed per chunk with app.utils.hash_passwords using
+    the given cost factor and worker count.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    hashing = {'rounds': hash_rounds, 'workers': hash_workers, 'use_threads': hash_threads}
+
+    result = ImportResult()
+    start = time.perf_counter()
+    numbered_rows = enumerate(rows, start=2)
+    while True:
+        chunk = list(itertools.islice(numbered_rows, chunk_size))
+        if not chunk:
+            break
+        result.rows += len(chunk)
+        _import_chunk(chunk, result, hashing)
+        result.elapsed = time.perf_counter() - start
+        if progress:
+            progress(result)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def import_students_csv(path, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, **hashing):
+    """
+    Streams a CSV file of students into the database. Keyword arguments are
+    passed through to import_students.
+    """
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        return import_students(csv.DictReader(csv_file), chunk_size, progress, **hashing)
@@ -0,0 +1,135 @@
+# app/cache.py
+"""
+LRU cache for report queries that is invalidated whenever the database changes.
+
+Validity is tracked with the write generation, which is bumped by every
+commit made through the connection pool, and PRAGMA data_version, which
+changes on a connection when some other process commits. data_version values
+are only comparable on the same connection, so the cache remembers the last
+one it saw per pooled connection: readers on different connections don't
+invalidate each other, and an outside commit is noticed by the next
+connection that had seen the state before it. Checking costs one PRAGMA, so a
+repeated report view with no intervening writes never re-runs its query.
+"""
+import functools
+import threading
+from collections import OrderedDict
+
+from app.database import get_connection, get_write_generation
+
+DEFAULT_MAX_ENTRIES = 128
+
+
+def get_data_version():
+    """
+    Returns (write generation, connection key, data_version) for a pooled
+    connection, or None if this thread has uncommitted writes that a cached
+    result wouldn't see.
+    """
+    connection = get_connection()
+    try:
+        if connection.in_transaction:
+            return None
+        data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+        return get_write_generation(), id(connection.raw), data_version
+    finally:
+        connection.close()
+
+
+class ResultCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generation = None
+        # Last data_version seen on each pooled connection since the last invalidation.
+        self._data_versions = {}
+        # Counts invalidations, so a result computed across one isn't stored.
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0, 'bypassed': 0}
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached result for `key` if the database hasn't changed
+        since it was stored, otherwise calls compute() and caches its result.
+        """
+        version = get_data_version()
+        if version is None:
+            with self._lock:
+                self._stats['bypassed'] += 1
+            return compute()
+        generation, connection_key, data_version = version
+        with self._lock:
+            seen = self._data_versions.get(connection_key, data_version)
+            if generation != self._generation or seen != data_version:
+                if self._entries:
+                    self._stats['invalidations'] += 1
+                self._entries.clear()
+                self._generation = generation
+                self._data_versions = {connection_key: data_version}
+                self._epoch += 1
+            else:
+                self._data_versions[connection_key] = data_version
+            epoch = self._epoch
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._entries[key]
+            self._stats['misses'] += 1
+
+        result = compute()
+
+        with self._lock:
+            # Don't store a result computed against a version that is already stale.
+            if self._epoch == epoch and get_write_generation() == generation:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats['evictions'] += 1
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation = None
+            self._data_versions = {}
+            self._epoch += 1
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+report_cache = ResultCache()
+
+
+def cached_report(function):
+    """
+    Caches a report function's result in report_cache, keyed by the function
+    and its arguments. List results are copied so callers can't alter the
+    cached value.
+    """
+    name = f"{function.__module__}.{function.__qualname__}"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return function(*args, **kwargs)
+        result = report_cache.get_or_compute(key, lambda: function(*args, **kwargs))
+        return list(result) if isinstance(result, list) else result
+
+    return wrapper
+
+
+def get_cache_stats():
+    return report_cache.get_stats()
@@ -1,14 +1,450 @@
 # app/database.py
+import contextlib
+import itertools
+import os
 import sqlite3
+import threading
+
+from app.instrumentation import InstrumentedConnection
 
 DB_NAME = "student_management.db"
 
-def initialize_db():
+# Named PRAGMA sets applied to every new connection. `durable` keeps full fsyncs
+# on every commit, `balanced` only syncs at WAL checkpoints, and `throughput`
+# leaves syncing to the OS (a power loss may drop the last commits).
+PERFORMANCE_PROFILES = {
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+    },
+}
+
+DEFAULT_PROFILE = 'balanced'
+PROFILE_ENV_VAR = "STUDENT_DB_PROFILE"
+
+# Upper bound on open connections shared by all threads, and how long a thread
+# waits for one to be returned before giving up.
+DEFAULT_POOL_SIZE = 8
+DEFAULT_POOL_TIMEOUT = 30.0
+
+# Bumped after every commit made through the pool. PRAGMA data_version only
+# reports commits from *other* connections, so caches combine the two.
+_write_counter = itertools.count(1)
+_write_generation = 0
+
+
+def bump_write_generation():
+    global _write_generation
+    _write_generation = next(_write_counter)
+
+
+def get_write_generation():
+    return _write_generation
+
+
+def get_profile_name(profile=None):
+    """
+    Resolves the performance profile to use: the argument, then the
+    STUDENT_DB_PROFILE environment variable, then the default.
+    """
+    name = profile or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE
+    if name not in PERFORMANCE_PROFILES:
+        raise ValueError(
+            f"Unknown performance profile '{name}'. "
+            f"Choose one of: {', '.join(PERFORMANCE_PROFILES)}."
+        )
+    return name
+
+
+def apply_profile(connection, profile=None):
     """
-    Create the database and tables from the schema if they don't exist.
+    Applies the PRAGMAs of a performance profile to an open connection.
     """
-    connection = sqlite3.connect(DB_NAME)
+    settings = PERFORMANCE_PROFILES[get_profile_name(profile)]
     cursor = connection.cursor()
+    # journal_mode is persistent and needs a write lock to change, so only touch
+    # it when the file isn't already in the requested mode.
+    current_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+    if current_mode.upper() != settings['journal_mode'] and current_mode != 'memory':
+        cursor.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+    cursor.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    cursor.execute(f"PRAGMA cache_size = {int(settings['cache_size'])}")
+    cursor.execute(f"PRAGMA mmap_size = {int(settings['mmap_size'])}")
+    cursor.execute(f"PRAGMA temp_store = {settings['temp_store']}")
+    cursor.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout'])}")
+    cursor.close()
+
+
+class PooledConnection:
+    """
+    Checked-out handle on a pooled sqlite3 connection.
+
+    Behaves like the underlying connection, except that close() hands the
+    connection back to the pool instead of closing it.
+    """
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+        self._released = False
+        self._total_changes = connection.total_changes
+        # One entry per open `with` block: its transaction() savepoint, or None.
+        self._units = []
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        if self._pool.transaction_depth(self._connection):
+            # Inside transaction() the block is a savepoint; committing here
+            # would end the outer unit of work part-way through.
+            unit = self._pool.transaction()
+            unit.__enter__()
+            self._units.append(unit)
+            return self._connection
+        self._units.append(None)
+        return self._connection.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        unit = self._units.pop()
+        if unit is not None:
+            return unit.__exit__(exc_type, exc_value, traceback)
+        try:
+            return self._connection.__exit__(exc_type, exc_value, traceback)
+        finally:
+            self._bump_if_changed()
+
+    def _bump_if_changed(self):
+        # Read-only use of the connection leaves cached results valid.
+        if self._connection.total_changes != self._total_changes:
+            self._total_changes = self._connection.total_changes
+            bump_write_generation()
+
+    @property
+    def raw(self):
+        return self._connection
+
+    def commit(self):
+        """
+        Commits, unless a transaction() block owns this connection; its
+        writes are then committed once when the outermost block exits.
+        """
+        if self._pool.transaction_depth(self._connection):
+            return
+        self._connection.commit()
+        self._bump_if_changed()
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self._connection)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class _Checkout:
+    """
+    A thread's hold on a pooled connection: the connection and how many
+    handles for it are still open. connection is None once it was returned.
+    """
+    __slots__ = ('connection', 'depth')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.depth = 1
+
+
+class ConnectionPool:
+    """
+    Bounded pool of reusable sqlite3 connections.
+
+    Each thread holds at most one connection at a time: repeated checkouts from
+    the same thread share it, and it goes back to the idle list once every
+    handle for it has been closed. At most `max_size` connections are open at
+    once; further threads wait for one to be returned.
+    """
+    def __init__(self, db_name=DB_NAME, max_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_POOL_TIMEOUT, profile=None):
+        if max_size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.db_name = db_name
+        self.profile = get_profile_name(profile)
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        # Live checkouts by connection, so a release from any thread finds its owner.
+        self._checkouts = {}
+        self._closed = False
+        self._stats = {'checkouts': 0, 'returns': 0, 'hits': 0, 'misses': 0, 'waits': 0}
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_name, check_same_thread=False, factory=InstrumentedConnection)
+        apply_profile(connection, self.profile)
+        return connection
+
+    def checkout(self):
+        """
+        Returns a PooledConnection for the calling thread.
+        """
+        checkout = getattr(self._local, 'checkout', None)
+        with self._condition:
+            self._stats['checkouts'] += 1
+            # The binding is cleared if another thread closed this thread's last handle.
+            if checkout is not None and checkout.connection is not None:
+                checkout.depth += 1
+                self._stats['hits'] += 1
+                return PooledConnection(self, checkout.connection)
+
+            create = False
+            if not self._idle and self._size >= self.max_size:
+                self._stats['waits'] += 1
+                available = lambda: self._idle or self._size < self.max_size
+                if not self._condition.wait_for(available, timeout=self.timeout):
+                    raise sqlite3.OperationalError("Timed out waiting for a database connection.")
+            if self._idle:
+                connection = self._idle.pop()
+                self._stats['hits'] += 1
+            else:
+                self._size += 1
+                self._stats['misses'] += 1
+                create = True
+
+        if create:
+            try:
+                connection = self._connect()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+
+        checkout = _Checkout(connection)
+        with self._condition:
+            self._checkouts[connection] = checkout
+        self._local.checkout = checkout
+        return PooledConnection(self, connection)
+
+    def release(self, connection):
+        """
+        Gives back one checkout of `connection`. Handles may be closed from any
+        thread; once the last one is, the owning thread's binding is cleared
+        before the connection goes back to the idle list, so no two threads
+        ever hold it at once.
+        """
+        with self._condition:
+            checkout = self._checkouts.get(connection)
+            if checkout is None:
+                return
+            checkout.depth -= 1
+            if checkout.depth > 0:
+                return
+            del self._checkouts[connection]
+            checkout.connection = None
+        self._return(connection)
+
+    def _return(self, connection):
+        if connection.in_transaction:
+            connection.rollback()
+        with self._condition:
+            self._stats['returns'] += 1
+            if self._closed:
+                self._size -= 1
+                connection.close()
+                return
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def transaction_depth(self, connection=None):
+        """
+        Number of transaction() blocks open on the calling thread's connection.
+        """
+        checkout = getattr(self._local, 'checkout', None)
+        if connection is not None and (checkout is None or checkout.connection is not connection):
+            return 0
+        return getattr(self._local, 'transaction_depth', 0)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Runs the enclosed writes on the thread's connection as one unit of work.
+
+        The outermost block issues BEGIN and a single COMMIT; nested blocks use
+        savepoints, so an exception rolls back only the innermost block it
+        escapes from. `with connection:` blocks inside it are savepoints too.
+        An outermost block refuses to start on a connection that already has
+        uncommitted writes.
+        """
+        connection = self.checkout()
+        depth = self.transaction_depth()
+        savepoint = f"unit_of_work_{depth}"
+        try:
+            if depth == 0:
+                if connection.in_transaction:
+                    # Committing here would commit someone else's unfinished writes.
+                    raise sqlite3.OperationalError(
+                        "transaction() started on a connection with uncommitted writes; "
+                        "commit or roll them back first."
+                    )
+                connection.execute("BEGIN")
+            else:
+                connection.execute(f"SAVEPOINT {savepoint}")
+            self._local.transaction_depth = depth + 1
+            try:
+                yield connection
+            except BaseException:
+                if depth == 0:
+                    connection.raw.rollback()
+                else:
+                    connection.execute(f"ROLLBACK TO {savepoint}")
+                    connection.execute(f"RELEASE {savepoint}")
+                raise
+            else:
+                if depth == 0:
+                    connection.raw.commit()
+                    bump_write_generation()
+                else:
+                    connection.execute(f"RELEASE {savepoint}")
+            finally:
+                self._local.transaction_depth = depth
+        finally:
+            connection.close()
+
+    def close_all(self):
+        """
+        Closes every idle connection. Connections still checked out are closed
+        when they are returned.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for connection in idle:
+            connection.close()
+
+    def get_stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _reopen_pool_in_child():
+    # SQLite connections must not be used across fork(), so a forked child
+    # (e.g. a process-pool worker) gets an empty pool with the same settings.
+    global _pool, _pool_lock
+    _pool_lock = threading.Lock()
+    if _pool is not None:
+        _pool = ConnectionPool(_pool.db_name, _pool.max_size, _pool.timeout, _pool.profile)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reopen_pool_in_child)
+
+
+def get_pool():
+    """
+    Returns the process-wide connection pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_NAME)
+    return _pool
+
+
+def configure_pool(db_name=DB_NAME, max_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_POOL_TIMEOUT, profile=None):
+    """
+    Replaces the process-wide pool, e.g. to point the application at another
+    database file or switch performance profile.
+    """
+    global _pool
+    with _pool_lock:
+        old_pool, _pool = _pool, ConnectionPool(db_name, max_size, timeout, profile)
+    if old_pool is not None:
+        old_pool.close_all()
+    # Results cached against the old database must not be served for the new one.
+    bump_write_generation()
+    return _pool
+
+
+def get_connection():
+    """
+    Checks a connection out of the pool. Call close() on it to return it.
+    """
+    return get_pool().checkout()
+
+
+def transaction():
+    """
+    Groups model writes made on this thread into one transaction:
+
+        with transaction():
+            user.create()
+            student.create()
+    """
+    return get_pool().transaction()
+
+
+def get_pool_stats():
+    return get_pool().get_stats()
+
+
+def initialize_db(profile=None):
+    """
+    Create the database and tables from the schema if they don't exist, then
+    apply any pending migrations from app.migrations.
+
+    If a performance profile is given, the pool is reopened with it first;
+    otherwise the pool's profile (STUDENT_DB_PROFILE or the default) is used.
+
+    A database whose schema version (PRAGMA user_version) is already the
+    latest migration has every table, so it is left alone after that one
+    PRAGMA, without reading schema.sql or printing anything.
+    """
+    if profile is not None and get_profile_name(profile) != get_pool().profile:
+        pool = get_pool()
+        configure_pool(pool.db_name, pool.max_size, pool.timeout, profile)
+
+    # Migrations import model-level helpers that depend on this module.
+    from app.migrations import LATEST_VERSION, migrate
+
+    connection = get_connection()
+    cursor = connection.cursor()
+
+    if cursor.execute("PRAGMA user_version").fetchone()[0] >= LATEST_VERSION:
+        connection.close()
+        return
 
     expected_tables = ['Users', 'Students', 'Instructors', 'Courses', 'Grades', 'Enrollments']
 
@@ -16,7 +452,7 @@ def initialize_db():
     existing_tables = [table[0] for table in cursor.fetchall()]
 
     missing_tables = [table for table in expected_tables if table not in existing_tables]
-    
+
     if missing_tables:
         with open("schema.sql", "r") as schema_file:
             schema_script = schema_file.read()
@@ -31,6 +467,9 @@ def initialize_db():
     else:
         print("All tables already exist. Skipping creation.")
 
+    for version, description in migrate(connection.raw):
+        print(f"Applied migration {version}: {description}")
+
     connection.close()
 
 def extract_table_creation_sql(schema_script, table_name):
@@ -46,10 +485,12 @@ def extract_table_creation_sql(schema_script, table_name):
 def get_db_cursor():
     """
     Returns a cursor object to interact with the database.
+
+    The connection comes from the pool; close it to return it.
     """
-    connection = sqlite3.connect(DB_NAME)
+    connection = get_connection()
     cursor = connection.cursor()
-    return cursor, connection 
+    return cursor, connection
 
 if __name__ == "__main__":
     initialize_db()
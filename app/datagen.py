@@ -0,0 +1,386 @@
+# app/datagen.py
+"""
+Deterministic synthetic data for all six tables in schema.sql.
+
+The same seed and sizes always produce the same rows, written either to a new
+SQLite file or to one CSV file per table. Students are spread over admission
+cohorts and majors; each takes a few courses per term from admission up to
+`until_year`, with course popularity following a power law (`skew`), so a few
+courses are very large and most are small. Course capacities are sized from
+their expected demand. Past terms are completed (a few withdrawn) and graded;
+the last term is in progress and ungraded. Every account shares one password.
+
+SQLite output is loaded into the bare version-0 schema with journaling off,
+then app.migrations builds the indexes, the StudentGPA aggregates and the
+search index in one pass, which is far faster than maintaining them row by row.
+
+Usage: python -m app.datagen (--db PATH | --csv DIR) [--scale small|medium|large] [--seed N]
+                             [--students N] [--instructors N] [--courses N] [--enrollments N]
+                             [--skew S] [--until-year Y] [--password P] [--force]
+"""
+import argparse
+import bisect
+import collections
+import csv
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import time
+
+from app.grading import get_scale
+from app.utils import DEFAULT_BCRYPT_ROUNDS
+
+SCALES = {
+    "small": {"students": 2_000, "instructors": 50, "courses": 200, "enrollments": 50_000},
+    "medium": {"students": 20_000, "instructors": 500, "courses": 2_000, "enrollments": 500_000},
+    "large": {"students": 200_000, "instructors": 5_000, "courses": 20_000, "enrollments": 5_000_000},
+}
+
+# Column order of every table as written, matching schema.sql.
+TABLES = {
+    "Users": ("user_id", "username", "password_hash", "role", "created_at", "is_active"),
+    "Instructors": ("instructor_id", "user_id", "staff_no", "first_name", "last_name", "hire_date"),
+    "Students": ("student_id", "user_id", "reg_no", "first_name", "last_name", "admission_date", "major", "status"),
+    "Courses": ("course_id", "course_code", "title", "credits", "max_enrollment", "instructor_id", "status",
+                "created_at"),
+    "Enrollments": ("enrollment_id", "year", "semester", "student_id", "course_id", "enrollment_date", "status",
+                    "withdrawal_date"),
+    "Grades": ("grade_id", "enrollment_id", "grade_value", "numeric_grade", "submission_date", "submitted_by",
+               "comments"),
+}
+
+FIRST_NAMES = (
+    "James", "Mary", "Wei", "Aisha", "Carlos", "Olga", "Kwame", "Priya", "Liam", "Sofia", "Hiroshi", "Fatima",
+    "Noah", "Emma", "Mateo", "Zara", "Ivan", "Chloe", "Arjun", "Mei", "Lucas", "Amara", "Omar", "Hannah",
+    "Diego", "Yuki", "Samuel", "Leila", "Elijah", "Ingrid", "Kofi", "Ana", "Tomasz", "Nadia", "Ethan", "Grace",
+)
+LAST_NAMES = (
+    "Smith", "Nguyen", "Garcia", "Okafor", "Kim", "Patel", "Muller", "Rossi", "Johnson", "Silva", "Ivanova",
+    "Chen", "Brown", "Haddad", "Kowalski", "Tanaka", "Williams", "Mensah", "Lopez", "Singh", "Andersson",
+    "Dubois", "Novak", "Osei", "Martin", "Yilmaz", "Cohen", "Santos", "Murphy", "Sato", "Ali", "Fischer",
+)
+# (major, department code, relative share of students)
+MAJORS = (
+    ("Computer Science", "CS", 18), ("Business", "BUS", 16), ("Biology", "BIO", 12), ("Psychology", "PSY", 10),
+    ("Engineering", "ENG", 10), ("Economics", "ECO", 8), ("Mathematics", "MATH", 6), ("English", "ENGL", 5),
+    ("History", "HIST", 4), ("Physics", "PHYS", 4), ("Chemistry", "CHEM", 4), ("Art", "ART", 3),
+)
+COURSE_TOPICS = (
+    "Foundations", "Methods", "Theory", "Systems", "Analysis", "Design", "Practice", "Seminar", "Laboratory",
+    "Modelling", "Ethics", "History", "Applications", "Research", "Topics",
+)
+COURSE_LEVELS = ("Introduction to", "Intermediate", "Advanced", "Principles of", "Studies in")
+SEMESTERS = ("Spring", "Fall")
+# Month each semester starts and is graded in.
+SEMESTER_DATES = {"Spring": ("01-15", "05-20"), "Fall": ("09-01", "12-18")}
+TERMS_TO_GRADUATE = 8
+WITHDRAWAL_RATE = 0.04
+
+
+def deterministic_hash(password, seed, rounds=DEFAULT_BCRYPT_ROUNDS):
+    """
+    bcrypt hash of `password` with a salt derived from `seed`, so that
+    generated files are byte-for-byte reproducible.
+    """
+    import bcrypt
+
+    alphabet = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    salt_rng = random.Random(f"salt-{seed}")
+    # The last salt character only carries 2 bits; '.' keeps it canonical.
+    salt = f"$2b${rounds:02d}$" + "".join(salt_rng.choice(alphabet) for _ in range(21)) + "."
+    return bcrypt.hashpw(password.encode("utf-8"), salt.encode("ascii")).decode("utf-8")
+
+
+class DatasetGenerator:
+    """
+    Produces the rows of one dataset as (table, rows) batches, parents before children.
+    """
+    def __init__(self, students, instructors, courses, enrollments, seed=0, skew=0.8, until_year=2024,
+                 password="password", hash_rounds=DEFAULT_BCRYPT_ROUNDS, batch_size=10_000):
+        if min(students, instructors, courses) < 1:
+            raise ValueError("A dataset needs at least one student, instructor and course.")
+        self.students = students
+        self.instructors = instructors
+        self.courses = courses
+        self.enrollments = enrollments
+        self.seed = seed
+        self.skew = skew
+        self.until_year = until_year
+        self.password = password
+        self.hash_rounds = hash_rounds
+        self.batch_size = batch_size
+        self.scale = get_scale()
+        self.first_year = until_year - TERMS_TO_GRADUATE // len(SEMESTERS) - 1
+
+    def batches(self):
+        rng = random.Random(self.seed)
+        password_hash = deterministic_hash(self.password, self.seed, self.hash_rounds)
+        yield "Users", [(1, "admin", password_hash, "admin", f"{self.first_year - 5}-01-01 09:00:00", 1)]
+        yield from self._instructors(rng, password_hash)
+        cohorts = yield from self._students(rng, password_hash)
+        shares = self._popularity(rng)
+        courses = self._course_rows(rng, shares, cohorts)
+        yield "Courses", courses
+        yield from self._enrollments_and_grades(rng, cohorts, courses, shares)
+
+    def _chunks(self, table, rows):
+        iterator = iter(rows)
+        while True:
+            batch = list(itertools.islice(iterator, self.batch_size))
+            if not batch:
+                return
+            yield table, batch
+
+    def _instructors(self, rng, password_hash):
+        first_user = 2
+        users, instructors = [], []
+        for i in range(self.instructors):
+            hire_year = rng.randint(self.first_year - 25, self.until_year - 1)
+            users.append((first_user + i, f"staff{i + 1:05}", password_hash, "instructor",
+                          f"{hire_year}-08-15 09:00:00", 1))
+            instructors.append((i + 1, first_user + i, f"S{i + 1:05}", rng.choice(FIRST_NAMES),
+                                rng.choice(LAST_NAMES), f"{hire_year}-08-15"))
+        yield from self._chunks("Users", users)
+        yield from self._chunks("Instructors", instructors)
+
+    def _students(self, rng, password_hash):
+        """
+        Yields Users and Students batches; returns each student's
+        (student_id, admission_year) for enrollment.
+        """
+        first_user = 2 + self.instructors
+        years = list(range(self.first_year, self.until_year + 1))
+        major_weights = list(itertools.accumulate(weight for _, _, weight in MAJORS))
+        cohorts = []
+        for start in range(0, self.students, self.batch_size):
+            users, students = [], []
+            for i in range(start, min(start + self.batch_size, self.students)):
+                student_id = i + 1
+                year = rng.choice(years)
+                major = bisect.bisect_right(major_weights, rng.random() * major_weights[-1])
+                terms_done = (self.until_year - year) * len(SEMESTERS)
+                roll = rng.random()
+                if terms_done >= TERMS_TO_GRADUATE:
+                    status = "graduated" if roll < 0.85 else "inactive"
+                else:
+                    status = "active" if roll < 0.95 else ("suspended" if roll < 0.97 else "inactive")
+                reg_no = f"{year}{student_id:07}"
+                users.append((first_user + i, f"s{reg_no}", password_hash, "student", f"{year}-08-20 09:00:00", 1))
+                students.append((student_id, first_user + i, reg_no, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                                 f"{year}-09-01", MAJORS[major][0], status))
+                cohorts.append((student_id, year))
+            yield "Users", users
+            yield "Students", students
+        return cohorts
+
+    def _student_terms(self, admission_year):
+        """
+        The (year, semester) terms a student admitted in `admission_year` has taken.
+        """
+        terms = [(admission_year, "Fall")]
+        for year in range(admission_year + 1, self.until_year + 1):
+            terms.extend((year, semester) for semester in SEMESTERS)
+        return terms[:TERMS_TO_GRADUATE]
+
+    def _popularity(self, rng):
+        """
+        Each course's share of enrollments: a power law over a shuffled ranking.
+        """
+        ranks = list(range(1, self.courses + 1))
+        rng.shuffle(ranks)
+        weights = [rank ** -self.skew for rank in ranks]
+        total = sum(weights)
+        return [weight / total for weight in weights]
+
+    def _course_rows(self, rng, shares, cohorts):
+        # Capacities are sized for the busiest term, when the most cohorts overlap.
+        cohort_sizes = collections.Counter(year for _, year in cohorts)
+        term_load = collections.Counter()
+        for year, size in cohort_sizes.items():
+            for term in self._student_terms(year):
+                term_load[term] += size
+        per_term = self.enrollments * max(term_load.values()) / sum(term_load.values())
+        rows, numbers = [], {}
+        for course_id in range(1, self.courses + 1):
+            department = MAJORS[(course_id - 1) % len(MAJORS)][1]
+            number = numbers[department] = numbers.get(department, 99) + 1
+            expected = shares[course_id - 1] * per_term
+            capacity = max(20, int(expected * 1.25 + 4 * expected ** 0.5) // 10 * 10 + 10)
+            roll = rng.random()
+            status = "active" if roll < 0.9 else ("inactive" if roll < 0.97 else "archived")
+            instructor_id = rng.randint(1, self.instructors) if roll < 0.98 else None
+            title = f"{rng.choice(COURSE_LEVELS)} {MAJORS[(course_id - 1) % len(MAJORS)][0]} {rng.choice(COURSE_TOPICS)}"
+            rows.append((course_id, f"{department}{number}", title, rng.choice((2, 3, 3, 3, 4, 4, 5)), capacity,
+                         instructor_id, status, f"{self.first_year - 1}-06-01 09:00:00"))
+        return rows
+
+    def _enrollments_and_grades(self, rng, cohorts, courses, shares):
+        cumulative = list(itertools.accumulate(shares))
+        # Courses that are no longer active don't take enrollments in the current term.
+        current = list(itertools.accumulate(
+            share if course[6] == "active" else 0.0 for share, course in zip(shares, courses)))
+        graders = [course[5] or 1 for course in courses]
+        difficulty = [rng.gauss(0, 5) for _ in courses]
+        total_terms = sum(len(self._student_terms(year)) for _, year in cohorts)
+        per_term = self.enrollments / total_terms if total_terms else 0
+        whole, fraction = int(per_term), per_term - int(per_term)
+        classify = self.scale.classify
+        last_term = (self.until_year, SEMESTERS[-1])
+
+        enrollment_id = grade_id = 0
+        enrollments, grades = [], []
+        for student_id, admission_year in cohorts:
+            ability = rng.gauss(64, 9)
+            for year, semester in self._student_terms(admission_year):
+                count = min(whole + (rng.random() < fraction), self.courses)
+                in_progress = (year, semester) == last_term
+                weights = current if in_progress else cumulative
+                top = weights[-1]
+                if not count or not top:
+                    continue
+                chosen = set()
+                for _ in range(count * 4):
+                    chosen.add(min(bisect.bisect_right(weights, rng.random() * top), self.courses - 1))
+                    if len(chosen) == count:
+                        break
+                start, graded = SEMESTER_DATES[semester]
+                for index in sorted(chosen):
+                    enrollment_id += 1
+                    if in_progress:
+                        enrollments.append((enrollment_id, year, semester, student_id, index + 1,
+                                            f"{year}-{start} 10:00:00", "enrolled", None))
+                    elif rng.random() < WITHDRAWAL_RATE:
+                        enrollments.append((enrollment_id, year, semester, student_id, index + 1,
+                                            f"{year}-{start} 10:00:00", "withdrawn", f"{year}-{start} 16:00:00"))
+                    else:
+                        enrollments.append((enrollment_id, year, semester, student_id, index + 1,
+                                            f"{year}-{start} 10:00:00", "completed", None))
+                        mark = round(min(100.0, max(0.0, rng.gauss(ability - difficulty[index], 10))), 2)
+                        grade_id += 1
+                        grades.append((grade_id, enrollment_id, classify(mark), mark, f"{year}-{graded} 12:00:00",
+                                       graders[index], None))
+            if len(enrollments) >= self.batch_size:
+                yield "Enrollments", enrollments
+                yield "Grades", grades
+                enrollments, grades = [], []
+        if enrollments:
+            yield "Enrollments", enrollments
+            yield "Grades", grades
+
+
+def _insert_sql(table):
+    columns = TABLES[table]
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+
+def write_sqlite(generator, path, schema_path="schema.sql", progress=None):
+    """
+    Creates a new database at `path` from the generator and migrates it to the
+    latest schema version. Returns {table: rows written}.
+    """
+    # Migrations import model-level helpers that depend on the database module.
+    from app.migrations import migrate
+
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists.")
+    with open(schema_path, encoding="utf-8") as schema_file:
+        schema_script = schema_file.read()
+
+    counts = dict.fromkeys(TABLES, 0)
+    connection = sqlite3.connect(path, isolation_level=None)
+    try:
+        # Nothing to protect until the load finishes; a failed run leaves a file to delete.
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("PRAGMA cache_size = -262144")
+        connection.executescript(schema_script)
+        connection.execute("BEGIN")
+        statements = {table: _insert_sql(table) for table in TABLES}
+        for table, rows in generator.batches():
+            connection.executemany(statements[table], rows)
+            counts[table] += len(rows)
+            if progress:
+                progress(counts)
+        connection.execute("COMMIT")
+        migrate(connection)
+        connection.execute("PRAGMA journal_mode = DELETE")
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    return counts
+
+
+def write_csv(generator, directory, progress=None, overwrite=False):
+    """
+    Writes one <Table>.csv with a header row per table into `directory`.
+    Returns {table: rows written}.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {table: os.path.join(directory, f"{table}.csv") for table in TABLES}
+    existing = [path for path in paths.values() if os.path.exists(path)]
+    if existing and not overwrite:
+        raise FileExistsError(f"{existing[0]} already exists.")
+
+    counts = dict.fromkeys(TABLES, 0)
+    files = {table: open(path, "w", newline="", encoding="utf-8") for table, path in paths.items()}
+    try:
+        writers = {table: csv.writer(files[table]) for table in TABLES}
+        for table, columns in TABLES.items():
+            writers[table].writerow(columns)
+        for table, rows in generator.batches():
+            writers[table].writerows(rows)
+            counts[table] += len(rows)
+            if progress:
+                progress(counts)
+    finally:
+        for csv_file in files.values():
+            csv_file.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--db", help="SQLite file to create")
+    output.add_argument("--csv", metavar="DIR", help="directory to write one CSV per table into")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"override the scale's number of {name}")
+    parser.add_argument("--skew", type=float, default=0.8, help="power-law exponent of course popularity")
+    parser.add_argument("--until-year", type=int, default=2024, help="year of the current (last) term")
+    parser.add_argument("--password", default="password", help="password of every generated account")
+    parser.add_argument("--hash-rounds", type=int, default=DEFAULT_BCRYPT_ROUNDS)
+    parser.add_argument("--force", action="store_true", help="replace an existing database or CSV files")
+    args = parser.parse_args()
+
+    sizes = {name: getattr(args, name) or default for name, default in SCALES[args.scale].items()}
+    generator = DatasetGenerator(seed=args.seed, skew=args.skew, until_year=args.until_year,
+                                 password=args.password, hash_rounds=args.hash_rounds, **sizes)
+
+    def progress(counts):
+        print(f"\r{sum(counts.values()):,} rows", end="", file=sys.stderr)
+
+    start = time.perf_counter()
+    try:
+        if args.db:
+            if args.force and os.path.exists(args.db):
+                os.remove(args.db)
+            counts = write_sqlite(generator, args.db, progress=progress)
+        else:
+            counts = write_csv(generator, args.csv, progress=progress, overwrite=args.force)
+    except FileExistsError as e:
+        print(f"Error: {e} Use --force to replace it.", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    for table, count in counts.items():
+        print(f"{table:<12} {count:>12,}")
+    total = sum(counts.values())
+    print(f"{'Total':<12} {total:>12,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
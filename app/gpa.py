@@ -0,0 +1,251 @@
+# app/gpa.py
+"""
+Per-student GPA aggregates kept in the StudentGPA table.
+
+Triggers on Grades add and subtract each grade's points, credits and mark as
+rows are inserted, updated or deleted, and a trigger on Courses re-weights
+a course's grades when its credits change, so reading a student's GPA or
+honours class is a primary-key lookup. The point and honours thresholds are
+compiled into the triggers from the default grading scale; rebuild_gpa_table()
+recomputes every row from scratch and reinstalls the triggers, e.g. after the
+scale changes. check_gpa_table() compares every stored column with a
+from-scratch computation.
+
+Usage: python -m app.gpa [rebuild|check]
+"""
+import itertools
+
+from app.database import get_connection, transaction
+from app.grading import get_scale
+
+CREATE_GPA_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS StudentGPA (
+        student_id INTEGER PRIMARY KEY,
+        grade_count INTEGER NOT NULL DEFAULT 0,
+        total_points REAL NOT NULL DEFAULT 0,
+        total_credits INTEGER NOT NULL DEFAULT 0,
+        weighted_points REAL NOT NULL DEFAULT 0,
+        total_marks REAL NOT NULL DEFAULT 0,
+        gpa REAL NOT NULL DEFAULT 0,
+        weighted_gpa REAL NOT NULL DEFAULT 0,
+        honours TEXT,
+        FOREIGN KEY (student_id) REFERENCES Students(student_id)
+    )
+"""
+
+TRIGGER_NAMES = ('trg_grades_gpa_insert', 'trg_grades_gpa_update', 'trg_grades_gpa_delete',
+                 'trg_courses_gpa_credits')
+
+# Stored StudentGPA columns, in the order check_gpa_table() compares them.
+GPA_COLUMNS = ('grade_count', 'total_points', 'total_credits', 'weighted_points', 'total_marks',
+               'gpa', 'weighted_gpa', 'honours')
+
+
+def _derived_columns_sql(scale):
+    """
+    SET clause recomputing gpa, weighted_gpa and honours from the running totals.
+    """
+    return f"""
+        gpa = CASE WHEN grade_count > 0 THEN ROUND(total_points / grade_count, 2) ELSE 0 END,
+        weighted_gpa = CASE WHEN total_credits > 0 THEN ROUND(weighted_points / total_credits, 2) ELSE 0 END,
+        honours = CASE WHEN grade_count > 0 THEN {scale.sql_honours_case('(total_marks / grade_count)')} END
+    """
+
+
+def _apply_grade_sql(scale, row, sign):
+    """
+    Statements adding (sign '+') or removing (sign '-') grade `row` (NEW or OLD)
+    from its student's aggregate.
+    """
+    student = f"(SELECT student_id FROM Enrollments WHERE enrollment_id = {row}.enrollment_id)"
+    credits = f"""COALESCE((
+            SELECT c.credits FROM Enrollments e JOIN Courses c ON c.course_id = e.course_id
+            WHERE e.enrollment_id = {row}.enrollment_id
+        ), 0)"""
+    points = scale.sql_points_case(f"{row}.numeric_grade")
+    return f"""
+        INSERT OR IGNORE INTO StudentGPA (student_id)
+        SELECT student_id FROM Enrollments WHERE enrollment_id = {row}.enrollment_id AND {row}.numeric_grade IS NOT NULL;
+        UPDATE StudentGPA SET
+            grade_count = grade_count {sign} 1,
+            total_points = total_points {sign} ({points}),
+            total_credits = total_credits {sign} {credits},
+            weighted_points = weighted_points {sign} ({points}) * {credits},
+            total_marks = total_marks {sign} {row}.numeric_grade
+        WHERE student_id = {student} AND {row}.numeric_grade IS NOT NULL;
+        UPDATE StudentGPA SET {_derived_columns_sql(scale)}
+        WHERE student_id = {student};
+    """
+
+
+def install_gpa_triggers(connection, scale=None):
+    """
+    (Re)creates the Grades triggers that maintain StudentGPA.
+    """
+    scale = scale or get_scale()
+    for name in TRIGGER_NAMES:
+        connection.execute(f"DROP TRIGGER IF EXISTS {name}")
+    connection.execute(f"""
+        CREATE TRIGGER trg_grades_gpa_insert AFTER INSERT ON Grades
+        BEGIN
+            {_apply_grade_sql(scale, 'NEW', '+')}
+        END
+    """)
+    connection.execute(f"""
+        CREATE TRIGGER trg_grades_gpa_update AFTER UPDATE OF enrollment_id, numeric_grade ON Grades
+        BEGIN
+            {_apply_grade_sql(scale, 'OLD', '-')}
+            {_apply_grade_sql(scale, 'NEW', '+')}
+        END
+    """)
+    connection.execute(f"""
+        CREATE TRIGGER trg_grades_gpa_delete AFTER DELETE ON Grades
+        BEGIN
+            {_apply_grade_sql(scale, 'OLD', '-')}
+        END
+    """)
+    install_credits_trigger(connection, scale)
+
+
+def install_credits_trigger(connection, scale=None):
+    """
+    (Re)creates the Courses trigger that re-weights StudentGPA when a course's
+    credits change.
+    """
+    scale = scale or get_scale()
+    points = scale.sql_points_case('g.numeric_grade')
+    difference = "(COALESCE(NEW.credits, 0) - COALESCE(OLD.credits, 0))"
+    graded = """
+        FROM Grades g JOIN Enrollments e ON e.enrollment_id = g.enrollment_id
+        WHERE e.course_id = NEW.course_id AND g.numeric_grade IS NOT NULL
+    """
+    connection.execute("DROP TRIGGER IF EXISTS trg_courses_gpa_credits")
+    connection.execute(f"""
+        CREATE TRIGGER trg_courses_gpa_credits AFTER UPDATE OF credits ON Courses
+        WHEN COALESCE(NEW.credits, 0) != COALESCE(OLD.credits, 0)
+        BEGIN
+            UPDATE StudentGPA SET
+                total_credits = total_credits + {difference} * (
+                    SELECT COUNT(*) {graded} AND e.student_id = StudentGPA.student_id
+                ),
+                weighted_points = weighted_points + {difference} * (
+                    SELECT COALESCE(SUM({points}), 0) {graded} AND e.student_id = StudentGPA.student_id
+                )
+            WHERE student_id IN (SELECT e.student_id {graded});
+            UPDATE StudentGPA SET {_derived_columns_sql(scale)}
+            WHERE student_id IN (SELECT e.student_id {graded});
+        END
+    """)
+
+
+def populate_gpa_table(connection, scale=None):
+    """
+    Recomputes every StudentGPA row from Grades in one grouped query.
+    """
+    scale = scale or get_scale()
+    points = scale.sql_points_case('g.numeric_grade')
+    connection.execute("DELETE FROM StudentGPA")
+    connection.execute(f"""
+        INSERT INTO StudentGPA (student_id, grade_count, total_points, total_credits, weighted_points, total_marks)
+        SELECT e.student_id, COUNT(*), SUM({points}), SUM(COALESCE(c.credits, 0)),
+            SUM(({points}) * COALESCE(c.credits, 0)), SUM(g.numeric_grade)
+        FROM Grades g
+        JOIN Enrollments e ON e.enrollment_id = g.enrollment_id
+        LEFT JOIN Courses c ON c.course_id = e.course_id
+        WHERE g.numeric_grade IS NOT NULL
+        GROUP BY e.student_id
+    """)
+    connection.execute(f"UPDATE StudentGPA SET {_derived_columns_sql(scale)}")
+
+
+def create_gpa_table(connection):
+    """
+    Migration step: creates StudentGPA, its triggers, and backfills it.
+    """
+    connection.execute(CREATE_GPA_TABLE_SQL)
+    install_gpa_triggers(connection)
+    populate_gpa_table(connection)
+
+
+def rebuild_gpa_table(scale=None):
+    """
+    Reinstalls the triggers and recomputes StudentGPA in one transaction.
+    """
+    with transaction() as connection:
+        install_gpa_triggers(connection.raw, scale)
+        populate_gpa_table(connection.raw, scale)
+
+
+def check_gpa_table(scale=None, tolerance=0.005):
+    """
+    Compares every StudentGPA column with values computed from scratch in Python.
+
+    Returns a list of (student_id, field, stored, expected) mismatches; an
+    empty list means the table is consistent.
+    """
+    scale = scale or get_scale()
+    connection = get_connection()
+    stored = {
+        row[0]: dict(zip(GPA_COLUMNS, row[1:]))
+        for row in connection.execute(f"SELECT student_id, {', '.join(GPA_COLUMNS)} FROM StudentGPA")
+    }
+    grades = connection.execute("""
+        SELECT e.student_id, g.numeric_grade, COALESCE(c.credits, 0)
+        FROM Grades g
+        JOIN Enrollments e ON e.enrollment_id = g.enrollment_id
+        LEFT JOIN Courses c ON c.course_id = e.course_id
+        WHERE g.numeric_grade IS NOT NULL
+        ORDER BY e.student_id
+    """)
+
+    expected = {}
+    for student_id, rows in itertools.groupby(grades, key=lambda row: row[0]):
+        rows = list(rows)
+        marks = [mark for _, mark, _ in rows]
+        total_credits = sum(credits for _, _, credits in rows)
+        weighted_points = sum(scale.points(mark) * credits for _, mark, credits in rows)
+        expected[student_id] = {
+            'grade_count': len(marks),
+            'total_points': sum(scale.points(mark) for mark in marks),
+            'total_credits': total_credits,
+            'weighted_points': weighted_points,
+            'total_marks': sum(marks),
+            'gpa': scale.gpa(marks),
+            'weighted_gpa': round(weighted_points / total_credits, 2) if total_credits else 0,
+            'honours': scale.classify_honours(sum(marks) / len(marks)),
+        }
+    connection.close()
+
+    # Students whose grades were all removed keep a row of zeros.
+    empty = dict.fromkeys(GPA_COLUMNS, 0)
+    empty['honours'] = None
+    mismatches = []
+    for student_id in sorted(expected.keys() | stored.keys()):
+        if student_id not in stored:
+            mismatches.append((student_id, 'missing', None, expected[student_id]['gpa']))
+            continue
+        want = expected.get(student_id, empty)
+        for field in GPA_COLUMNS:
+            have = stored[student_id][field]
+            if isinstance(have, (int, float)) and isinstance(want[field], (int, float)):
+                matches = abs(have - want[field]) <= tolerance
+            else:
+                matches = have == want[field]
+            if not matches:
+                mismatches.append((student_id, field, have, want[field]))
+    return mismatches
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+    if command == "rebuild":
+        rebuild_gpa_table()
+        print("StudentGPA rebuilt.")
+    elif command == "check":
+        problems = check_gpa_table()
+        for student_id, field, stored_value, expected in problems:
+            print(f"Student {student_id}: {field} is {stored_value}, expected {expected}")
+        print(f"{len(problems)} inconsistencies found.")
+    else:
+        print("Usage: python -m app.gpa [rebuild|check]")
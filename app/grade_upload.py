@@ -0,0 +1,160 @@
+# app/grade_upload.py
+"""
+Bulk grade submission for whole courses.
+
+Rows are (reg_no, course_code, numeric_grade, comments) tuples, or a CSV with
+those column headers. The batch is staged in a temp table, matched to
+enrollments with one join, given letter grades in the same INSERT ... SELECT,
+and written in a single transaction. A new submission for an enrollment
+replaces its previous grade.
+"""
+import csv
+import time
+
+from app.bulk_import import ImportResult
+from app.database import transaction
+from app.grading import get_scale
+
+
+def _parse_mark(value):
+    try:
+        mark = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid grade '{value}'.")
+    if not 0 <= mark <= 100:
+        raise ValueError(f"Grade {value} is outside 0-100.")
+    return mark
+
+
+def _staged_rows(rows, first_line, result):
+    for line_number, row in enumerate(rows, start=first_line):
+        result.rows += 1
+        if len(row) < 3:
+            result.reject(line_number, "Expected reg_no, course_code and numeric_grade.")
+            continue
+        reg_no, course_code, numeric_grade = row[0], row[1], row[2]
+        comments = row[3] if len(row) > 3 else None
+        if not reg_no or not course_code:
+            result.reject(line_number, "All required fields must be filled.")
+            continue
+        try:
+            mark = _parse_mark(numeric_grade)
+        except ValueError as e:
+            result.reject(line_number, str(e))
+            continue
+        yield line_number, str(reg_no).strip(), str(course_code).strip(), mark, comments or None
+
+
+def upload_grades(rows, submitted_by, year=None, semester=None, first_line=1, scale=None):
+    """
+    Submits a batch of grades on behalf of instructor `submitted_by`.
+
+    Each row is matched to the student's enrollment in the course, restricted
+    to one term when `year`/`semester` are given and otherwise the most recent
+    one. Rows that are too short, have invalid marks, are for a course another
+    instructor teaches, have no matching enrollment, or have a later row for
+    the same enrollment are rejected. Letter grades come from the named
+    grading scale (default scale if None). Returns an ImportResult.
+    """
+    grading_scale = get_scale(scale)
+    result = ImportResult()
+    start = time.perf_counter()
+
+    with transaction() as connection:
+        cursor = connection.cursor()
+        cursor.execute("DROP TABLE IF EXISTS temp.grade_upload")
+        cursor.execute("""
+            CREATE TEMP TABLE grade_upload (
+                line_number INTEGER PRIMARY KEY,
+                reg_no TEXT,
+                course_code TEXT,
+                numeric_grade REAL,
+                comments TEXT,
+                enrollment_id INTEGER
+            )
+        """)
+        cursor.executemany(
+            "INSERT INTO temp.grade_upload (line_number, reg_no, course_code, numeric_grade, comments) "
+            "VALUES (?, ?, ?, ?, ?)",
+            _staged_rows(rows, first_line, result),
+        )
+
+        cursor.execute("""
+            UPDATE temp.grade_upload
+            SET enrollment_id = (
+                SELECT e.enrollment_id
+                FROM Students s
+                JOIN Enrollments e ON e.student_id = s.student_id
+                JOIN Courses c ON c.course_id = e.course_id
+                WHERE s.reg_no = grade_upload.reg_no
+                    AND c.course_code = grade_upload.course_code
+                    AND c.instructor_id = ?3
+                    AND (?1 IS NULL OR e.year = ?1)
+                    AND (?2 IS NULL OR e.semester = ?2)
+                ORDER BY e.year DESC, e.enrollment_id DESC
+                LIMIT 1
+            )
+        """, (year, semester, submitted_by))
+
+        for line_number, reg_no, course_code, owned in cursor.execute("""
+            SELECT line_number, reg_no, course_code,
+                NOT EXISTS (
+                    SELECT 1 FROM Courses c
+                    WHERE c.course_code = grade_upload.course_code AND c.instructor_id IS NOT ?
+                )
+            FROM temp.grade_upload
+            WHERE enrollment_id IS NULL
+        """, (submitted_by,)).fetchall():
+            if owned:
+                result.reject(line_number, f"No enrollment for {reg_no} in {course_code}.")
+            else:
+                result.reject(line_number, f"{course_code} is not your course.")
+
+        superseded = cursor.execute("""
+            SELECT line_number, last_line
+            FROM (
+                SELECT line_number,
+                    MAX(line_number) OVER (PARTITION BY enrollment_id) AS last_line
+                FROM temp.grade_upload
+                WHERE enrollment_id IS NOT NULL
+            )
+            WHERE line_number < last_line
+        """).fetchall()
+        for line_number, last_line in superseded:
+            result.reject(line_number, f"Superseded by line {last_line}.")
+
+        cursor.execute("DELETE FROM temp.grade_upload WHERE enrollment_id IS NULL")
+        cursor.executemany(
+            "DELETE FROM temp.grade_upload WHERE line_number = ?",
+            ((line_number,) for line_number, _ in superseded),
+        )
+        cursor.execute("CREATE INDEX temp.idx_grade_upload_enrollment ON grade_upload (enrollment_id)")
+
+        cursor.execute("""
+            DELETE FROM Grades
+            WHERE enrollment_id IN (SELECT enrollment_id FROM temp.grade_upload)
+        """)
+        cursor.execute(f"""
+            INSERT INTO Grades (enrollment_id, grade_value, numeric_grade, submitted_by, comments)
+            SELECT enrollment_id, {grading_scale.sql_case('numeric_grade')}, numeric_grade, ?, comments
+            FROM temp.grade_upload
+            ORDER BY line_number
+        """, (submitted_by,))
+        result.imported = cursor.rowcount
+        cursor.execute("DROP TABLE temp.grade_upload")
+
+    result.rejects.sort()
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def upload_grades_csv(path, submitted_by, year=None, semester=None):
+    """
+    Submits grades from a CSV with reg_no,course_code,numeric_grade[,comments] columns.
+    """
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        rows = (
+            (row.get('reg_no'), row.get('course_code'), row.get('numeric_grade'), row.get('comments'))
+            for row in csv.DictReader(csv_file)
+        )
+        return upload_grades(rows, submitted_by, year, semester, first_line=2)
@@ -0,0 +1,211 @@
+# app/grading.py
+"""
+Grading scales compiled into sorted threshold tables.
+
+A scale is built once from a grade-points table and an honours table (the
+GRADE_POINTS / HONOURS_CLASSIFICATIONS layout) and then classifies marks with
+a binary search instead of re-parsing range strings per call. Each band is
+taken to start at the lower bound of its range and run up to the next band,
+so fractional marks such as 79.5 land in the band below 80.
+"""
+import bisect
+import json
+import sys
+
+# Grading system with honours classifications
+GRADE_POINTS = {
+    'A+': {'points': 5.0, 'range': '80-100', 'class': 'First Class'},
+    'A':  {'points': 4.75, 'range': '75-79', 'class': 'First Class'},
+    'A-': {'points': 4.5, 'range': '70-74', 'class': 'First Class'},
+    'B+': {'points': 4.0, 'range': '65-69', 'class': 'Upper Second'},
+    'B':  {'points': 3.75, 'range': '63-64', 'class': 'Upper Second'},
+    'B-': {'points': 3.5, 'range': '60-62', 'class': 'Upper Second'},
+    'C+': {'points': 3.0, 'range': '55-59', 'class': 'Lower Second'},
+    'C':  {'points': 2.75, 'range': '53-54', 'class': 'Lower Second'},
+    'C-': {'points': 2.5, 'range': '50-52', 'class': 'Lower Second'},
+    'D+': {'points': 2.0, 'range': '45-49', 'class': 'Third'},
+    'D':  {'points': 1.5, 'range': '43-44', 'class': 'Third'},
+    'D-': {'points': 1.0, 'range': '40-42', 'class': 'Third'},
+    'F':  {'points': 0.0, 'range': '0-39', 'class': 'Fail'}
+}
+
+HONOURS_CLASSIFICATIONS = {
+    'First Class': {'min_average': 70, 'description': 'First Class Honours (1st)'},
+    'Upper Second': {'min_average': 60, 'description': 'Upper Second Class Honours (2:1)'},
+    'Lower Second': {'min_average': 50, 'description': 'Lower Second Class Honours (2:2)'},
+    'Third': {'min_average': 40, 'description': 'Third Class Honours (3rd)'},
+    'Fail': {'min_average': 0, 'description': 'Fail'}
+}
+
+DEFAULT_SCALE = 'default'
+
+
+def _is_ndarray(value):
+    # An ndarray can only exist if NumPy is already imported, so don't import it here.
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+class GradingScale:
+    def __init__(self, name, grade_points, honours_classifications):
+        if not grade_points or not honours_classifications:
+            raise ValueError(f"Grading scale '{name}' needs grade points and honours classifications.")
+        self.name = name
+        self.grade_points = grade_points
+        self.honours_classifications = honours_classifications
+
+        bands = sorted(
+            (float(details['range'].split('-')[0]), grade, float(details['points']))
+            for grade, details in grade_points.items()
+        )
+        self._lower_bounds = [lower for lower, _, _ in bands]
+        self._grades = [grade for _, grade, _ in bands]
+        self._points = [points for _, _, points in bands]
+
+        honours = sorted(
+            (float(details['min_average']), details['description'])
+            for details in honours_classifications.values()
+        )
+        self._honours_bounds = [minimum for minimum, _ in honours]
+        self._honours = [description for _, description in honours]
+
+    @property
+    def grades(self):
+        """
+        Letter grades from highest band to lowest.
+        """
+        return list(reversed(self._grades))
+
+    def _band(self, mark):
+        # Marks below the lowest bound still belong to the lowest band.
+        return max(bisect.bisect_right(self._lower_bounds, mark) - 1, 0)
+
+    def classify(self, mark):
+        """
+        Returns the letter grade for a numeric mark.
+        """
+        return self._grades[self._band(mark)]
+
+    def points(self, mark):
+        """
+        Returns the grade points earned by a numeric mark.
+        """
+        return self._points[self._band(mark)]
+
+    def classify_many(self, marks):
+        """
+        Letter grades for a sequence of marks. NumPy arrays are classified in
+        one vectorised pass and give back an array.
+        """
+        if _is_ndarray(marks):
+            import numpy as np
+
+            return np.asarray(self._grades, dtype=object)[self._bands_array(marks)]
+        return [self._grades[self._band(mark)] for mark in marks]
+
+    def points_many(self, marks):
+        """
+        Grade points for a sequence of marks, vectorised for NumPy arrays.
+        """
+        if _is_ndarray(marks):
+            import numpy as np
+
+            return np.asarray(self._points)[self._bands_array(marks)]
+        return [self._points[self._band(mark)] for mark in marks]
+
+    def _bands_array(self, marks):
+        import numpy as np
+
+        bands = np.searchsorted(np.asarray(self._lower_bounds), marks, side='right') - 1
+        return np.clip(bands, 0, None)
+
+    def gpa(self, marks):
+        """
+        Mean grade points over the given marks, rounded to two places.
+        """
+        points = self.points_many(marks)
+        if len(points) == 0:
+            return 0.0
+        return round(float(sum(points)) / len(points), 2)
+
+    def classify_honours(self, average):
+        """
+        Returns the honours description for an average measured against the
+        scale's min_average thresholds.
+        """
+        index = bisect.bisect_right(self._honours_bounds, average) - 1
+        return self._honours[max(index, 0)]
+
+    def sql_case(self, column):
+        """
+        A CASE expression giving the letter grade for `column`, for use in
+        set-based queries.
+        """
+        branches = " ".join(
+            f"WHEN {column} >= {lower!r} THEN '{grade}'"
+            for lower, grade in reversed(list(zip(self._lower_bounds[1:], self._grades[1:])))
+        )
+        return f"CASE {branches} ELSE '{self._grades[0]}' END"
+
+    def sql_points_case(self, column):
+        """
+        A CASE expression giving the grade points for `column`.
+        """
+        branches = " ".join(
+            f"WHEN {column} >= {lower!r} THEN {points!r}"
+            for lower, points in reversed(list(zip(self._lower_bounds[1:], self._points[1:])))
+        )
+        return f"CASE {branches} ELSE {self._points[0]!r} END"
+
+    def sql_honours_case(self, column):
+        """
+        A CASE expression giving the honours description for an average in `column`.
+        """
+        branches = " ".join(
+            "WHEN {} >= {!r} THEN '{}'".format(column, minimum, description.replace("'", "''"))
+            for minimum, description in reversed(list(zip(self._honours_bounds[1:], self._honours[1:])))
+        )
+        lowest = self._honours[0].replace("'", "''")
+        return f"CASE {branches} ELSE '{lowest}' END"
+
+    def __repr__(self):
+        return f"GradingScale({self.name!r})"
+
+
+_scales = {DEFAULT_SCALE: GradingScale(DEFAULT_SCALE, GRADE_POINTS, HONOURS_CLASSIFICATIONS)}
+
+
+def register_scale(scale):
+    _scales[scale.name] = scale
+    return scale
+
+
+def get_scale(name=None):
+    """
+    Returns a registered scale by name, or the default scale.
+    """
+    name = name or DEFAULT_SCALE
+    try:
+        return _scales[name]
+    except KeyError:
+        raise ValueError(f"Unknown grading scale '{name}'.")
+
+
+def load_scales(path):
+    """
+    Registers every scale in a JSON config file of the form
+
+        {"<name>": {"grade_points": {...}, "honours_classifications": {...}}}
+
+    using the same layout as GRADE_POINTS and HONOURS_CLASSIFICATIONS. A scale
+    without its own honours table uses the default one. Returns the names loaded.
+    """
+    with open(path, "r", encoding="utf-8") as config_file:
+        config = json.load(config_file)
+    for name, definition in config.items():
+        register_scale(GradingScale(
+            name,
+            definition['grade_points'],
+            definition.get('honours_classifications', HONOURS_CLASSIFICATIONS),
+        ))
+    return list(config)
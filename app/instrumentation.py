@@ -0,0 +1,377 @@
+# app/instrumentation.py
+"""
+Per-query-shape SQL statistics and a slow-query log.
+
+Pooled connections are InstrumentedConnections. While monitoring is off they
+behave exactly like sqlite3.Connection; while it is on, every statement runs
+on an InstrumentedCursor that times the execute call and every fetch from it
+(time spent in Python between fetches doesn't count) and reports to the
+QueryMonitor once the statement is finished: its rows are exhausted, or the
+cursor is re-executed, closed or discarded.
+
+Statements are grouped by shape: whitespace collapsed, literals replaced with
+?, and IN (?, ?, ...) lists folded, so every call of a model method lands in
+one bucket however its SQL was built. For each shape the monitor keeps counts,
+total and max time, rows returned (or changed), and a window of recent
+latencies for percentiles. A statement slower than the threshold is logged to
+the "app.slow_queries" logger and kept, with its EXPLAIN QUERY PLAN, for the
+admin report.
+
+Monitoring starts off unless STUDENT_DB_QUERY_STATS or STUDENT_DB_SLOW_QUERY_MS
+is set; the latter is the slow-query threshold in milliseconds (default 100),
+and, like main.py's --slow-query-ms, setting it implies monitoring.
+"""
+import collections
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+QUERY_STATS_ENV_VAR = "STUDENT_DB_QUERY_STATS"
+SLOW_QUERY_ENV_VAR = "STUDENT_DB_SLOW_QUERY_MS"
+DEFAULT_SLOW_QUERY_MS = 100.0
+# Recent latencies kept per shape for percentiles.
+LATENCY_WINDOW = 1024
+SLOW_QUERY_LOG_SIZE = 100
+PERCENTILES = (0.5, 0.95, 0.99)
+# Statements EXPLAIN QUERY PLAN can describe.
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_query(sql):
+    """
+    The shape of a statement: its text with literals replaced by ? and runs
+    of placeholders folded into "?, ...".
+    """
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip().rstrip(";").strip()
+    return _PLACEHOLDER_LIST.sub("?, ...", shape)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class QueryStats:
+    __slots__ = ('shape', 'count', 'total', 'max', 'rows', 'slow', 'latencies')
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def as_dict(self):
+        latencies = sorted(self.latencies)
+        stats = {
+            'query': self.shape,
+            'count': self.count,
+            'total_s': self.total,
+            'mean_s': self.total / self.count if self.count else 0.0,
+            'max_s': self.max,
+            'rows': self.rows,
+            'slow': self.slow,
+        }
+        for fraction in PERCENTILES:
+            stats[f"p{int(fraction * 100)}_s"] = _percentile(latencies, fraction)
+        return stats
+
+
+class QueryMonitor:
+    """
+    Collects statement timings from instrumented connections.
+    """
+    def __init__(self, enabled=False, slow_query_ms=DEFAULT_SLOW_QUERY_MS):
+        self.enabled = enabled
+        self.slow_query_seconds = slow_query_ms / 1000.0
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._slow_queries = collections.deque(maxlen=SLOW_QUERY_LOG_SIZE)
+        self._started = time.time()
+
+    def enable(self, slow_query_ms=None):
+        if slow_query_ms is not None:
+            self.slow_query_seconds = slow_query_ms / 1000.0
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow_queries.clear()
+            self._started = time.time()
+
+    def record(self, connection, sql, parameters, elapsed, rows):
+        shape = normalize_query(sql)
+        slow = elapsed >= self.slow_query_seconds
+        with self._lock:
+            stats = self._stats.get(shape)
+            if stats is None:
+                stats = self._stats[shape] = QueryStats(shape)
+            stats.count += 1
+            stats.total += elapsed
+            stats.rows += max(rows, 0)
+            stats.latencies.append(elapsed)
+            if elapsed > stats.max:
+                stats.max = elapsed
+            if slow:
+                stats.slow += 1
+        if slow:
+            self._log_slow_query(connection, shape, sql, parameters, elapsed, rows)
+
+    def _log_slow_query(self, connection, shape, sql, parameters, elapsed, rows):
+        import logging
+
+        plan = explain_query_plan(connection, sql, parameters)
+        entry = {
+            'time': time.time(),
+            'query': shape,
+            'elapsed_s': elapsed,
+            'rows': rows,
+            'plan': plan,
+        }
+        with self._lock:
+            self._slow_queries.append(entry)
+        logging.getLogger("app.slow_queries").warning(
+            "Slow query (%.1f ms, %d rows): %s\n%s", elapsed * 1000, rows, shape, "\n".join(plan))
+
+    def get_stats(self, order_by='total_s'):
+        """
+        One dict per query shape, slowest in total first.
+        """
+        with self._lock:
+            stats = [query.as_dict() for query in self._stats.values()]
+        return sorted(stats, key=lambda query: -query[order_by])
+
+    def get_slow_queries(self):
+        with self._lock:
+            return list(self._slow_queries)
+
+    def to_json(self):
+        return json.dumps({
+            'enabled': self.enabled,
+            'since': self._started,
+            'slow_query_ms': self.slow_query_seconds * 1000,
+            'queries': self.get_stats(),
+            'slow_queries': self.get_slow_queries(),
+        }, indent=2)
+
+    def to_prometheus(self):
+        """
+        The statistics in the Prometheus text exposition format.
+        """
+        stats = self.get_stats()
+        lines = [
+            "# HELP student_db_query_duration_seconds SQL statement latency by query shape.",
+            "# TYPE student_db_query_duration_seconds summary",
+        ]
+        for query in stats:
+            label = _prometheus_label(query['query'])
+            for fraction in PERCENTILES:
+                lines.append(f'student_db_query_duration_seconds{{query="{label}",quantile="{fraction}"}} '
+                             f'{query[f"p{int(fraction * 100)}_s"]:.9f}')
+            lines.append(f'student_db_query_duration_seconds_sum{{query="{label}"}} {query["total_s"]:.9f}')
+            lines.append(f'student_db_query_duration_seconds_count{{query="{label}"}} {query["count"]}')
+        for name, key, help_text in (
+            ("student_db_query_rows_total", "rows", "Rows returned or changed, by query shape."),
+            ("student_db_slow_queries_total", "slow", "Statements slower than the slow-query threshold."),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for query in stats:
+                lines.append(f'{name}{{query="{_prometheus_label(query["query"])}"}} {query[key]}')
+        return "\n".join(lines) + "\n"
+
+
+def _prometheus_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def explain_query_plan(connection, sql, parameters=()):
+    """
+    EXPLAIN QUERY PLAN for a statement as indented lines, or [] if it can't be explained.
+    """
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return []
+    try:
+        rows = sqlite3.Connection.execute(connection, "EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+    except sqlite3.Error:
+        return []
+    depth = {0: 0}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, 0) + 1
+        lines.append("  " * (depth[node_id] - 1) + detail)
+    return lines
+
+
+def _env_slow_query_ms():
+    try:
+        return float(os.environ.get(SLOW_QUERY_ENV_VAR, DEFAULT_SLOW_QUERY_MS))
+    except ValueError:
+        return DEFAULT_SLOW_QUERY_MS
+
+
+query_monitor = QueryMonitor(
+    enabled=bool(os.environ.get(QUERY_STATS_ENV_VAR) or os.environ.get(SLOW_QUERY_ENV_VAR)),
+    slow_query_ms=_env_slow_query_ms(),
+)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that reports each statement to the query monitor when it finishes.
+    """
+    _sql = None
+
+    def _begin(self, sql, parameters):
+        self._finish()
+        self._sql = sql
+        self._parameters = parameters
+        self._elapsed = 0.0
+        self._rows = 0
+
+    def _finish(self):
+        if self._sql is None:
+            return
+        sql, self._sql = self._sql, None
+        rows = self._rows if self.description is not None else self.rowcount
+        query_monitor.record(self.connection, sql, self._parameters, self._elapsed, rows)
+
+    def execute(self, sql, parameters=()):
+        self._begin(sql, parameters)
+        start = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        finally:
+            self._elapsed += time.perf_counter() - start
+            if self.description is None:
+                self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        first = []
+
+        def remember_first(rows):
+            for row in rows:
+                if not first:
+                    first.append(row)
+                yield row
+
+        self._begin(sql, ())
+        start = time.perf_counter()
+        try:
+            super().executemany(sql, remember_first(seq_of_parameters))
+        finally:
+            self._elapsed += time.perf_counter() - start
+            self._parameters = first[0] if first else ()
+            self._finish()
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - start
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._elapsed += time.perf_counter() - start
+        self._rows += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - start
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._elapsed += time.perf_counter() - start
+            self._finish()
+            raise
+        self._elapsed += time.perf_counter() - start
+        self._rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection whose cursors are instrumented while monitoring is on.
+    """
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = InstrumentedCursor if query_monitor.enabled else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        if not query_monitor.enabled:
+            return super().execute(sql, parameters)
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not query_monitor.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def enable_query_monitoring(slow_query_ms=None):
+    query_monitor.enable(slow_query_ms)
+
+
+def disable_query_monitoring():
+    query_monitor.disable()
+
+
+def get_query_stats():
+    return query_monitor.get_stats()
+
+
+def write_query_stats(path):
+    """
+    Dumps the statistics to `path`: Prometheus text for .prom/.txt files,
+    JSON otherwise.
+    """
+    text = query_monitor.to_prometheus() if path.endswith((".prom", ".txt")) else query_monitor.to_json()
+    with open(path, "w", encoding="utf-8") as output:
+        output.write(text)
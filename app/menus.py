@@ -21,7 +21,9 @@ def main_menu():
             SessionManager.login_user(user)
             role_based_menu(user[3])
     elif choice == "2":
-        AuthenticationService.reset_password()
+        username = input("Username: ")
+        new_password = input("New password: ")
+        AuthenticationService.reset_password(username, new_password)
     elif choice == "3":
         username = input("Enter username: ")
         password = input("Enter password: ")
@@ -89,7 +91,7 @@ def instructor_menu():
         if choice == "1":
             InstructorService.view_assigned_courses()
         elif choice == "2":
-            InstructorService.assign_grade()
+            InstructorService.upload_grades()
         elif choice == "3":
             InstructorService.view_assigned_course_statistics()
         elif choice == "4":
@@ -0,0 +1,100 @@
+# app/migrations.py
+"""
+Numbered schema migrations, tracked with PRAGMA user_version.
+
+Version 0 is the baseline schema in schema.sql. Each entry in MIGRATIONS moves
+the database up by one version; append new steps, never edit applied ones.
+"""
+from app.gpa import create_gpa_table, install_credits_trigger
+from app.search import create_search_index
+
+MIGRATIONS = [
+    (1, "Index hot-path lookups and joins", [
+        # Course listing by instructor (Instructor.get_assigned_courses, get_course_count).
+        """
+        CREATE INDEX IF NOT EXISTS idx_courses_instructor
+        ON Courses (instructor_id, course_code, title, credits, max_enrollment)
+        """,
+        # Enrollment counts per course (Enrollment.get_enrollment_statistics_*).
+        """
+        CREATE INDEX IF NOT EXISTS idx_enrollments_course
+        ON Enrollments (course_id, student_id)
+        """,
+        # Grade lookups per enrollment (transcripts, grade resubmission, StudentGPA rebuilds).
+        """
+        CREATE INDEX IF NOT EXISTS idx_grades_enrollment
+        ON Grades (enrollment_id, numeric_grade)
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_students_status ON Students (status)",
+        "CREATE INDEX IF NOT EXISTS idx_courses_status ON Courses (status, course_code, title)",
+    ]),
+    (2, "Index cohort lookups and per-term enrollment counts", [
+        # Student.find_ids_by_cohort selects by major and admission year.
+        """
+        CREATE INDEX IF NOT EXISTS idx_students_cohort
+        ON Students (major, admission_date, status)
+        """,
+        # Capacity checks count a course's enrollments for one term.
+        """
+        CREATE INDEX IF NOT EXISTS idx_enrollments_course_term
+        ON Enrollments (course_id, year, semester, status)
+        """,
+    ]),
+    (3, "Maintain per-student GPA aggregates", [
+        create_gpa_table,
+    ]),
+    (4, "Full-text search over students and courses", [
+        create_search_index,
+    ]),
+    (5, "Re-weight per-student GPA aggregates when course credits change", [
+        install_credits_trigger,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def get_schema_version(connection):
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(connection, target_version=LATEST_VERSION):
+    """
+    Applies every pending migration up to `target_version`, one transaction per
+    step. Returns the list of (version, description) pairs that were applied.
+    """
+    applied = []
+    for version, description, statements in MIGRATIONS:
+        if version > target_version:
+            break
+        if get_schema_version(connection) >= version:
+            continue
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied this step while we waited for the lock.
+            if get_schema_version(connection) >= version:
+                connection.execute("COMMIT")
+                continue
+            for statement in statements:
+                if callable(statement):
+                    statement(connection)
+                else:
+                    connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {int(version)}")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        applied.append((version, description))
+    return applied
+
+
+if __name__ == "__main__":
+    from app.database import get_connection
+
+    connection = get_connection()
+    for version, description in migrate(connection):
+        print(f"Applied migration {version}: {description}")
+    print(f"Schema version: {get_schema_version(connection)}")
+    connection.close()
@@ -1,44 +1,28 @@
 # app/models.py
 
-import sqlite3
-from app.database import DB_NAME
-
-# Grading system with honours classifications
-GRADE_POINTS = {
-    'A+': {'points': 5.0, 'range': '80-100', 'class': 'First Class'},
-    'A':  {'points': 4.75, 'range': '75-79', 'class': 'First Class'},
-    'A-': {'points': 4.5, 'range': '70-74', 'class': 'First Class'},
-    'B+': {'points': 4.0, 'range': '65-69', 'class': 'Upper Second'},
-    'B':  {'points': 3.75, 'range': '63-64', 'class': 'Upper Second'},
-    'B-': {'points': 3.5, 'range': '60-62', 'class': 'Upper Second'},
-    'C+': {'points': 3.0, 'range': '55-59', 'class': 'Lower Second'},
-    'C':  {'points': 2.75, 'range': '53-54', 'class': 'Lower Second'},
-    'C-': {'points': 2.5, 'range': '50-52', 'class': 'Lower Second'},
-    'D+': {'points': 2.0, 'range': '45-49', 'class': 'Third'},
-    'D':  {'points': 1.5, 'range': '43-44', 'class': 'Third'},
-    'D-': {'points': 1.0, 'range': '40-42', 'class': 'Third'},
-    'F':  {'points': 0.0, 'range': '0-39', 'class': 'Fail'}
-}
-
-HONOURS_CLASSIFICATIONS = {
-    'First Class': {'min_average': 70, 'description': 'First Class Honours (1st)'},
-    'Upper Second': {'min_average': 60, 'description': 'Upper Second Class Honours (2:1)'},
-    'Lower Second': {'min_average': 50, 'description': 'Lower Second Class Honours (2:2)'},
-    'Third': {'min_average': 40, 'description': 'Third Class Honours (3rd)'},
-    'Fail': {'min_average': 0, 'description': 'Fail'}
-}
+from itertools import chain
+
+from app.cache import cached_report
+from app.database import get_connection, transaction
+# The grading tables live in app.grading; they are still importable from here.
+from app.grading import GRADE_POINTS, HONOURS_CLASSIFICATIONS, get_scale
+
+DEFAULT_PAGE_SIZE = 500
 
 class BaseModel:
     """
     Base class for all models, providing connection and utility methods.
     """
     def __init__(self):
-        self.connection = sqlite3.connect(DB_NAME)
+        self.connection = get_connection()
         self.cursor = self.connection.cursor()
 
     @staticmethod
     def get_connection():
-        return sqlite3.connect(DB_NAME)
+        """
+        Checks a connection out of the shared pool; close() returns it.
+        """
+        return get_connection()
 
     def save(self):
         self.connection.commit()
@@ -46,13 +30,52 @@ class BaseModel:
     def close(self):
         self.connection.close()
 
-    def validate_fields(self, required_fields):
+    @staticmethod
+    def validate_fields(required_fields):
         """
         Validates that all required fields are non-empty.
         """
         if any(field is None or str(field).strip() == "" for field in required_fields):
             raise ValueError("All required fields must be filled.")
 
+    @staticmethod
+    def iter_pages(columns, source, key, filters=None, page_size=DEFAULT_PAGE_SIZE, after=None, with_key=False):
+        """
+        Yields lists of up to page_size rows of `columns` from `source`,
+        ordered by `key` (a unique integer column). Each page starts after
+        the last key seen, so it is an index range seek however deep the
+        listing goes, and only one page is held in memory. A connection is
+        checked out per page, not for the whole iteration.
+
+        `filters` maps column expressions to required values; None means
+        "don't filter on this column". `after` resumes a listing after a
+        previously seen key; with_key keeps the key as each row's first
+        column, for callers that hand it back as `after`.
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1.")
+        filters = {column: value for column, value in (filters or {}).items() if value is not None}
+        conditions = [f"{column} = ?" for column in filters]
+        last_key = after
+        while True:
+            where = conditions + ([f"{key} > ?"] if last_key is not None else [])
+            query = f"SELECT {key}, {columns} FROM {source}"
+            if where:
+                query += " WHERE " + " AND ".join(where)
+            query += f" ORDER BY {key} LIMIT ?"
+            parameters = list(filters.values()) + ([last_key] if last_key is not None else []) + [page_size]
+            connection = get_connection()
+            try:
+                rows = connection.execute(query, parameters).fetchall()
+            finally:
+                connection.close()
+            if not rows:
+                return
+            last_key = rows[-1][0]
+            yield rows if with_key else [row[1:] for row in rows]
+            if len(rows) < page_size:
+                return
+
 
 class User(BaseModel):
     def __init__(self, username, password_hash, role):
@@ -82,6 +105,20 @@ class User(BaseModel):
         connection.close()
         return users
 
+    @staticmethod
+    def find_pages(role=None, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yields pages of Users rows (as find_all), optionally for one role.
+        """
+        return BaseModel.iter_pages("*", "Users", "user_id", {"role": role}, page_size)
+
+    @staticmethod
+    def stream(role=None, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yields Users rows one at a time, fetching them a page at a time.
+        """
+        return chain.from_iterable(User.find_pages(role, page_size))
+
     @staticmethod
     def find_by_username(username):
         connection = BaseModel.get_connection()
@@ -92,6 +129,41 @@ class User(BaseModel):
         connection.close()
         return user
 
+    @staticmethod
+    def find_existing_usernames(usernames):
+        """
+        Returns the subset of `usernames` that are already taken.
+        """
+        usernames = list(usernames)
+        existing = set()
+        connection = BaseModel.get_connection()
+        # Stay well inside SQLite's bound-parameter limit.
+        for start in range(0, len(usernames), 500):
+            chunk = usernames[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            query = f"SELECT username FROM Users WHERE username IN ({placeholders})"
+            existing.update(row[0] for row in connection.execute(query, chunk).fetchall())
+        connection.close()
+        return existing
+
+    @staticmethod
+    def find_session_profile(user_id):
+        """
+        Returns (user_id, username, role, student_id, instructor_id) for a
+        user; the last two are None unless the user has that profile.
+        """
+        connection = BaseModel.get_connection()
+        query = """
+            SELECT u.user_id, u.username, u.role, s.student_id, i.instructor_id
+            FROM Users u
+            LEFT JOIN Students s ON s.user_id = u.user_id
+            LEFT JOIN Instructors i ON i.user_id = u.user_id
+            WHERE u.user_id = ?
+        """
+        profile = connection.execute(query, (user_id,)).fetchone()
+        connection.close()
+        return profile
+
     def update_password(self, new_password):
         query = "UPDATE Users SET password_hash = ? WHERE username = ?"
         self.cursor.execute(query, (new_password, self.username))
@@ -134,6 +206,60 @@ class Student(BaseModel):
         connection.close()
         return student
     
+    @staticmethod
+    def find_by_user_id(user_id):
+        """
+        Retrieve the student record linked to a user account.
+        """
+        connection = BaseModel.get_connection()
+        cursor = connection.cursor()
+        query = "SELECT * FROM Students WHERE user_id = ?"
+        cursor.execute(query, (user_id,))
+        student = cursor.fetchone()
+        connection.close()
+        return student
+
+    @staticmethod
+    def find_ids_by_cohort(major=None, admission_year=None, status='active'):
+        """
+        Retrieve the ids of students in a cohort, filtered by major, year of
+        admission and status. Filters left as None are not applied.
+        """
+        connection = BaseModel.get_connection()
+        cursor = connection.cursor()
+        query = "SELECT student_id FROM Students WHERE 1 = 1"
+        parameters = []
+        if major is not None:
+            query += " AND major = ?"
+            parameters.append(major)
+        if admission_year is not None:
+            query += " AND admission_date >= ? AND admission_date < ?"
+            parameters.extend([f"{int(admission_year):04d}-01-01", f"{int(admission_year) + 1:04d}-01-01"])
+        if status is not None:
+            query += " AND status = ?"
+            parameters.append(status)
+        cursor.execute(query + " ORDER BY student_id", parameters)
+        student_ids = [row[0] for row in cursor.fetchall()]
+        connection.close()
+        return student_ids
+
+    @staticmethod
+    def find_ids_by_reg_nos(reg_nos):
+        """
+        Maps registration numbers to student ids; unknown numbers are left out.
+        """
+        reg_nos = list(reg_nos)
+        ids = {}
+        connection = BaseModel.get_connection()
+        # Stay well inside SQLite's bound-parameter limit.
+        for start in range(0, len(reg_nos), 500):
+            chunk = reg_nos[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            query = f"SELECT reg_no, student_id FROM Students WHERE reg_no IN ({placeholders})"
+            ids.update(connection.execute(query, chunk).fetchall())
+        connection.close()
+        return ids
+
     @staticmethod
     def find_all():
         """
@@ -147,6 +273,22 @@ class Student(BaseModel):
         connection.close()
         return students
 
+    @staticmethod
+    def find_pages(status=None, major=None, page_size=DEFAULT_PAGE_SIZE, after=None):
+        """
+        Yields pages of Students rows (as find_all), optionally filtered by
+        status and major, starting after student_id `after`.
+        """
+        filters = {"status": status, "major": major}
+        return BaseModel.iter_pages("*", "Students", "student_id", filters, page_size, after)
+
+    @staticmethod
+    def stream(status=None, major=None, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yields Students rows one at a time, fetching them a page at a time.
+        """
+        return chain.from_iterable(Student.find_pages(status, major, page_size))
+
     def update(self, first_name=None, last_name=None, major=None, status=None):
         """
         Update student details.
@@ -203,6 +345,26 @@ class Instructor(BaseModel):
         connection.close()
         return instructors
     
+    @staticmethod
+    def find_by_user_id(user_id):
+        connection = BaseModel.get_connection()
+        cursor = connection.cursor()
+        query = "SELECT * FROM Instructors WHERE user_id = ?"
+        cursor.execute(query, (user_id,))
+        instructor = cursor.fetchone()
+        connection.close()
+        return instructor
+
+    @staticmethod
+    def find_by_staff_no(staff_no):
+        connection = BaseModel.get_connection()
+        cursor = connection.cursor()
+        query = "SELECT * FROM Instructors WHERE staff_no = ?"
+        cursor.execute(query, (staff_no,))
+        instructor = cursor.fetchone()
+        connection.close()
+        return instructor
+
     @staticmethod
     def get_name_by_id(instructor_id):
         connection = BaseModel.get_connection()
@@ -242,7 +404,7 @@ class Instructor(BaseModel):
         connection = BaseModel.get_connection()
         cursor = connection.cursor()
         query = """
-                SELECT c.course_code, c.course_name 
+                SELECT c.course_code, c.title
                 FROM Courses c
                 WHERE c.instructor_id = ?
             """
@@ -290,6 +452,7 @@ class Course(BaseModel):
         return course
     
     @staticmethod
+    @cached_report
     def find_all():
         """
         Retrieves all courses from the database.
@@ -308,6 +471,25 @@ class Course(BaseModel):
         connection.close()
         return courses
 
+    @staticmethod
+    def find_pages(status='active', page_size=DEFAULT_PAGE_SIZE, after=None, with_key=False):
+        """
+        Yields pages of course rows with the same columns as find_all,
+        starting after course_id `after` (prefixed by course_id if with_key).
+        Pass status=None to include inactive and archived courses.
+        """
+        columns = """c.course_code, c.title, c.credits, c.max_enrollment,
+            i.staff_no, i.first_name || ' ' || i.last_name AS instructor_name"""
+        source = "Courses c LEFT JOIN Instructors i ON c.instructor_id = i.instructor_id"
+        return BaseModel.iter_pages(columns, source, "c.course_id", {"c.status": status}, page_size, after, with_key)
+
+    @staticmethod
+    def stream(status='active', page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yields course rows one at a time, fetching them a page at a time.
+        """
+        return chain.from_iterable(Course.find_pages(status, page_size))
+
     def update(self, title=None, credits=None, max_enrollment=None, status=None):
         """
         Update course details.
@@ -347,11 +529,13 @@ class Course(BaseModel):
         connection = BaseModel.get_connection()
         cursor = connection.cursor()
         query = """
-            SELECT AVG(ec.grade) as avg_grade, COUNT(ec.student_id) as total_students
-            FROM Enrollments ec
-            WHERE ec.course_code = ?
+            SELECT AVG(g.numeric_grade) as avg_grade, COUNT(DISTINCT e.student_id) as total_students
+            FROM Enrollments e
+            INNER JOIN Courses c ON c.course_id = e.course_id
+            LEFT JOIN Grades g ON g.enrollment_id = e.enrollment_id
+            WHERE c.course_code = ?
             """
-        cursor.execute(query, (course_code))
+        cursor.execute(query, (course_code,))
         aggregates = cursor.fetchone()
         connection.close()
         return aggregates
@@ -361,12 +545,14 @@ class Course(BaseModel):
         connection = BaseModel.get_connection()
         cursor = connection.cursor()
         query = """
-            SELECT s.registration_number, s.first_name, s.last_name, ec.grade
+            SELECT s.reg_no, s.first_name, s.last_name, g.numeric_grade
             FROM Students s
-            JOIN Enrollments ec ON s.id = ec.student_id
-            WHERE ec.course_code = ?
+            JOIN Enrollments e ON s.student_id = e.student_id
+            JOIN Courses c ON c.course_id = e.course_id
+            LEFT JOIN Grades g ON g.enrollment_id = e.enrollment_id
+            WHERE c.course_code = ?
             """
-        cursor.execute(query, (course_code))
+        cursor.execute(query, (course_code,))
         students = cursor.fetchall()
         connection.close()
         return students   
@@ -396,6 +582,101 @@ class Enrollment(BaseModel):
 
 
     @staticmethod
+    def bulk_enroll(student_ids, course_ids, year, semester, batch_size=5000):
+        """
+        Enrolls every student in every course for one year and semester.
+
+        Duplicates and course capacity are resolved in SQL for a whole batch of
+        students at a time: pairs already enrolled for the term are skipped, and
+        each course admits students in student_id order until max_enrollment
+        (counting non-withdrawn enrollments for the term) is reached. Inactive
+        or unknown courses and unknown students are reported as unavailable.
+        All batches are written in one transaction.
+
+        Returns a dict of requested/enrolled/duplicate/over_capacity/unavailable counts.
+        """
+        student_ids = sorted(set(student_ids))
+        course_ids = sorted(set(course_ids))
+        summary = {
+            'requested': len(student_ids) * len(course_ids),
+            'enrolled': 0, 'duplicate': 0, 'over_capacity': 0, 'unavailable': 0,
+        }
+        if not summary['requested']:
+            return summary
+
+        with transaction() as connection:
+            cursor = connection.cursor()
+            cursor.execute("DROP TABLE IF EXISTS temp.bulk_courses")
+            cursor.execute("DROP TABLE IF EXISTS temp.bulk_students")
+            cursor.execute("CREATE TEMP TABLE bulk_courses (course_id INTEGER PRIMARY KEY, remaining INTEGER)")
+            cursor.execute("CREATE TEMP TABLE bulk_students (student_id INTEGER PRIMARY KEY)")
+            cursor.executemany(
+                "INSERT INTO temp.bulk_courses (course_id) "
+                "SELECT course_id FROM Courses WHERE course_id = ? AND status = 'active'",
+                ((course_id,) for course_id in course_ids),
+            )
+            course_count = cursor.execute("SELECT COUNT(*) FROM temp.bulk_courses").fetchone()[0]
+
+            for start in range(0, len(student_ids), batch_size):
+                batch = student_ids[start:start + batch_size]
+                cursor.execute("DELETE FROM temp.bulk_students")
+                cursor.executemany(
+                    "INSERT INTO temp.bulk_students (student_id) "
+                    "SELECT student_id FROM Students WHERE student_id = ?",
+                    ((student_id,) for student_id in batch),
+                )
+                student_count = cursor.execute("SELECT COUNT(*) FROM temp.bulk_students").fetchone()[0]
+                candidates = student_count * course_count
+                summary['unavailable'] += len(batch) * len(course_ids) - candidates
+
+                cursor.execute("""
+                    UPDATE temp.bulk_courses
+                    SET remaining = (
+                        SELECT c.max_enrollment - COUNT(e.enrollment_id)
+                        FROM Courses c
+                        LEFT JOIN Enrollments e
+                            ON e.course_id = c.course_id AND e.year = ? AND e.semester = ?
+                            AND e.status != 'withdrawn'
+                        WHERE c.course_id = bulk_courses.course_id
+                    )
+                """, (year, semester))
+
+                duplicates = cursor.execute("""
+                    SELECT COUNT(*)
+                    FROM temp.bulk_students s
+                    JOIN Enrollments e ON e.student_id = s.student_id
+                    JOIN temp.bulk_courses c ON c.course_id = e.course_id
+                    WHERE e.year = ? AND e.semester = ?
+                """, (year, semester)).fetchone()[0]
+
+                cursor.execute("""
+                    INSERT INTO Enrollments (year, semester, student_id, course_id, status)
+                    SELECT ?, ?, student_id, course_id, 'enrolled'
+                    FROM (
+                        SELECT s.student_id, c.course_id, c.remaining,
+                            ROW_NUMBER() OVER (PARTITION BY c.course_id ORDER BY s.student_id) AS position
+                        FROM temp.bulk_students s
+                        CROSS JOIN temp.bulk_courses c
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM Enrollments e
+                            WHERE e.student_id = s.student_id AND e.course_id = c.course_id
+                                AND e.year = ? AND e.semester = ?
+                        )
+                    )
+                    WHERE position <= remaining
+                """, (year, semester, year, semester))
+                enrolled = cursor.rowcount
+
+                summary['duplicate'] += duplicates
+                summary['enrolled'] += enrolled
+                summary['over_capacity'] += candidates - duplicates - enrolled
+
+            cursor.execute("DROP TABLE temp.bulk_courses")
+            cursor.execute("DROP TABLE temp.bulk_students")
+        return summary
+
+    @staticmethod
+    @cached_report
     def get_enrollment_statistics_for_all_courses():
         connection = BaseModel.get_connection()
         cursor = connection.cursor()
@@ -413,6 +694,7 @@ class Enrollment(BaseModel):
 
 
     @staticmethod
+    @cached_report
     def get_enrollment_statistics_for_course(course_code):
         connection = BaseModel.get_connection()
         cursor = connection.cursor()
@@ -433,17 +715,15 @@ class Grade(BaseModel):
     def __init__(self, enrollment_id, grade_value=None, numeric_grade=None, submitted_by=None, comments=None):
         super().__init__()
         self.enrollment_id = enrollment_id
-        self.grade_value = grade_value or self.calculate_grade(numeric_grade)
+        if grade_value is None and numeric_grade is not None:
+            grade_value = self.calculate_grade(numeric_grade)
+        self.grade_value = grade_value
         self.numeric_grade = numeric_grade
         self.submitted_by = submitted_by
         self.comments = comments
 
     def calculate_grade(self, numeric_grade):
-        for grade, details in GRADE_POINTS.items():
-            range_min, range_max = map(int, details['range'].split('-'))
-            if range_min <= numeric_grade <= range_max:
-                return grade
-        return 'F'
+        return get_scale().classify(numeric_grade)
 
     def create(self):
         self.validate_fields([self.enrollment_id, self.numeric_grade])
@@ -459,24 +739,28 @@ class Grade(BaseModel):
 
     @staticmethod
     def calculate_gpa(student_id):
-        query = """
-        SELECT numeric_grade FROM Grades
-        INNER JOIN Enrollments ON Grades.enrollment_id = Enrollments.id
-        WHERE Enrollments.student_id = ?
         """
-        cursor = BaseModel.get_connection().cursor()
-        cursor.execute(query, (student_id,))
-        grades = cursor.fetchall()
-
-        if not grades:
-            return 0.0
+        The student's GPA on the default scale, read from the trigger-maintained
+        StudentGPA table; 0.0 if the student has no grades.
+        """
+        record = Grade.get_gpa_record(student_id)
+        return record[0] if record else 0.0
 
-        total_points = sum(GRADE_POINTS[Grade(None).calculate_grade(grade[0])]['points'] for grade in grades)
-        return round(total_points / len(grades), 2)
+    @staticmethod
+    def get_gpa_record(student_id):
+        """
+        Reads the incrementally maintained aggregate for a student from
+        StudentGPA: (gpa, weighted_gpa, honours, grade_count), or None if the
+        student has no grades.
+        """
+        connection = BaseModel.get_connection()
+        cursor = connection.cursor()
+        query = "SELECT gpa, weighted_gpa, honours, grade_count FROM StudentGPA WHERE student_id = ?"
+        cursor.execute(query, (student_id,))
+        record = cursor.fetchone()
+        connection.close()
+        return record
 
     @staticmethod
     def classify_honours(gpa):
-        for classification, details in HONOURS_CLASSIFICATIONS.items():
-            if gpa >= details['min_average']:
-                return details['description']
-        return HONOURS_CLASSIFICATIONS['Fail']['description']
\ No newline at end of file
+        return get_scale().classify_honours(gpa)
\ No newline at end of file
@@ -0,0 +1,211 @@
+# app/reports.py
+"""
+Set-based reporting queries that cover many students or courses per call.
+"""
+from collections import namedtuple
+
+from app.cache import cached_report
+from app.database import get_connection
+from app.grading import get_scale
+
+CohortStanding = namedtuple('CohortStanding', [
+    'rank', 'student_id', 'reg_no', 'name', 'grade_count', 'gpa', 'average_mark', 'honours', 'percentile',
+])
+
+
+def _cohort_filters(major, admission_year, status):
+    clauses = []
+    parameters = []
+    if major is not None:
+        clauses.append("s.major = ?")
+        parameters.append(major)
+    if admission_year is not None:
+        clauses.append("s.admission_date >= ? AND s.admission_date < ?")
+        parameters.extend([f"{int(admission_year):04d}-01-01", f"{int(admission_year) + 1:04d}-01-01"])
+    if status is not None:
+        clauses.append("s.status = ?")
+        parameters.append(status)
+    return "".join(f" AND {clause}" for clause in clauses), parameters
+
+
+def _rank(gpas, marks):
+    """
+    Returns (order, ranks, percentiles) for the cohort: `order` sorts students
+    by GPA then average mark, descending; tied students share a rank, and the
+    percentile is the share of the cohort with a strictly lower GPA.
+    """
+    count = len(gpas)
+    try:
+        # Imported here rather than at module level to keep start-up fast.
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        gpa_array = np.asarray(gpas, dtype=float)
+        order = np.lexsort((-np.asarray(marks, dtype=float), -gpa_array)).tolist()
+        ascending = np.sort(gpa_array)
+        below = np.searchsorted(ascending, gpa_array, side='left')
+        above = count - np.searchsorted(ascending, gpa_array, side='right')
+        return order, (above + 1).tolist(), (below * 100.0 / count).tolist()
+
+    order = sorted(range(count), key=lambda i: (-gpas[i], -marks[i]))
+    ranks = [0] * count
+    percentiles = [0.0] * count
+    position = 0
+    while position < count:
+        tied_end = position
+        while tied_end + 1 < count and gpas[order[tied_end + 1]] == gpas[order[position]]:
+            tied_end += 1
+        for i in order[position:tied_end + 1]:
+            ranks[i] = position + 1
+            percentiles[i] = (count - tied_end - 1) * 100.0 / count
+        position = tied_end + 1
+    return order, ranks, percentiles
+
+
+@cached_report
+def cohort_standings(major=None, admission_year=None, status=None, scale=None):
+    """
+    GPA, honours class, rank and percentile for every graded student in a
+    cohort, filtered by major, admission year and status.
+
+    Grades are reduced to per-student totals in a single grouped scan over
+    Grades, Enrollments and Students; ranking uses NumPy when it is installed.
+    Returns CohortStanding tuples ordered by rank.
+    """
+    scale = get_scale(scale)
+    where, parameters = _cohort_filters(major, admission_year, status)
+    query = f"""
+        SELECT s.student_id, s.reg_no, s.first_name || ' ' || s.last_name,
+            COUNT(*), SUM({scale.sql_points_case('g.numeric_grade')}), SUM(g.numeric_grade)
+        FROM Grades g
+        JOIN Enrollments e ON e.enrollment_id = g.enrollment_id
+        JOIN Students s ON s.student_id = e.student_id
+        WHERE g.numeric_grade IS NOT NULL{where}
+        GROUP BY s.student_id
+    """
+    connection = get_connection()
+    rows = connection.execute(query, parameters).fetchall()
+    connection.close()
+    if not rows:
+        return []
+
+    gpas = [round(total_points / grade_count, 2) for _, _, _, grade_count, total_points, _ in rows]
+    marks = [total_marks / grade_count for _, _, _, grade_count, _, total_marks in rows]
+    order, ranks, percentiles = _rank(gpas, marks)
+
+    return [
+        CohortStanding(
+            ranks[i], rows[i][0], rows[i][1], rows[i][2], rows[i][3], gpas[i],
+            round(marks[i], 2), scale.classify_honours(marks[i]), round(percentiles[i], 1),
+        )
+        for i in order
+    ]
+
+
+CourseStatistics = namedtuple('CourseStatistics', [
+    'course_code', 'title', 'year', 'semester', 'enrolled', 'graded',
+    'mean', 'median', 'std_dev', 'minimum', 'maximum', 'histogram',
+])
+
+
+@cached_report
+def course_statistics(course_code=None, instructor_id=None, by_term=False, scale=None):
+    """
+    Enrollment and grade statistics for one course (by code) or for every
+    course taught by an instructor, optionally broken down by year and
+    semester.
+
+    Counts, mean, median, min/max, the sum of squares for the standard
+    deviation and the letter-grade histogram all come from a single query;
+    the median is picked with window functions. Only each enrollment's latest
+    grade counts. Returns CourseStatistics tuples ordered by course code (and term).
+    """
+    if (course_code is None) == (instructor_id is None):
+        raise ValueError("Give exactly one of course_code or instructor_id.")
+    scale = get_scale(scale)
+    grades = scale.grades
+
+    group = "c.course_id, e.year, e.semester" if by_term else "c.course_id"
+    year, semester = ("e.year", "e.semester") if by_term else ("NULL", "NULL")
+    histogram_columns = ", ".join(f"SUM(letter = '{grade}')" for grade in grades)
+    where, parameter = ("c.course_code = ?", course_code) if course_code is not None else ("c.instructor_id = ?", instructor_id)
+
+    query = f"""
+        WITH marks AS (
+            SELECT c.course_id, c.course_code, c.title, {year} AS term_year, {semester} AS term_semester,
+                e.enrollment_id, g.numeric_grade AS mark,
+                CASE WHEN g.numeric_grade IS NOT NULL THEN {scale.sql_case('g.numeric_grade')} END AS letter,
+                ROW_NUMBER() OVER (PARTITION BY {group} ORDER BY g.numeric_grade IS NULL, g.numeric_grade) AS position,
+                COUNT(g.numeric_grade) OVER (PARTITION BY {group}) AS graded_count
+            FROM Courses c
+            LEFT JOIN Enrollments e ON e.course_id = c.course_id
+            LEFT JOIN Grades g ON g.grade_id = (
+                SELECT MAX(grade_id) FROM Grades WHERE enrollment_id = e.enrollment_id
+            )
+            WHERE {where}
+        )
+        SELECT course_code, title, term_year, term_semester,
+            COUNT(enrollment_id), COUNT(mark), AVG(mark),
+            AVG(CASE WHEN position IN ((graded_count + 1) / 2, (graded_count + 2) / 2) THEN mark END),
+            SUM(mark * mark), MIN(mark), MAX(mark),
+            {histogram_columns}
+        FROM marks
+        GROUP BY course_id, term_year, term_semester
+        ORDER BY course_code, term_year, term_semester
+    """
+    connection = get_connection()
+    rows = connection.execute(query, (parameter,)).fetchall()
+    connection.close()
+
+    statistics = []
+    for row in rows:
+        course, title, year, semester, enrolled, graded, mean, median, sum_squares, minimum, maximum = row[:11]
+        if by_term and year is None:
+            # A course with no enrollments has no terms to report.
+            continue
+        std_dev = None
+        if graded:
+            variance = max(sum_squares / graded - mean * mean, 0.0)
+            std_dev = round(variance ** 0.5, 2)
+            mean, median = round(mean, 2), round(median, 2)
+        histogram = {grade: count or 0 for grade, count in zip(grades, row[11:])}
+        statistics.append(CourseStatistics(
+            course, title, year, semester, enrolled, graded, mean, median, std_dev, minimum, maximum, histogram,
+        ))
+    return statistics
+
+
+InstructorWorkload = namedtuple('InstructorWorkload', [
+    'instructor_id', 'staff_no', 'name', 'courses', 'credits', 'students',
+])
+
+
+@cached_report
+def instructor_workloads(instructor_id=None):
+    """
+    Number of courses, total credits and currently enrolled students for
+    every instructor (or just one), from a single grouped query. Enrollments
+    are counted per course first so joining them doesn't inflate the credit
+    totals. Returns InstructorWorkload tuples ordered by name.
+    """
+    where, parameters = ("WHERE i.instructor_id = ?", (instructor_id,)) if instructor_id is not None else ("", ())
+    query = f"""
+        SELECT i.instructor_id, i.staff_no, i.first_name || ' ' || i.last_name,
+            COUNT(c.course_id), COALESCE(SUM(c.credits), 0), COALESCE(SUM(e.enrolled), 0)
+        FROM Instructors i
+        LEFT JOIN Courses c ON c.instructor_id = i.instructor_id
+        LEFT JOIN (
+            SELECT course_id, COUNT(*) AS enrolled
+            FROM Enrollments
+            WHERE status = 'enrolled'
+            GROUP BY course_id
+        ) e ON e.course_id = c.course_id
+        {where}
+        GROUP BY i.instructor_id
+        ORDER BY i.last_name, i.first_name, i.instructor_id
+    """
+    connection = get_connection()
+    rows = connection.execute(query, parameters).fetchall()
+    connection.close()
+    return [InstructorWorkload(*row) for row in rows]
@@ -0,0 +1,148 @@
+# app/search.py
+"""
+Ranked prefix search over students and courses with SQLite FTS5.
+
+StudentSearch and CourseSearch are external-content FTS5 tables: they index
+the Students and Courses rows in place (keyed by rowid) without storing a
+second copy of the text, and triggers keep them in step with every insert,
+update and delete. Searches are ranked with bm25, weighting identifiers
+(reg_no, course_code) above names and titles.
+
+Usage: python -m app.search rebuild
+"""
+import re
+
+from app.database import get_connection, transaction
+
+DEFAULT_SEARCH_LIMIT = 20
+
+# name -> (source table, rowid column, indexed columns, bm25 column weights)
+SEARCH_INDEXES = {
+    'StudentSearch': ('Students', 'student_id', ('reg_no', 'first_name', 'last_name', 'major'), (10.0, 5.0, 5.0, 1.0)),
+    'CourseSearch': ('Courses', 'course_id', ('course_code', 'title'), (10.0, 3.0)),
+}
+
+
+def install_search_triggers(connection):
+    """
+    (Re)creates the triggers that keep each search index in step with its table.
+    """
+    for name, (source, key, columns, _) in SEARCH_INDEXES.items():
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"NEW.{column}" for column in columns)
+        old_values = ", ".join(f"OLD.{column}" for column in columns)
+        prefix = f"trg_{source.lower()}_search"
+        for event in ('insert', 'update', 'delete'):
+            connection.execute(f"DROP TRIGGER IF EXISTS {prefix}_{event}")
+        connection.execute(f"""
+            CREATE TRIGGER {prefix}_insert AFTER INSERT ON {source}
+            BEGIN
+                INSERT INTO {name} (rowid, {column_list}) VALUES (NEW.{key}, {new_values});
+            END
+        """)
+        connection.execute(f"""
+            CREATE TRIGGER {prefix}_update AFTER UPDATE OF {key}, {column_list} ON {source}
+            BEGIN
+                INSERT INTO {name} ({name}, rowid, {column_list}) VALUES ('delete', OLD.{key}, {old_values});
+                INSERT INTO {name} (rowid, {column_list}) VALUES (NEW.{key}, {new_values});
+            END
+        """)
+        connection.execute(f"""
+            CREATE TRIGGER {prefix}_delete AFTER DELETE ON {source}
+            BEGIN
+                INSERT INTO {name} ({name}, rowid, {column_list}) VALUES ('delete', OLD.{key}, {old_values});
+            END
+        """)
+
+
+def create_search_index(connection):
+    """
+    Migration step: creates the FTS5 tables and triggers and indexes existing rows.
+    """
+    for name, (source, key, columns, _) in SEARCH_INDEXES.items():
+        connection.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+                {", ".join(columns)},
+                content='{source}', content_rowid='{key}',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        connection.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+    install_search_triggers(connection)
+
+
+def rebuild_search_index():
+    """
+    Reinstalls the triggers and reindexes every student and course.
+    """
+    with transaction() as connection:
+        install_search_triggers(connection.raw)
+        for name in SEARCH_INDEXES:
+            connection.raw.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+
+
+def build_match_query(text):
+    """
+    Turns free text into an FTS5 query matching rows that contain every word
+    as a prefix, e.g. 'ali smi' -> '"ali"* "smi"*'. Returns None if the text
+    has no searchable words. Quoting each term keeps FTS5 operators and
+    punctuation in user input from being parsed as query syntax.
+    """
+    terms = re.findall(r"\w+", text or "")
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _search(name, columns, text, filters, limit):
+    match = build_match_query(text)
+    if match is None:
+        return []
+    source, key, _, weights = SEARCH_INDEXES[name]
+    conditions = [f"{name} MATCH ?"]
+    parameters = [match]
+    for column, value in filters.items():
+        if value is not None:
+            conditions.append(f"t.{column} = ?")
+            parameters.append(value)
+    query = f"""
+        SELECT {", ".join(f"t.{column}" for column in columns)}
+        FROM {name}
+        JOIN {source} t ON t.{key} = {name}.rowid
+        WHERE {" AND ".join(conditions)}
+        ORDER BY bm25({name}, {", ".join(str(weight) for weight in weights)}), t.{key}
+        LIMIT ?
+    """
+    connection = get_connection()
+    rows = connection.execute(query, parameters + [limit]).fetchall()
+    connection.close()
+    return rows
+
+
+def search_students(text, status=None, limit=DEFAULT_SEARCH_LIMIT):
+    """
+    Best-matching students for `text` by reg_no, name or major prefix. Returns
+    (student_id, reg_no, first_name, last_name, major, status) rows, best first.
+    """
+    columns = ('student_id', 'reg_no', 'first_name', 'last_name', 'major', 'status')
+    return _search('StudentSearch', columns, text, {'status': status}, limit)
+
+
+def search_courses(text, status='active', limit=DEFAULT_SEARCH_LIMIT):
+    """
+    Best-matching courses for `text` by code or title prefix. Returns
+    (course_id, course_code, title, credits, status) rows, best first. Pass
+    status=None to include inactive and archived courses.
+    """
+    columns = ('course_id', 'course_code', 'title', 'credits', 'status')
+    return _search('CourseSearch', columns, text, {'status': status}, limit)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["rebuild"]:
+        rebuild_search_index()
+        print("Search index rebuilt.")
+    else:
+        print("Usage: python -m app.search rebuild")
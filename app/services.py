@@ -1,16 +1,55 @@
 # app/services.py
 
+from app.database import transaction
+from app.grade_upload import upload_grades_csv
+from app.instrumentation import query_monitor
+from app.reports import cohort_standings, course_statistics, instructor_workloads
+from app.search import search_courses, search_students
+from app.sessions import session_store
+from app.transcripts import fetch_transcripts, generate_transcripts, render_text
 from app.models import User, Student, Grade, Enrollment, Course, Instructor
-from app.utils import verify_password, hash_password
+from app.utils import verify_password, hash_password, hash_passwords, DEFAULT_BCRYPT_ROUNDS
 
-def role_required(required_role):
-    if not SessionManager.is_authenticated():
+MENU_PAGE_SIZE = 20
+
+def role_required(required_role, token=None):
+    """
+    Returns the session for `token` (default: the console session) if it
+    has `required_role`, otherwise prints why access is denied and returns None.
+    """
+    session = SessionManager.get_session(token)
+    if session is None:
         print("Access denied. User not authenticated.")
         return None
-    if SessionManager.current_user[4] != required_role:
+    if session.role != required_role:
         print(f"Access denied. {required_role} role required.")
         return None
-           
+    return session
+
+
+def print_paged(pages, header, format_row, empty_message):
+    """
+    Prints rows a page at a time from a find_pages() generator, asking
+    before fetching each further page. Returns the number of rows shown.
+    """
+    pages = iter(pages)
+    page = next(pages, None)
+    if not page:
+        print(empty_message)
+        return 0
+
+    print(header)
+    print("-" * len(header))
+    shown = 0
+    while page:
+        for row in page:
+            print(format_row(row))
+        shown += len(page)
+        page = next(pages, None)
+        if page and input(f"-- {shown} shown. Press Enter for more or 'q' to stop: ").strip().lower() == "q":
+            break
+    return shown
+
 
 class AuthenticationService:
     @staticmethod
@@ -28,6 +67,26 @@ class AuthenticationService:
         user.create()
         return True
 
+    @staticmethod
+    def register_users(accounts, role="student", rounds=DEFAULT_BCRYPT_ROUNDS, workers=None, use_threads=False):
+        """
+        Registers many (username, password) accounts at once. Passwords are
+        hashed in parallel and all users are inserted in one transaction.
+        Usernames that already exist, or repeat earlier in the batch, are
+        skipped. Returns the number created.
+        """
+        unique = {}
+        for username, password in accounts:
+            unique.setdefault(username, password)
+        existing = User.find_existing_usernames(unique)
+        accounts = [(username, password) for username, password in unique.items() if username not in existing]
+        hashes = hash_passwords((password for _, password in accounts), rounds, workers, use_threads)
+
+        with transaction():
+            for (username, _), password_hash in zip(accounts, hashes):
+                User(username, password_hash, role).create()
+        return len(accounts)
+
     @staticmethod
     def login(username, password):
         user = User.find_by_username(username)
@@ -47,34 +106,69 @@ class AuthenticationService:
             return False
 
         hashed_password = hash_password(new_password)
-        User.update_password(username, hashed_password)
+        User(user[1], user[2], user[3]).update_password(hashed_password)
+        session_store.revoke_user(user[0])
         print("Password reset successfully.")
         return True
 
 class SessionManager:
+    """
+    Session checks against the shared session store. Methods take a session
+    token; without one they use the console session, whose Users row is kept
+    in current_user.
+    """
     current_user = None
+    current_token = None
 
     @staticmethod
     def login_user(user):
+        """
+        Starts a session for a verified Users row and returns its token.
+        """
+        if SessionManager.current_token is not None:
+            session_store.revoke(SessionManager.current_token)
+        session = session_store.create(user)
         SessionManager.current_user = user
+        SessionManager.current_token = session.token
+        return session.token
 
     @staticmethod
-    def logout_user():
+    def logout_user(token=None):
+        if token is not None and token != SessionManager.current_token:
+            session_store.revoke(token)
+            return
+        if SessionManager.current_token is not None:
+            session_store.revoke(SessionManager.current_token)
         SessionManager.current_user = None
+        SessionManager.current_token = None
 
     @staticmethod
-    def is_authenticated():
-        return SessionManager.current_user is not None
+    def get_session(token=None):
+        return session_store.get(token if token is not None else SessionManager.current_token)
 
     @staticmethod
-    def has_role(role):
-        return SessionManager.current_user and SessionManager.current_user[4] == role
-    
+    def is_authenticated(token=None):
+        return SessionManager.get_session(token) is not None
+
     @staticmethod
-    def get_logged_in_user_id():
-        if SessionManager.current_user:
-            return SessionManager.current_user[0]
-        return None
+    def has_role(role, token=None):
+        session = SessionManager.get_session(token)
+        return session is not None and session.role == role
+
+    @staticmethod
+    def get_logged_in_user_id(token=None):
+        session = SessionManager.get_session(token)
+        return session.user_id if session else None
+
+    @staticmethod
+    def get_student_id(token=None):
+        session = SessionManager.get_session(token)
+        return session.student_id if session else None
+
+    @staticmethod
+    def get_instructor_id(token=None):
+        session = SessionManager.get_session(token)
+        return session.instructor_id if session else None
 
 
 class AdminService:
@@ -90,7 +184,8 @@ class AdminService:
             print("2. Add Student")
             print("3. Update Student")
             print("4. Delete Student")
-            print("5. Go Back")
+            print("5. Search Students")
+            print("6. Go Back")
 
             choice = input("Choose an option: ")
 
@@ -103,6 +198,8 @@ class AdminService:
             elif choice == "4":
                 StudentService.delete_student()
             elif choice == "5":
+                StudentService.search_students()
+            elif choice == "6":
                 print("Returning to Admin Menu...")
                 break
             else:
@@ -121,7 +218,8 @@ class AdminService:
             print("3. Update Course")
             print("4. Delete Course")
             print("5. Assign Instructor to Course")
-            print("6. Go Back")
+            print("6. Search Courses")
+            print("7. Go Back")
 
             choice = input("Choose an option: ").strip()
 
@@ -137,6 +235,8 @@ class AdminService:
                 course_code = input("Enter Course Code: ").strip()
                 CourseService.assign_instructor_to_course(course_code)
             elif choice == "6":
+                CourseService.search_courses()
+            elif choice == "7":
                 print("Returning to Admin Menu...")
                 break
             else:
@@ -154,7 +254,10 @@ class AdminService:
             print("2. View Course List")
             print("3. View Enrollment Statistics")
             print("4. View Specific Course Enrollment Statistics")
-            print("5. Go Back")
+            print("5. View Cohort Honours List")
+            print("6. View Instructor Workload")
+            print("7. View Query Performance")
+            print("8. Go Back")
 
             choice = input("Choose an option: ").strip()
 
@@ -167,6 +270,20 @@ class AdminService:
             elif choice == "4":
                 AdminService.get_specific_course_enrollment_statistics()
             elif choice == "5":
+                major = input("Major (blank for all): ").strip() or None
+                while True:
+                    admission_year = input("Admission year (blank for all): ").strip()
+                    try:
+                        admission_year = int(admission_year) if admission_year else None
+                        break
+                    except ValueError:
+                        print("Invalid input. Please enter a year.")
+                ReportingService.cohort_honours_report(major=major, admission_year=admission_year)
+            elif choice == "6":
+                ReportingService.instructor_workload_report()
+            elif choice == "7":
+                ReportingService.query_performance_report()
+            elif choice == "8":
                 print("Returning to Admin Menu...")
                 break
             else:
@@ -176,8 +293,31 @@ class AdminService:
     
     @staticmethod
     def view_student_transcripts():
-       
-       print("Feature to implement: View student transcripts")
+        print("\n--- Student Transcripts ---")
+        print("1. View a Student's Transcript")
+        print("2. Export Transcripts for Graduating Students")
+
+        choice = input("Choose an option: ").strip()
+
+        if choice == "1":
+            StudentService.generate_transcript(input("Enter Registration Number: ").strip())
+        elif choice == "2":
+            output_dir = input("Output directory [transcripts]: ").strip() or "transcripts"
+            student_ids = Student.find_ids_by_cohort(status="graduated")
+            if not student_ids:
+                print("No graduating students found.")
+                return
+            try:
+                run = generate_transcripts(
+                    student_ids, output_dir,
+                    progress=lambda run: print(f"  {run.written}/{len(student_ids)} transcripts written"),
+                )
+                print(f"Wrote {run.written} transcripts to {output_dir} in {run.elapsed:.2f}s "
+                      f"(mean {run.mean_render_time * 1000:.2f} ms each).")
+            except Exception as e:
+                print(f"Error generating transcripts: {e}")
+        else:
+            print("Invalid option.")
 
 
     @staticmethod
@@ -222,10 +362,6 @@ class StudentService:
         try:
             username = input("Username: ")
             password = input("Password: ")
-            user = User(username, hash_password(password), "student")
-            user.create()
-
-            user_id = user.cursor.lastrowid
             reg_no = input("Registration Number: ")
             first_name = input("First Name: ")
             last_name = input("Last Name: ")
@@ -233,8 +369,14 @@ class StudentService:
             major = input("Major: ")
             status = "active"
 
-            student = Student(user_id, reg_no, first_name, last_name, admission_date, major, status)
-            student.create()
+            # Both rows are written and committed together, or not at all.
+            with transaction():
+                user = User(username, hash_password(password), "student")
+                user.create()
+
+                user_id = user.cursor.lastrowid
+                student = Student(user_id, reg_no, first_name, last_name, admission_date, major, status)
+                student.create()
             print("Student added successfully.")
         except Exception as e:
             print(f"Error: {e}")
@@ -242,23 +384,39 @@ class StudentService:
     @staticmethod
     def view_all_students():
         print("\n--- All Students ---")
+        status = input("Status (blank for all): ").strip() or None
+        major = input("Major (blank for all): ").strip() or None
         try:
-            students = Student.find_all()
-            if students:
-                print(f"{'Reg No':<20} {'Name':<30} {'Major':<20} {'Status':<15}")
-                print("-" * 85) 
-                for student in students:
-                    reg_no = student[2]
-                    name = f"{student[3]} {student[4]}"
-                    major = student[6]
-                    status = student[7]
-                    print(f"{reg_no:<20} {name:<30} {major:<20} {status:<15}")
-            else:
-                print("No students found.")
+            print_paged(
+                Student.find_pages(status=status, major=major, page_size=MENU_PAGE_SIZE),
+                f"{'Reg No':<20} {'Name':<30} {'Major':<20} {'Status':<15}",
+                lambda student: f"{student[2]:<20} {student[3] + ' ' + student[4]:<30} {student[6]:<20} {student[7]:<15}",
+                "No students found.",
+            )
         except Exception as e:
             print(f"Error: {e}")
 
 
+    @staticmethod
+    def search_students(text=None):
+        """
+        Prints the students best matching a name, reg number or major prefix
+        and returns the matching rows.
+        """
+        print("\n--- Search Students ---")
+        if text is None:
+            text = input("Search (name, reg no or major): ").strip()
+        students = search_students(text)
+        if not students:
+            print("No matching students found.")
+            return students
+
+        print(f"{'Reg No':<20} {'Name':<30} {'Major':<20} {'Status':<15}")
+        print("-" * 88)
+        for _, reg_no, first_name, last_name, major, status in students:
+            print(f"{reg_no:<20} {first_name + ' ' + last_name:<30} {major or '-':<20} {status:<15}")
+        return students
+
     @staticmethod
     def update_student():
         print("\n--- Update Student Details ---")
@@ -315,8 +473,22 @@ class StudentService:
         print("Feature to implement: View personal grades")
     
     @staticmethod
-    def generate_transcript(reg_no):
-        print("Feature to implement: generate student transcript")
+    def generate_transcript(reg_no=None):
+        """
+        Prints the transcript for `reg_no`, or for the logged-in student.
+        """
+        if reg_no:
+            student = Student.find_by_reg_no(reg_no)
+        else:
+            student = Student.find_by_user_id(SessionManager.get_logged_in_user_id())
+        if not student:
+            print("Student not found.")
+            return None
+
+        transcripts = fetch_transcripts([student[0]])
+        print()
+        print(render_text(transcripts[0]))
+        return transcripts[0]
 
 class CourseService:
     @staticmethod
@@ -342,24 +514,37 @@ class CourseService:
     @staticmethod
     def view_all_courses():
         try:
-            courses = Course.find_all()
-            if courses:
-                print("\n--- All Courses ---")
-                print(f"{'Course Code':<15} {'Title':<30} {'Credits':<10} {'Max Enrollment':<15} {'Instructor Name':<30}")
-                print("-" * 100)  
-                
-                for course in courses:
-                    course_code = course[0]
-                    title = course[1]
-                    credits = str(course[2])
-                    max_enrollment = str(course[3])
-                    instructor = course[4] if course[4] else "No instructor assigned"
-                    print(f"{course_code:<15} {title:<30} {credits:<10} {max_enrollment:<15} {instructor:<30}")
-            else:
-                print("No courses found.")
+            print("\n--- All Courses ---")
+            print_paged(
+                Course.find_pages(page_size=MENU_PAGE_SIZE),
+                f"{'Course Code':<15} {'Title':<30} {'Credits':<10} {'Max Enrollment':<15} {'Instructor Name':<30}",
+                lambda course: f"{course[0]:<15} {course[1]:<30} {str(course[2]):<10} {str(course[3]):<15} "
+                               f"{course[5] if course[5] else 'No instructor assigned':<30}",
+                "No courses found.",
+            )
         except Exception as e:
             print(f"Error retrieving courses: {e}")
 
+    @staticmethod
+    def search_courses(text=None):
+        """
+        Prints the active courses best matching a course code or title prefix
+        and returns the matching rows.
+        """
+        print("\n--- Search Courses ---")
+        if text is None:
+            text = input("Search (course code or title): ").strip()
+        courses = search_courses(text)
+        if not courses:
+            print("No matching courses found.")
+            return courses
+
+        print(f"{'Course Code':<15} {'Title':<30} {'Credits':<10}")
+        print("-" * 57)
+        for _, course_code, title, credits, _ in courses:
+            print(f"{course_code:<15} {title:<30} {str(credits):<10}")
+        return courses
+
     @staticmethod
     def update_course():
         print("\n--- Update Course Details ---")
@@ -404,7 +589,7 @@ class CourseService:
     @staticmethod
     def assign_instructor_to_course(course_code):
         print(f"\n--- Assign Instructor to Course: {course_code} ---")
-        instructors = Instructor.find_all()  
+        instructors = instructor_workloads()
 
         if not instructors:
             print("No instructors found.")
@@ -417,15 +602,14 @@ class CourseService:
 
         print("\nAvailable Instructors:")
         for idx, instructor in enumerate(instructors, start=1):
-            instructor_id, first_name, last_name = instructor[:3]
-            assigned_courses = Instructor.get_course_count(instructor_id) 
-            print(f"{idx}. {first_name} {last_name} (Courses Assigned: {assigned_courses})")
+            print(f"{idx}. {instructor.name} (Courses Assigned: {instructor.courses}, "
+                  f"Credits: {instructor.credits}, Students: {instructor.students})")
 
 
         try:
             selection = int(input("Select an instructor by number: "))
             if 1 <= selection <= len(instructors):
-                instructor_id = instructors[selection - 1][0]
+                instructor_id = instructors[selection - 1].instructor_id
 
                 Course.assign_instructor(course_code, instructor_id)
                 print(f"Instructor assigned successfully to course {course_code}.")
@@ -448,13 +632,18 @@ class CourseService:
 
         print("\nAvailable Courses:")
         for idx, course in enumerate(courses, start=1):
-            print(f"{idx}. {course[1]} ({course[2]})")
+            print(f"{idx}. {course[1]} ({course[0]})")
 
         try:
             selection = int(input("Select a course by number: "))
             if 1 <= selection <= len(courses):
-                course_code = courses[selection - 1][1]
-                instructor_id = input("Enter Instructor ID: ")
+                course_code = courses[selection - 1][0]
+                workloads = {workload.instructor_id: workload for workload in instructor_workloads()}
+                ReportingService.print_instructor_workloads(workloads.values())
+                instructor_id = int(input("Enter Instructor ID: "))
+                if instructor_id not in workloads:
+                    print("Instructor not found.")
+                    return
                 Course.assign_instructor(course_code, instructor_id)
                 print(f"Instructor assigned to course {course_code}.")
             else:
@@ -466,6 +655,24 @@ class CourseService:
 
 
 
+class EnrollmentService:
+    @staticmethod
+    def enroll_cohort(course_codes, year, semester, major=None, admission_year=None):
+        """
+        Enrolls every active student of a cohort (by major and/or admission
+        year) in the given courses for one term. Returns the bulk_enroll summary.
+        """
+        student_ids = Student.find_ids_by_cohort(major=major, admission_year=admission_year)
+        course_ids = []
+        for course_code in course_codes:
+            course = Course.find_by_course_code(course_code)
+            if course:
+                course_ids.append(course[0])
+            else:
+                print(f"Course {course_code} not found or inactive; skipping.")
+        return Enrollment.bulk_enroll(student_ids, course_ids, year, semester)
+
+
 class InstructorService:
     @staticmethod
     def add_instructor():
@@ -474,17 +681,18 @@ class InstructorService:
         try:
             username = input("Username: ")
             password = input("Password: ")
-            user = User(username, hash_password(password), "instructor")
-            user.create()
-
-            user_id = user.cursor.lastrowid
             staff_no = input("Staff Number: ")
             first_name = input("First Name: ")
             last_name = input("Last Name: ")
             hire_date = input("Hire Date (YYYY-MM-DD): ")
-        
-            instructor = Instructor(user_id, staff_no, first_name, last_name, hire_date)
-            instructor.create()
+
+            with transaction():
+                user = User(username, hash_password(password), "instructor")
+                user.create()
+
+                user_id = user.cursor.lastrowid
+                instructor = Instructor(user_id, staff_no, first_name, last_name, hire_date)
+                instructor.create()
             print("Instructor added successfully.")
         except Exception as e:
             print(f"Error adding instructor: {e}")
@@ -492,7 +700,7 @@ class InstructorService:
     @staticmethod
     def view_assigned_courses():
         try:
-            courses = Instructor.get_assigned_courses(SessionManager.get_logged_in_user_id())
+            courses = Instructor.get_assigned_courses(SessionManager.get_instructor_id())
             if courses:
                 print("\n--- Assigned Courses ---")
                 print(f"{'Course Code':<15} {'Title':<30} {'Credits':<10} {'Max Enrollment':<15}")
@@ -517,13 +725,73 @@ class InstructorService:
        
         print("Feature to implement: Update the grade for the student")
 
+    @staticmethod
+    def upload_grades():
+        """
+        Submits grades for whole courses from a CSV file with
+        reg_no,course_code,numeric_grade[,comments] columns.
+        """
+        print("\n--- Upload Grades ---")
+        instructor_id = SessionManager.get_instructor_id()
+        if instructor_id is None:
+            print("Only instructors can submit grades.")
+            return
+
+        path = input("CSV file path: ").strip()
+        year = input("Year (blank for latest enrollment): ").strip() or None
+        semester = input("Semester (blank for latest enrollment): ").strip() or None
+
+        try:
+            result = upload_grades_csv(path, instructor_id, int(year) if year else None, semester)
+            print(f"Submitted {result.imported} of {result.rows} grades in {result.elapsed:.2f}s.")
+            for line_number, reason in result.rejects:
+                print(f"  line {line_number}: {reason}")
+        except Exception as e:
+            print(f"Error uploading grades: {e}")
+
     @staticmethod
     def view_assigned_course_statistics():
         """
         Displays statistics for a course, such as average grade and grade distribution and the students enrolled.
         """
+        print("\n--- Course Statistics ---")
+        instructor_id = SessionManager.get_instructor_id()
+        if instructor_id is None:
+            print("Only instructors can view course statistics.")
+            return
+
+        course_code = input("Course Code (blank for all your courses): ").strip() or None
+        by_term = input("Break down by year and semester? (yes/no): ").strip().lower() == "yes"
+
+        try:
+            if course_code:
+                course = Course.find_by_course_code(course_code)
+                if not course or course[5] != instructor_id:
+                    print("Course not found among your assigned courses.")
+                    return
+                statistics = course_statistics(course_code=course_code, by_term=by_term)
+            else:
+                statistics = course_statistics(instructor_id=instructor_id, by_term=by_term)
+            InstructorService.print_course_statistics(statistics)
+        except Exception as e:
+            print(f"Error retrieving statistics: {e}")
+
+    @staticmethod
+    def print_course_statistics(statistics):
+        if not statistics:
+            print("No courses found.")
+            return
+
+        def show(value):
+            return "-" if value is None else f"{value:g}"
 
-        print("Feature to implement: View statistics for a specific course")
+        for stats in statistics:
+            term = f" ({stats.year} {stats.semester})" if stats.year is not None else ""
+            print(f"\n{stats.course_code} - {stats.title}{term}")
+            print(f"  Enrolled: {stats.enrolled}   Graded: {stats.graded}")
+            print(f"  Mean: {show(stats.mean)}   Median: {show(stats.median)}   Std Dev: {show(stats.std_dev)}   "
+                  f"Min: {show(stats.minimum)}   Max: {show(stats.maximum)}")
+            print("  " + "  ".join(f"{grade}: {count}" for grade, count in stats.histogram.items()))
         
 
 class ReportingService:
@@ -535,6 +803,79 @@ class ReportingService:
 
         print("Feature to implement: Generate student GPA report")
 
+    @staticmethod
+    def cohort_honours_report(major=None, admission_year=None, status=None):
+        """
+        Prints the ranked GPA and honours list for a cohort and returns the standings.
+        """
+        standings = cohort_standings(major=major, admission_year=admission_year, status=status)
+        print("\n--- Cohort Honours List ---")
+        if not standings:
+            print("No graded students found for this cohort.")
+            return standings
+
+        print(f"{'Rank':<6} {'Reg No':<15} {'Name':<30} {'GPA':<6} {'Avg':<7} {'Pctl':<6} {'Honours':<35}")
+        print("-" * 110)
+        for standing in standings:
+            print(f"{standing.rank:<6} {standing.reg_no:<15} {standing.name:<30} {standing.gpa:<6.2f} "
+                  f"{standing.average_mark:<7.2f} {standing.percentile:<6.1f} {standing.honours:<35}")
+        return standings
+
+    @staticmethod
+    def print_instructor_workloads(workloads):
+        print(f"{'ID':<6} {'Staff No':<12} {'Name':<30} {'Courses':<8} {'Credits':<8} {'Students':<8}")
+        print("-" * 77)
+        for workload in workloads:
+            print(f"{workload.instructor_id:<6} {workload.staff_no:<12} {workload.name:<30} "
+                  f"{workload.courses:<8} {workload.credits:<8} {workload.students:<8}")
+
+    @staticmethod
+    def instructor_workload_report():
+        """
+        Prints courses, credits and enrolled students for every instructor and
+        returns the workloads.
+        """
+        workloads = instructor_workloads()
+        print("\n--- Instructor Workload ---")
+        if not workloads:
+            print("No instructors found.")
+            return workloads
+        ReportingService.print_instructor_workloads(workloads)
+        return workloads
+
+    @staticmethod
+    def query_performance_report(limit=15, slow_queries=5):
+        """
+        Prints the query shapes with the most total time and the latest slow
+        queries with their plans, and returns the per-shape statistics.
+        """
+        print("\n--- Query Performance ---")
+        if not query_monitor.enabled:
+            if input("Query monitoring is off. Turn it on now? (y/n): ").strip().lower() == "y":
+                query_monitor.enable()
+                print("Monitoring on; statistics are collected from now on.")
+            return []
+        stats = query_monitor.get_stats()
+        if not stats:
+            print("No queries recorded yet.")
+            return stats
+
+        print(f"{'Count':>8} {'Total ms':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Rows':>9} {'Slow':>5}  Query")
+        print("-" * 120)
+        for query in stats[:limit]:
+            print(f"{query['count']:>8} {query['total_s'] * 1000:>10.1f} {query['p50_s'] * 1000:>8.2f} "
+                  f"{query['p95_s'] * 1000:>8.2f} {query['p99_s'] * 1000:>8.2f} {query['rows']:>9} "
+                  f"{query['slow']:>5}  {query['query'][:60]}")
+
+        recent = query_monitor.get_slow_queries()[-slow_queries:]
+        print(f"\nSlow queries (over {query_monitor.slow_query_seconds * 1000:.0f} ms): "
+              f"{'none' if not recent else f'latest {len(recent)}'}")
+        for entry in reversed(recent):
+            print(f"\n{entry['elapsed_s'] * 1000:.1f} ms, {entry['rows']} rows: {entry['query']}")
+            for line in entry['plan']:
+                print(f"    {line}")
+        return stats
+
     @staticmethod
     def reg_no_statistics_report(reg_no_id):
         """
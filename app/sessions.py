@@ -0,0 +1,141 @@
+# app/sessions.py
+"""
+In-memory session store keyed by opaque tokens.
+
+Logging in verifies the password once and caches the user's id, role and
+student/instructor ids in a Session; after that, authorising a request is a
+dictionary lookup. Sessions expire after `ttl` seconds without use, and when
+the store is full the least recently used session is dropped. Entries are
+kept in last-use order, so expired sessions are always at the front and are
+purged without scanning the whole store.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from app.models import User
+
+DEFAULT_SESSION_TTL = 30 * 60
+DEFAULT_MAX_SESSIONS = 10000
+
+
+class Session:
+    __slots__ = ('token', 'user_id', 'username', 'role', 'student_id', 'instructor_id', 'created_at', 'expires_at')
+
+    def __init__(self, token, user_id, username, role, student_id, instructor_id, created_at, expires_at):
+        self.token = token
+        self.user_id = user_id
+        self.username = username
+        self.role = role
+        self.student_id = student_id
+        self.instructor_id = instructor_id
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        return f"Session(user_id={self.user_id}, username={self.username!r}, role={self.role!r})"
+
+
+class SessionStore:
+    def __init__(self, ttl=DEFAULT_SESSION_TTL, max_sessions=DEFAULT_MAX_SESSIONS, clock=time.monotonic):
+        if max_sessions < 1:
+            raise ValueError("The store must hold at least one session.")
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'created': 0, 'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0, 'revoked': 0}
+
+    def create(self, user):
+        """
+        Starts a session for a Users row (as returned by User.find_by_username)
+        and returns it; its token identifies the session from then on.
+        """
+        import secrets
+
+        user_id, username, role, student_id, instructor_id = User.find_session_profile(user[0])
+        now = self._clock()
+        session = Session(secrets.token_urlsafe(32), user_id, username, role, student_id, instructor_id,
+                          now, now + self.ttl)
+        with self._lock:
+            self._purge_expired(now)
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._stats['evicted'] += 1
+            self._sessions[session.token] = session
+            self._stats['created'] += 1
+        return session
+
+    def get(self, token):
+        """
+        Returns the live session for `token` and extends its expiry, or None.
+        """
+        if token is None:
+            return None
+        now = self._clock()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                self._stats['misses'] += 1
+                return None
+            if session.expires_at <= now:
+                del self._sessions[token]
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            session.expires_at = now + self.ttl
+            self._sessions.move_to_end(token)
+            self._stats['hits'] += 1
+            return session
+
+    def revoke(self, token):
+        with self._lock:
+            if self._sessions.pop(token, None) is None:
+                return False
+            self._stats['revoked'] += 1
+            return True
+
+    def revoke_user(self, user_id):
+        """
+        Ends every session belonging to a user, e.g. after a password reset.
+        Returns the number of sessions ended.
+        """
+        with self._lock:
+            tokens = [token for token, session in self._sessions.items() if session.user_id == user_id]
+            for token in tokens:
+                del self._sessions[token]
+            self._stats['revoked'] += len(tokens)
+        return len(tokens)
+
+    def purge_expired(self):
+        with self._lock:
+            return self._purge_expired(self._clock())
+
+    def _purge_expired(self, now):
+        purged = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.expires_at > now:
+                break
+            self._sessions.popitem(last=False)
+            purged += 1
+        self._stats['expired'] += purged
+        return purged
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['active'] = len(self._sessions)
+        return stats
+
+
+session_store = SessionStore()
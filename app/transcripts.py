@@ -0,0 +1,291 @@
+# app/transcripts.py
+"""
+Transcript generation for one student or whole cohorts.
+
+Data for a chunk of students is fetched with two set-based queries
+(students, course results) and rendered as plain text or HTML. The GPA and
+classification are computed from the same latest-grade-per-enrollment rows
+the course table shows, so a resubmitted grade can't make them disagree.
+
+generate_transcripts() spreads chunks over a process pool; each worker opens
+its own pooled connections and writes its files directly, and only a bounded
+number of chunks is in flight, so memory stays flat however many students are
+exported.
+"""
+import itertools
+import os
+import re
+import time
+
+from app.database import configure_pool, get_connection, get_pool
+from app.grading import get_scale
+
+DEFAULT_CHUNK_SIZE = 200
+FORMATS = ('txt', 'html')
+
+
+class Transcript:
+    def __init__(self, student_id, reg_no, name, admission_date, major, status):
+        self.student_id = student_id
+        self.reg_no = reg_no
+        self.name = name
+        self.admission_date = admission_date
+        self.major = major
+        self.status = status
+        self.courses = []
+        self.gpa = 0.0
+        self.weighted_gpa = 0.0
+        self.honours = None
+
+    def terms(self):
+        """
+        Course rows grouped by (year, semester), in order.
+        """
+        return itertools.groupby(self.courses, key=lambda course: (course[0], course[1]))
+
+    def summarise(self, scale):
+        """
+        Sets gpa, weighted_gpa and honours from the graded course rows, the
+        way StudentGPA computes them.
+        """
+        graded = [(credits or 0, mark) for _, _, _, _, credits, _, _, mark in self.courses if mark is not None]
+        if not graded:
+            return
+        marks = [mark for _, mark in graded]
+        total_credits = sum(credits for credits, _ in graded)
+        self.gpa = scale.gpa(marks)
+        if total_credits:
+            weighted_points = sum(scale.points(mark) * credits for credits, mark in graded)
+            self.weighted_gpa = round(weighted_points / total_credits, 2)
+        self.honours = scale.classify_honours(sum(marks) / len(marks))
+
+
+def fetch_transcripts(student_ids):
+    """
+    Loads transcript data for a list of students (at most a few hundred, to
+    stay within SQLite's parameter limit). Returns Transcripts in input order,
+    skipping unknown ids.
+    """
+    student_ids = list(student_ids)
+    if not student_ids:
+        return []
+    placeholders = ", ".join("?" for _ in student_ids)
+    connection = get_connection()
+    cursor = connection.cursor()
+
+    cursor.execute(f"""
+        SELECT student_id, reg_no, first_name || ' ' || last_name, admission_date, major, status
+        FROM Students
+        WHERE student_id IN ({placeholders})
+    """, student_ids)
+    transcripts = {row[0]: Transcript(*row) for row in cursor.fetchall()}
+
+    cursor.execute(f"""
+        SELECT e.student_id, e.year, e.semester, c.course_code, c.title, c.credits, e.status,
+            g.grade_value, g.numeric_grade
+        FROM Enrollments e
+        JOIN Courses c ON c.course_id = e.course_id
+        LEFT JOIN Grades g ON g.grade_id = (
+            SELECT MAX(grade_id) FROM Grades WHERE enrollment_id = e.enrollment_id
+        )
+        WHERE e.student_id IN ({placeholders})
+        ORDER BY e.student_id, e.year, e.semester, c.course_code
+    """, student_ids)
+    for row in cursor.fetchall():
+        transcripts[row[0]].courses.append(row[1:])
+    connection.close()
+
+    scale = get_scale()
+    for transcript in transcripts.values():
+        transcript.summarise(scale)
+    return [transcripts[student_id] for student_id in student_ids if student_id in transcripts]
+
+
+def _format_grade(grade_value, numeric_grade):
+    if grade_value is None:
+        return "-", "-"
+    return grade_value, f"{numeric_grade:g}" if numeric_grade is not None else "-"
+
+
+def render_text(transcript):
+    lines = [
+        "OFFICIAL TRANSCRIPT",
+        "=" * 78,
+        f"Name: {transcript.name}",
+        f"Registration No: {transcript.reg_no}",
+        f"Major: {transcript.major or '-'}    Admitted: {transcript.admission_date}    Status: {transcript.status}",
+        "",
+    ]
+    for (year, semester), courses in transcript.terms():
+        lines.append(f"{year} {semester}")
+        lines.append(f"  {'Code':<12} {'Title':<34} {'Credits':<8} {'Grade':<6} {'Mark':<6} {'Status':<10}")
+        for _, _, course_code, title, credits, status, grade_value, numeric_grade in courses:
+            grade, mark = _format_grade(grade_value, numeric_grade)
+            lines.append(f"  {course_code:<12} {title[:34]:<34} {credits:<8} {grade:<6} {mark:<6} {status:<10}")
+        lines.append("")
+    lines.append("-" * 78)
+    lines.append(f"GPA: {transcript.gpa:.2f}    Credit-weighted GPA: {transcript.weighted_gpa:.2f}")
+    lines.append(f"Classification: {transcript.honours or 'Not yet classified'}")
+    return "\n".join(lines) + "\n"
+
+
+def render_html(transcript):
+    import html
+
+    escape = html.escape
+    parts = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset=\"utf-8\">",
+        f"<title>Transcript - {escape(transcript.reg_no)}</title>",
+        "<style>body{font-family:serif;margin:2em}table{border-collapse:collapse;width:100%;margin-bottom:1em}"
+        "th,td{border:1px solid #999;padding:2px 6px;text-align:left}@media print{body{margin:0}}</style>",
+        "</head><body>",
+        "<h1>Official Transcript</h1>",
+        f"<p><strong>{escape(transcript.name)}</strong> &mdash; {escape(transcript.reg_no)}<br>",
+        f"Major: {escape(transcript.major or '-')} &middot; Admitted: {escape(str(transcript.admission_date))}"
+        f" &middot; Status: {escape(transcript.status)}</p>",
+    ]
+    for (year, semester), courses in transcript.terms():
+        parts.append(f"<h2>{escape(str(year))} {escape(semester)}</h2>")
+        parts.append("<table><tr><th>Code</th><th>Title</th><th>Credits</th><th>Grade</th><th>Mark</th><th>Status</th></tr>")
+        for _, _, course_code, title, credits, status, grade_value, numeric_grade in courses:
+            grade, mark = _format_grade(grade_value, numeric_grade)
+            cells = (course_code, title, credits, grade, mark, status)
+            parts.append("<tr>" + "".join(f"<td>{escape(str(cell))}</td>" for cell in cells) + "</tr>")
+        parts.append("</table>")
+    parts.append(f"<p>GPA: {transcript.gpa:.2f} &middot; Credit-weighted GPA: {transcript.weighted_gpa:.2f}<br>")
+    parts.append(f"Classification: {escape(transcript.honours or 'Not yet classified')}</p>")
+    parts.append("</body></html>")
+    return "\n".join(parts) + "\n"
+
+
+RENDERERS = {'txt': render_text, 'html': render_html}
+
+
+def transcript_filename(reg_no, student_id, extension):
+    # Registration numbers often contain slashes (e.g. CS/001/2024). Replacing
+    # them can make two numbers alike (CS/001, CS_001), so the student id ends
+    # every name.
+    return f"{re.sub(r'[^A-Za-z0-9_.-]', '_', reg_no)}_{student_id}.{extension}"
+
+
+def write_transcripts(student_ids, output_dir, formats=FORMATS):
+    """
+    Fetches, renders and writes one chunk of transcripts. Returns a list of
+    (student_id, seconds) timings for rendering and writing each transcript.
+    """
+    timings = []
+    for transcript in fetch_transcripts(student_ids):
+        start = time.perf_counter()
+        for extension in formats:
+            path = os.path.join(output_dir, transcript_filename(transcript.reg_no, transcript.student_id, extension))
+            with open(path, "w", encoding="utf-8") as output_file:
+                output_file.write(RENDERERS[extension](transcript))
+        timings.append((transcript.student_id, time.perf_counter() - start))
+    return timings
+
+
+class TranscriptRun:
+    """
+    Progress and timing of a generate_transcripts() call.
+    """
+    def __init__(self):
+        self.written = 0
+        self.chunks = 0
+        self.elapsed = 0.0
+        self.total_render_time = 0.0
+        self.slowest = (None, 0.0)
+
+    def record(self, timings):
+        self.chunks += 1
+        self.written += len(timings)
+        for student_id, seconds in timings:
+            self.total_render_time += seconds
+            if seconds > self.slowest[1]:
+                self.slowest = (student_id, seconds)
+
+    @property
+    def mean_render_time(self):
+        return self.total_render_time / self.written if self.written else 0.0
+
+    @property
+    def per_second(self):
+        return self.written / self.elapsed if self.elapsed else 0.0
+
+
+def generate_transcripts(student_ids, output_dir, formats=FORMATS, workers=None,
+                         chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Writes transcripts for every student id (any iterable) into `output_dir`
+    using a pool of `workers` processes (default: one per CPU).
+
+    `progress`, if given, is called with the running TranscriptRun after each
+    completed chunk. Returns the final TranscriptRun.
+    """
+    # Imported here: multiprocessing is slow to import and most runs never need it.
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+    unknown = set(formats) - set(RENDERERS)
+    if unknown:
+        raise ValueError(f"Unknown transcript format(s): {', '.join(sorted(unknown))}.")
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    run = TranscriptRun()
+    start = time.perf_counter()
+    ids = iter(student_ids)
+    chunks = iter(lambda: list(itertools.islice(ids, chunk_size)), [])
+
+    pool = get_pool()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=configure_pool,
+        initargs=(pool.db_name, pool.max_size, pool.timeout, pool.profile),
+    ) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(write_transcripts, chunk, output_dir, tuple(formats)))
+            # Keep a couple of chunks queued per worker and no more.
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done, run, start, progress)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            _collect(done, run, start, progress)
+
+    run.elapsed = time.perf_counter() - start
+    return run
+
+
+def _collect(done, run, start, progress):
+    for future in done:
+        run.record(future.result())
+        run.elapsed = time.perf_counter() - start
+        if progress:
+            progress(run)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.models import Student
+
+    parser = argparse.ArgumentParser(description="Write transcripts for a cohort of students.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--status", default="graduated", help="student status to export (default: graduated)")
+    parser.add_argument("--major")
+    parser.add_argument("--admission-year", type=int)
+    parser.add_argument("--format", dest="formats", action="append", choices=FORMATS,
+                        help="output format, may be repeated (default: txt and html)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    student_ids = Student.find_ids_by_cohort(args.major, args.admission_year, args.status)
+    result = generate_transcripts(
+        student_ids, args.output_dir, tuple(args.formats or FORMATS), args.workers, args.chunk_size,
+        progress=lambda run: print(f"  {run.written:,}/{len(student_ids):,} transcripts ({run.per_second:,.0f}/sec)"),
+    )
+    print(f"Wrote {result.written:,} transcripts to {args.output_dir} in {result.elapsed:.2f}s; "
+          f"mean {result.mean_render_time * 1000:.2f} ms each, slowest student {result.slowest[0]} "
+          f"at {result.slowest[1] * 1000:.2f} ms.")
@@ -1,10 +1,50 @@
 # app/utils.py
-import bcrypt
+import os
 
+# bcrypt and concurrent.futures (which pulls in multiprocessing) are imported
+# inside the functions that use them, to keep start-up fast.
 
-def hash_password(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# bcrypt cost factor (log2 of the key-expansion rounds); gensalt's own default.
+DEFAULT_BCRYPT_ROUNDS = 12
+
+
+def hash_password(password, rounds=DEFAULT_BCRYPT_ROUNDS):
+    import bcrypt
+
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
 
 
 def verify_password(password, hashed_password):
+    import bcrypt
+
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def _hash_password_job(job):
+    password, rounds = job
+    return hash_password(password, rounds)
+
+
+def hash_passwords(passwords, rounds=DEFAULT_BCRYPT_ROUNDS, workers=None, use_threads=False):
+    """
+    Hashes a batch of passwords in parallel, returning hashes in input order.
+
+    Work is spread over `workers` processes (default: one per CPU). bcrypt
+    releases the GIL while hashing, so `use_threads=True` gets the same
+    parallelism from a thread pool without the process start-up cost.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    passwords = list(passwords)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) <= 1:
+        return [hash_password(password, rounds) for password in passwords]
+
+    workers = min(workers, len(passwords))
+    jobs = [(password, rounds) for password in passwords]
+    if use_threads:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_hash_password_job, jobs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        return list(executor.map(_hash_password_job, jobs, chunksize=chunksize))
@@ -0,0 +1,66 @@
+# benchmarks/bench_grades.py
+"""
+Throughput of app.grade_upload.upload_grades for a large batch.
+
+Usage: python -m benchmarks.bench_grades [--grades N] [--courses C]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+
+from app.database import DB_NAME, configure_pool, initialize_db, transaction
+from app.grade_upload import upload_grades
+
+
+def seed(students, courses):
+    with transaction() as connection:
+        connection.executemany(
+            "INSERT INTO Students (reg_no, first_name, last_name, admission_date, major, status) "
+            "VALUES (?, 'First', 'Last', '2024-09-01', 'CS', 'active')",
+            ((f"REG{i:07}",) for i in range(students)),
+        )
+        connection.executemany(
+            "INSERT INTO Courses (course_code, title, credits, max_enrollment, instructor_id, status) "
+            "VALUES (?, 'Course', 3, ?, 1, 'active')",
+            ((f"C{c:04}", students) for c in range(courses)),
+        )
+        connection.execute("""
+            INSERT INTO Enrollments (year, semester, student_id, course_id, status)
+            SELECT 2024, 'Fall', student_id, course_id, 'enrolled'
+            FROM Students CROSS JOIN Courses
+        """)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grades", type=int, default=100_000, help="grades in the batch")
+    parser.add_argument("--courses", type=int, default=10, help="courses the grades are spread over")
+    args = parser.parse_args()
+
+    students = max(1, args.grades // args.courses)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        configure_pool(os.path.join(tmpdir, "bench.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        seed(students, args.courses)
+
+        rows = [
+            (f"REG{i:07}", f"C{c:04}", round(random.uniform(0, 100), 1), None)
+            for i in range(students) for c in range(args.courses)
+        ]
+        result = upload_grades(rows, submitted_by=1)
+        print(f"Submitted {result.imported:,} grades in {result.elapsed:.2f}s "
+              f"({result.rows_per_sec:,.0f} grades/sec, {len(result.rejects)} rejected)")
+
+        # Resubmitting replaces every existing grade.
+        result = upload_grades(rows, submitted_by=1)
+        print(f"Resubmitted {result.imported:,} grades in {result.elapsed:.2f}s "
+              f"({result.rows_per_sec:,.0f} grades/sec)")
+        configure_pool(DB_NAME)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# benchmarks/bench_hashing.py
+"""
+bcrypt hashes/sec for app.utils.hash_passwords at increasing worker counts.
+
+Usage: python -m benchmarks.bench_hashing [--count N] [--rounds R] [--threads]
+"""
+import argparse
+import os
+import time
+
+from app.utils import hash_passwords
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=64, help="passwords hashed per run")
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost factor")
+    parser.add_argument("--threads", action="store_true", help="use the thread pool instead of processes")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpus} | {n for n in (8, 16) if n <= cpus})
+    passwords = [f"password-{i}" for i in range(args.count)]
+
+    print(f"{args.count} hashes, cost {args.rounds}, {'threads' if args.threads else 'processes'}, {cpus} CPUs")
+    print(f"{'Workers':>8} {'Hashes/sec':>12} {'Per worker':>12}")
+    print("-" * 34)
+    for workers in worker_counts:
+        start = time.perf_counter()
+        hash_passwords(passwords, args.rounds, workers, args.threads)
+        rate = args.count / (time.perf_counter() - start)
+        print(f"{workers:>8} {rate:>12,.1f} {rate / workers:>12,.1f}")
+
+
+if __name__ == "__main__":
+    main()
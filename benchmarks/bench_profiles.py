@@ -0,0 +1,59 @@
+# benchmarks/bench_profiles.py
+"""
+Write and read throughput of the model layer under each SQLite performance profile.
+
+Usage: python -m benchmarks.bench_profiles [--rows N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from app.database import PERFORMANCE_PROFILES, DB_NAME, configure_pool, initialize_db
+from app.models import User
+
+
+def run_profile(profile, rows):
+    """
+    Times `rows` single-row committed inserts, then `rows` lookups by username,
+    against a fresh database file. Returns (writes/sec, reads/sec).
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        configure_pool(os.path.join(tmpdir, "bench.db"), profile=profile)
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+
+        start = time.perf_counter()
+        for i in range(rows):
+            user = User(f"bench_user_{i}", "x" * 60, "student")
+            user.create()
+            user.close()
+        write_elapsed = time.perf_counter() - start
+
+        names = [f"bench_user_{random.randrange(rows)}" for _ in range(rows)]
+        start = time.perf_counter()
+        for name in names:
+            User.find_by_username(name)
+        read_elapsed = time.perf_counter() - start
+
+        configure_pool(DB_NAME)
+    return rows / write_elapsed, rows / read_elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000, help="rows written and read per profile")
+    args = parser.parse_args()
+
+    print(f"{'Profile':<12} {'Writes/sec':>12} {'Reads/sec':>12}")
+    print("-" * 38)
+    for profile in PERFORMANCE_PROFILES:
+        writes, reads = run_profile(profile, args.rows)
+        print(f"{profile:<12} {writes:>12,.0f} {reads:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
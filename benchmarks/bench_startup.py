@@ -0,0 +1,97 @@
+# benchmarks/bench_startup.py
+"""
+Start-up time: wall clock to initialise an up-to-date database and import the menus.
+
+Each run is a fresh interpreter started with -X importtime, so the numbers
+include interpreter start-up and match what a user waits for when launching
+main.py. The slowest imports (by cumulative time) of the last run are listed
+to show what to defer next.
+
+Usage: python -m benchmarks.bench_startup [--runs N] [--db PATH] [--top K]
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# What main.py does before showing the first menu.
+STARTUP_SCRIPT = """
+import sys
+from app.database import configure_pool, initialize_db
+configure_pool(sys.argv[1])
+initialize_db()
+import app.menus
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def prepare_database(db_path):
+    """
+    Creates the database and applies every migration, so start-up takes the fast path.
+    """
+    from app.database import DB_NAME, configure_pool, initialize_db
+
+    configure_pool(db_path)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+    finally:
+        configure_pool(DB_NAME)
+
+
+def parse_importtime(stderr):
+    """
+    Returns (module, self_us, cumulative_us) for each -X importtime line.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        imports.append((module.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def time_startup(db_path, script=STARTUP_SCRIPT):
+    """
+    Runs `script` in a fresh interpreter and returns (wall_seconds, imports, stdout).
+    """
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", script, db_path],
+                               cwd=ROOT, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    return elapsed, parse_importtime(completed.stderr), completed.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--db", help="existing database to start against (default: a fresh temporary one)")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = args.db or os.path.join(tmpdir, "startup.db")
+        prepare_database(db_path)
+        timings = []
+        for _ in range(args.runs):
+            elapsed, imports, _ = time_startup(db_path)
+            timings.append(elapsed)
+
+    timings.sort()
+    print(f"{args.runs} runs: min {timings[0] * 1000:.1f} ms, median {statistics.median(timings) * 1000:.1f} ms, "
+          f"max {timings[-1] * 1000:.1f} ms")
+    print(f"\n{'Module':<40} {'Self ms':>9} {'Cumulative ms':>14}")
+    print("-" * 65)
+    for module, self_us, cumulative_us in sorted(imports, key=lambda item: -item[2])[:args.top]:
+        print(f"{module:<40} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# benchmarks/load_test.py
+"""
+Load test for the JSON API: requests/sec and latency percentiles.
+
+Without --url it starts an in-process server (app.api) on a temporary,
+seeded database. Each client thread logs in once and then issues requests
+over one keep-alive connection, cycling through a read-heavy mix of
+endpoints (or just --path).
+
+Usage: python -m benchmarks.load_test [--clients C] [--requests N] [--workers W]
+                                      [--url http://host:port --username U --password P]
+                                      [--path /courses/search?q=c1]
+"""
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from app.database import DB_NAME, configure_pool, transaction
+from app.utils import hash_password
+
+REQUEST_MIX = [
+    "/students?limit=50",
+    "/students/REG{n:06}",
+    "/students/search?q=last{n}",
+    "/courses/search?q=intro",
+    "/courses/C{course:03}",
+    "/reports/instructors",
+]
+
+
+def seed(students=5000, courses=200, password="loadtest"):
+    with transaction() as connection:
+        connection.execute(
+            "INSERT INTO Users (username, password_hash, role) VALUES ('loadtest', ?, 'admin')",
+            (hash_password(password, rounds=4),),
+        )
+        connection.executemany(
+            "INSERT INTO Instructors (staff_no, first_name, last_name, hire_date) VALUES (?, 'Staff', ?, '2020-01-01')",
+            ((f"S{i:04}", f"Member{i}") for i in range(20)),
+        )
+        connection.executemany(
+            "INSERT INTO Students (reg_no, first_name, last_name, admission_date, major, status) "
+            "VALUES (?, 'First', ?, '2023-09-01', 'CS', 'active')",
+            ((f"REG{i:06}", f"Last{i}") for i in range(students)),
+        )
+        connection.executemany(
+            "INSERT INTO Courses (course_code, title, credits, max_enrollment, instructor_id, status) "
+            "VALUES (?, ?, 3, 500, ?, 'active')",
+            ((f"C{c:03}", f"Intro to Topic {c}", c % 20 + 1) for c in range(courses)),
+        )
+        connection.execute("""
+            INSERT INTO Enrollments (year, semester, student_id, course_id, status)
+            SELECT 2024, 'Fall', student_id, student_id % ? + 1, 'enrolled' FROM Students
+        """, (courses,))
+    return "loadtest", password
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_client(host, port, username, password, paths, count, latencies, errors):
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    body = json.dumps({"username": username, "password": password})
+    connection.request("POST", "/login", body, {"Content-Type": "application/json"})
+    response = connection.getresponse()
+    token = json.loads(response.read()).get("token")
+    if response.status != 200:
+        errors.append(f"login failed with {response.status}")
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    local = []
+    for i in range(count):
+        path = paths[i % len(paths)].format(n=i % 5000, course=i % 200)
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(f"{path}: {response.status}")
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(f"{path}: {e!r}")
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+        local.append(time.perf_counter() - start)
+    connection.close()
+    latencies.extend(local)
+
+
+def run_load(host, port, username, password, clients, requests_per_client, paths):
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=run_client,
+                         args=(host, port, username, password, paths, requests_per_client, latencies, errors))
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies):,} requests from {clients} clients in {elapsed:.2f}s "
+          f"= {len(latencies) / elapsed:,.0f} req/s, {len(errors)} errors")
+    print("latency ms: " + "  ".join(
+        f"p{int(fraction * 100)}={percentile(latencies, fraction) * 1000:.2f}"
+        for fraction in (0.5, 0.9, 0.95, 0.99)
+    ) + f"  max={latencies[-1] * 1000 if latencies else 0:.2f}")
+    for error in errors[:5]:
+        print(f"  {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="requests per client")
+    parser.add_argument("--workers", type=int, default=8, help="server worker threads (in-process server)")
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    parser.add_argument("--username", default=None)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--path", action="append", help="path to request (repeatable); default is a mixed workload")
+    args = parser.parse_args()
+    paths = args.path or REQUEST_MIX
+
+    if args.url:
+        url = urlsplit(args.url)
+        run_load(url.hostname, url.port or 80, args.username, args.password, args.clients, args.requests, paths)
+        return
+
+    from app.api import create_server
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            server = create_server(port=0, workers=args.workers, db_name=os.path.join(tmpdir, "load.db"), quiet=True)
+        username, password = seed()
+        host, port = server.server_address
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            run_load(host, port, username, password, args.clients, args.requests, paths)
+        finally:
+            server.shutdown()
+            server.server_close()
+            configure_pool(DB_NAME)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+# benchmarks/suite.py
+"""
+Benchmark suite for the model and service hot paths, with baseline comparison.
+
+For each scale a fresh database is seeded (students, courses, one term of
+enrollments and grades) and every case in CASES is timed `--repeat` times.
+Results are written as JSON. If a baseline file exists, each case's median is
+compared with the baseline's and the run fails (exit status 1) when any case
+is slower by more than `--threshold` (a fraction, default 0.25 = 25%).
+
+Baselines are machine-specific: record one with --save-baseline on the
+machine you compare on, before making the change being measured.
+
+Usage: python -m benchmarks.suite [--scales small,medium] [--repeat N] [--cases user.,bulk.]
+                                  [--output PATH] [--baseline PATH] [--save-baseline]
+                                  [--threshold 0.25]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from app.bulk_import import import_students
+from app.database import DB_NAME, configure_pool, initialize_db, transaction
+from app.grade_upload import upload_grades
+from app.models import Course, Enrollment, Grade, Student, User
+from app.services import AuthenticationService, SessionManager
+from app.utils import DEFAULT_BCRYPT_ROUNDS, hash_password
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, "results", "latest.json")
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "results", "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+SCALES = {
+    "small": {"students": 1_000, "courses": 50, "courses_per_student": 5},
+    "medium": {"students": 10_000, "courses": 200, "courses_per_student": 8},
+    "large": {"students": 50_000, "courses": 500, "courses_per_student": 10},
+}
+DEFAULT_SCALES = ("small", "medium")
+
+SEED_YEAR = 2024
+SEED_SEMESTER = "Fall"
+LOGIN_PASSWORD = "benchmark"
+# Bulk rows per timed run, whatever the scale.
+BULK_ROWS = 1_000
+# Point lookups per timed run.
+LOOKUPS = 1_000
+
+
+def seed(students, courses, courses_per_student, hash_rounds=DEFAULT_BCRYPT_ROUNDS):
+    """
+    Fills an empty database and returns the context the cases run against.
+    Every student has a login; the GPA triggers stay installed so writes cost
+    what they do in production.
+    """
+    password_hash = hash_password(LOGIN_PASSWORD, rounds=4)
+    with transaction() as connection:
+        connection.execute("INSERT INTO Users (username, password_hash, role) VALUES ('bench_admin', ?, 'admin')",
+                           (hash_password(LOGIN_PASSWORD, rounds=hash_rounds),))
+        connection.execute("INSERT INTO Users (username, password_hash, role) VALUES ('bench_staff', ?, 'instructor')",
+                           (password_hash,))
+        connection.execute(
+            "INSERT INTO Instructors (user_id, staff_no, first_name, last_name, hire_date) "
+            "SELECT user_id, 'S0001', 'Bench', 'Staff', '2020-01-01' FROM Users WHERE username = 'bench_staff'"
+        )
+        connection.executemany(
+            "INSERT INTO Users (username, password_hash, role) VALUES (?, ?, 'student')",
+            ((f"student{i}", password_hash) for i in range(students)),
+        )
+        connection.execute("""
+            INSERT INTO Students (user_id, reg_no, first_name, last_name, admission_date, major, status)
+            SELECT user_id, 'REG' || printf('%07d', CAST(substr(username, 8) AS INTEGER)),
+                'First', 'Last' || substr(username, 8), '2023-09-01', 'CS', 'active'
+            FROM Users WHERE role = 'student' ORDER BY user_id
+        """)
+        connection.executemany(
+            "INSERT INTO Courses (course_code, title, credits, max_enrollment, instructor_id, status) "
+            "VALUES (?, ?, 3, ?, 1, 'active')",
+            ((f"C{c:04}", f"Course {c}", students) for c in range(courses)),
+        )
+        for slot in range(courses_per_student):
+            connection.execute("""
+                INSERT INTO Enrollments (year, semester, student_id, course_id, status)
+                SELECT ?, ?, student_id, (student_id * 7 + ?) % ? + 1, 'completed' FROM Students
+            """, (SEED_YEAR, SEED_SEMESTER, slot, courses))
+        connection.execute("""
+            INSERT INTO Grades (enrollment_id, grade_value, numeric_grade, submitted_by)
+            SELECT enrollment_id, 'B', ABS(RANDOM() % 10000) / 100.0, 1 FROM Enrollments
+        """)
+    sample = max(1, students // LOOKUPS)
+    return {
+        "students": students,
+        "courses": courses,
+        "usernames": [f"student{i}" for i in range(0, students, sample)][:LOOKUPS],
+        "student_ids": list(range(1, students + 1, sample))[:LOOKUPS],
+        "password_hash": password_hash,
+    }
+
+
+# Each case takes (context, run) and returns a callable to time; anything
+# before the return is per-run setup and isn't timed. The callable returns the
+# number of operations it performed.
+CASES = {}
+
+
+def case(name):
+    def register(function):
+        CASES[name] = function
+        return function
+    return register
+
+
+@case("user.find_by_username")
+def bench_find_by_username(context, run):
+    def lookups():
+        for username in context["usernames"]:
+            User.find_by_username(username)
+        return len(context["usernames"])
+    return lookups
+
+
+@case("student.find_all")
+def bench_student_find_all(context, run):
+    return lambda: len(Student.find_all())
+
+
+@case("course.find_all")
+def bench_course_find_all(context, run):
+    # Bypass the report cache: the query is what's being measured.
+    find_all = Course.find_all.__wrapped__
+    return lambda: len(find_all())
+
+
+@case("enrollment.statistics_all_courses")
+def bench_enrollment_statistics(context, run):
+    # Bypass the report cache: the query is what's being measured.
+    statistics_query = Enrollment.get_enrollment_statistics_for_all_courses.__wrapped__
+    return lambda: len(statistics_query())
+
+
+@case("grade.calculate_gpa")
+def bench_calculate_gpa(context, run):
+    def gpas():
+        for student_id in context["student_ids"]:
+            Grade.calculate_gpa(student_id)
+        return len(context["student_ids"])
+    return gpas
+
+
+@case("auth.login")
+def bench_login(context, run):
+    def login():
+        with contextlib.redirect_stdout(io.StringIO()):
+            if not AuthenticationService.login("bench_admin", LOGIN_PASSWORD):
+                raise RuntimeError("benchmark login failed")
+        SessionManager.logout_user()
+        return 1
+    return login
+
+
+@case("bulk.enroll")
+def bench_bulk_enroll(context, run):
+    # A new term each run, so every pair is a real insert.
+    student_ids = range(1, min(context["students"], BULK_ROWS) + 1)
+    return lambda: Enrollment.bulk_enroll(student_ids, [1], SEED_YEAR + 1 + run, SEED_SEMESTER)["enrolled"]
+
+
+@case("bulk.upload_grades")
+def bench_upload_grades(context, run):
+    # Regrades existing enrollments; uploading replaces grades, so runs repeat the same work.
+    # Student REG<i> has student_id i + 1 and took course index (student_id * 7) % courses in slot 0.
+    rows = [(f"REG{i:07}", f"C{(i + 1) * 7 % context['courses']:04}", str(50 + i % 50))
+            for i in range(min(context["students"], BULK_ROWS))]
+
+    def upload():
+        result = upload_grades(rows, 1, SEED_YEAR, SEED_SEMESTER)
+        if result.rejects:
+            raise RuntimeError(f"benchmark grade upload rejected rows: {result.rejects[:3]}")
+        return result.imported
+    return upload
+
+
+@case("bulk.import_students")
+def bench_import_students(context, run):
+    # Pre-hashed, so this times validation and inserts; see bench_hashing for bcrypt.
+    rows = [
+        {"username": f"import{run}_{i}", "password_hash": context["password_hash"], "reg_no": f"IMP{run}-{i:06}",
+         "first_name": "First", "last_name": "Last", "admission_date": "2024-09-01", "major": "CS"}
+        for i in range(BULK_ROWS)
+    ]
+    return lambda: import_students(rows).imported
+
+
+def time_case(function, context, repeat):
+    """
+    Runs a case `repeat` times and returns its timings summary.
+    """
+    durations = []
+    ops = 0
+    for run in range(repeat):
+        timed = function(context, run)
+        start = time.perf_counter()
+        ops = timed()
+        durations.append(time.perf_counter() - start)
+    median = statistics.median(durations)
+    return {
+        "repeat": repeat,
+        "ops": ops,
+        "median_s": median,
+        "min_s": min(durations),
+        "max_s": max(durations),
+        "ops_per_s": ops / median if median else 0.0,
+    }
+
+
+def run_scale(scale, repeat, case_names, hash_rounds=DEFAULT_BCRYPT_ROUNDS, progress=None):
+    """
+    Seeds a temporary database at `scale` (a SCALES-style dict) and times the
+    named cases against it. Returns {case name: summary}.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        configure_pool(os.path.join(tmpdir, "bench.db"))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                initialize_db()
+            context = seed(hash_rounds=hash_rounds, **scale)
+            for name in case_names:
+                results[name] = time_case(CASES[name], context, repeat)
+                if progress:
+                    progress(name, results[name])
+        finally:
+            configure_pool(DB_NAME)
+    return results
+
+
+def run_suite(scales, repeat=5, case_names=None, hash_rounds=DEFAULT_BCRYPT_ROUNDS, progress=None):
+    """
+    Runs the suite at each named scale ({name: SCALES-style dict}) and returns
+    the JSON-ready results document.
+    """
+    case_names = list(case_names or CASES)
+    document = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "hash_rounds": hash_rounds,
+        "scales": {},
+        "results": {},
+    }
+    for scale_name, scale in scales.items():
+        document["scales"][scale_name] = scale
+        document["results"][scale_name] = run_scale(
+            scale, repeat, case_names, hash_rounds,
+            progress and (lambda name, result, scale_name=scale_name: progress(scale_name, name, result)))
+    return document
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares medians case by case. Returns (scale, case, baseline_s,
+    current_s, ratio, regressed) for every case present in both documents.
+    """
+    rows = []
+    for scale_name, cases in current["results"].items():
+        baseline_cases = baseline.get("results", {}).get(scale_name, {})
+        for name, result in cases.items():
+            if name not in baseline_cases:
+                continue
+            # Compare time per operation, so a case's op count can change without a false alarm.
+            baseline_s = baseline_cases[name]["median_s"] / max(baseline_cases[name]["ops"], 1)
+            current_s = result["median_s"] / max(result["ops"], 1)
+            ratio = current_s / baseline_s if baseline_s else 1.0
+            rows.append((scale_name, name, baseline_s, current_s, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def write_json(path, document):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(document, output, indent=2)
+        output.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", default=",".join(DEFAULT_SCALES), help=f"comma-separated, from {', '.join(SCALES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--cases", help="comma-separated case names or prefixes (default: all)")
+    parser.add_argument("--hash-rounds", type=int, default=DEFAULT_BCRYPT_ROUNDS, help="bcrypt cost for the login case")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown per case as a fraction")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scales.split(",") if name not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+    case_names = list(CASES)
+    if args.cases:
+        prefixes = args.cases.split(",")
+        case_names = [name for name in CASES if name.startswith(tuple(prefixes))]
+        if not case_names:
+            parser.error(f"no cases match {args.cases}")
+
+    def report(scale_name, name, result):
+        print(f"{scale_name:<8} {name:<36} {result['median_s'] * 1000:>10.2f} ms {result['ops']:>8} ops "
+              f"{result['ops_per_s']:>12,.0f} ops/s")
+
+    print(f"{'Scale':<8} {'Case':<36} {'Median':>13} {'Ops':>12} {'Throughput':>16}")
+    document = run_suite({name: SCALES[name] for name in args.scales.split(",")}, args.repeat, case_names,
+                         args.hash_rounds, report)
+    write_json(args.output, document)
+    print(f"\nResults written to {args.output}")
+
+    status = 0
+    if args.save_baseline:
+        write_json(args.baseline, document)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            rows = compare(document, json.load(baseline_file), args.threshold)
+        print(f"\nAgainst {args.baseline} (threshold +{args.threshold:.0%}):")
+        for scale_name, name, baseline_s, current_s, ratio, regressed in rows:
+            print(f"{scale_name:<8} {name:<36} {baseline_s * 1e6:>10.1f} us -> {current_s * 1e6:>10.1f} us "
+                  f"{ratio - 1:>+8.1%}{'  REGRESSION' if regressed else ''}")
+        regressions = [row for row in rows if row[5]]
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}.")
+            status = 1
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
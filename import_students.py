@@ -0,0 +1,42 @@
+# import_students.py
+import argparse
+
+from app.bulk_import import import_students_csv, DEFAULT_CHUNK_SIZE
+from app.database import configure_pool, initialize_db, DB_NAME
+from app.utils import DEFAULT_BCRYPT_ROUNDS
+
+
+def print_progress(result):
+    print(f"  {result.rows:,} rows read, {result.imported:,} imported ({result.rows_per_sec:,.0f} rows/sec)")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Bulk import students from a CSV file.")
+    parser.add_argument("csv_path", help="CSV with username,password,reg_no,first_name,last_name,admission_date,major[,status]")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows written per transaction")
+    parser.add_argument("--db", default=DB_NAME, help="database file")
+    parser.add_argument("--profile", help="SQLite performance profile (durable, balanced, throughput)")
+    parser.add_argument("--hash-rounds", type=int, default=DEFAULT_BCRYPT_ROUNDS, help="bcrypt cost factor")
+    parser.add_argument("--hash-workers", type=int, help="parallel bcrypt workers (default: one per CPU)")
+    parser.add_argument("--hash-threads", action="store_true", help="hash on threads instead of processes")
+    parser.add_argument("--quiet", action="store_true", help="don't report progress after each chunk")
+    args = parser.parse_args()
+
+    configure_pool(args.db, profile=args.profile)
+    initialize_db()
+
+    result = import_students_csv(
+        args.csv_path, args.chunk_size, None if args.quiet else print_progress,
+        hash_rounds=args.hash_rounds, hash_workers=args.hash_workers, hash_threads=args.hash_threads,
+    )
+
+    print(f"\nImported {result.imported:,} of {result.rows:,} rows in {result.elapsed:.2f}s "
+          f"({result.rows_per_sec:,.0f} rows/sec).")
+    if result.rejects:
+        print(f"Rejected {len(result.rejects):,} rows:")
+        for line_number, reason in result.rejects:
+            print(f"  line {line_number}: {reason}")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,11 +1,87 @@
 # main.py
-from app.menus import main_menu
-from app.database import initialize_db
+import argparse
+import atexit
+import contextlib
+import sys
+
+from app.database import configure_pool, initialize_db, DB_NAME
+
+
+def run_batch(args):
+    """
+    Runs a script of operations (see app.batch) and prints report output as
+    JSON lines, followed by a timing summary.
+    """
+    import json
+
+    from app.batch import BatchError, load_script, run_script
+
+    try:
+        operations = load_script(args.batch)
+    except (BatchError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        result = run_script(operations, dry_run=args.dry_run, batch_size=args.batch_size,
+                            keep_going=args.keep_going, hash_rounds=args.hash_rounds)
+        for line_number, name, data in result.outputs:
+            if name == "report":
+                output.write(json.dumps({"line": line_number, "rows": data}, default=str) + "\n")
+            elif not args.quiet:
+                print(f"line {line_number}: {name}: {data}", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    for line_number, name, error in result.failures:
+        print(f"line {line_number}: {name} failed: {error}", file=sys.stderr)
+    for line in result.summary():
+        print(line, file=sys.stderr)
+    return 1 if result.failures else 0
+
 
 def run():
+    from app.batch import DEFAULT_BATCH_SIZE
+    from app.utils import DEFAULT_BCRYPT_ROUNDS
+
+    parser = argparse.ArgumentParser(description="Student management system. Interactive unless --batch is given.")
+    parser.add_argument("--batch", metavar="SCRIPT", help="run a JSON-lines or YAML script of operations and exit")
+    parser.add_argument("--dry-run", action="store_true", help="run the script, then roll everything back")
+    parser.add_argument("--keep-going", action="store_true", help="skip failed operations instead of stopping")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="operations per transaction")
+    parser.add_argument("--hash-rounds", type=int, default=DEFAULT_BCRYPT_ROUNDS, help="bcrypt cost for new passwords")
+    parser.add_argument("--output", help="write report output here instead of stdout")
+    parser.add_argument("--quiet", action="store_true", help="only print reports, failures and the summary")
+    parser.add_argument("--db", default=DB_NAME, help="database file")
+    parser.add_argument("--profile", help="SQLite performance profile (durable, balanced, throughput)")
+    parser.add_argument("--query-stats", metavar="PATH",
+                        help="collect per-query statistics and write them here on exit (.prom for Prometheus text)")
+    parser.add_argument("--slow-query-ms", type=float, help="log statements slower than this (implies monitoring)")
+    args = parser.parse_args()
+
+    configure_pool(args.db, profile=args.profile)
+
+    if args.query_stats or args.slow_query_ms is not None:
+        from app.instrumentation import enable_query_monitoring, write_query_stats
+
+        enable_query_monitoring(args.slow_query_ms)
+        if args.query_stats:
+            atexit.register(write_query_stats, args.query_stats)
+
+    if args.batch:
+        # Keep stdout for report output.
+        with contextlib.redirect_stdout(sys.stderr):
+            initialize_db()
+        sys.exit(run_batch(args))
+
     # Initialize the database
     initialize_db()
-    
+
+    # The menus pull in every service, so only import them for interactive use.
+    from app.menus import main_menu
+
     # Run the main menu
     while True:
         main_menu()
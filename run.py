@@ -24,8 +24,9 @@ def run_query(query, parameters=None):
         print(f"Error: {e}")
         return None
 
-query = "SELECT * FROM Users WHERE role = ?"
-parameters = ("student")  # Replace with actual values
-results = run_query(query, parameters)
-for row in results:
-    print(row)
\ No newline at end of file
+if __name__ == "__main__":
+    query = "SELECT * FROM Users WHERE role = ?"
+    parameters = ("student",)  # Replace with actual values
+    results = run_query(query, parameters)
+    for row in results or []:
+        print(row)
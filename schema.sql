@@ -1,3 +1,5 @@
+-- Baseline schema (version 0). Indexes and later changes are applied by app/migrations.py.
+
 -- Users Table
 CREATE TABLE Users (
     user_id INTEGER PRIMARY KEY AUTOINCREMENT,
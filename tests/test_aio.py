@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from app import aio
+from app.aio import (
+    AsyncAuthenticationService, AsyncCourseService, AsyncReportingService, AsyncRuntime, AsyncStudentService,
+)
+from app.database import configure_pool, initialize_db, DB_NAME
+
+
+class TestAsyncServices(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"), max_size=4)
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def run_async(self, coroutine_function):
+        async def main():
+            async with AsyncRuntime(hash_workers=2) as runtime:
+                return await coroutine_function(runtime)
+
+        return asyncio.run(main())
+
+    def test_login_flow(self):
+        async def scenario(runtime):
+            self.assertTrue(await AsyncAuthenticationService.register_user("alice", "secret", rounds=4))
+            self.assertFalse(await AsyncAuthenticationService.register_user("alice", "other", rounds=4))
+            self.assertIsNone(await AsyncAuthenticationService.login("alice", "wrong"))
+            session = await AsyncAuthenticationService.login("alice", "secret")
+            self.assertEqual(session.role, "student")
+            self.assertIs(await AsyncAuthenticationService.get_session(session.token), session)
+            self.assertTrue(await AsyncAuthenticationService.logout(session.token))
+
+        self.run_async(scenario)
+
+    def test_student_and_course_operations(self):
+        async def scenario(runtime):
+            student = await AsyncStudentService.add_student(
+                "ada", "pw", "REG1", "Ada", "Lovelace", "2023-09-01", "CS", rounds=4)
+            self.assertEqual(student[2], "REG1")
+            with self.assertRaises(ValueError):
+                await AsyncStudentService.add_student("ada", "pw", "REG2", "A", "B", "2023-09-01", "CS", rounds=4)
+            updated = await AsyncStudentService.update_student("REG1", last_name="Byron")
+            self.assertEqual((updated[4], updated[6]), ("Byron", "CS"))
+            self.assertEqual([row[1] for row in await AsyncStudentService.search_students("byron")], ["REG1"])
+            self.assertEqual(len(await AsyncStudentService.list_students(major="CS")), 1)
+
+            course = await AsyncCourseService.add_course("CS101", "Intro", 3, 30)
+            self.assertEqual(course[1], "CS101")
+            course = await AsyncCourseService.update_course("CS101", title="Introduction")
+            self.assertEqual((course[2], course[3]), ("Introduction", 3))
+            self.assertEqual([row[0] for row in await AsyncCourseService.list_courses()], ["CS101"])
+            self.assertEqual(len(await AsyncReportingService.course_statistics(course_code="CS101")), 1)
+            transcript = await AsyncStudentService.get_transcript("REG1")
+            self.assertEqual(transcript.name, "Ada Byron")
+            with self.assertRaises(LookupError):
+                await AsyncStudentService.get_transcript("NOBODY")
+
+        self.run_async(scenario)
+
+    def test_work_runs_off_the_event_loop(self):
+        threads = {}
+
+        def record(kind):
+            def wrapped(*args, **kwargs):
+                threads[kind] = threading.current_thread().name
+                time.sleep(0.05)
+                return kind
+            return wrapped
+
+        async def scenario(runtime):
+            loop_thread = threading.current_thread().name
+            with mock.patch.object(aio.User, "find_by_username", record("db")), \
+                    mock.patch.object(aio, "hash_password", record("hash")):
+                ticks = 0
+
+                async def ticker():
+                    nonlocal ticks
+                    while True:
+                        ticks += 1
+                        await asyncio.sleep(0.005)
+
+                task = asyncio.create_task(ticker())
+                await runtime.run_db(aio.User.find_by_username, "bob")
+                await runtime.run_hash(aio.hash_password, "pw")
+                task.cancel()
+            self.assertTrue(threads["db"].startswith("aio-db"))
+            self.assertTrue(threads["hash"].startswith("aio-bcrypt"))
+            self.assertNotEqual(threads["db"], loop_thread)
+            self.assertGreater(ticks, 5)
+
+        self.run_async(scenario)
+
+    def test_concurrent_logins(self):
+        async def scenario(runtime):
+            await AsyncAuthenticationService.register_user("carol", "pw", rounds=4)
+            sessions = await asyncio.gather(*(AsyncAuthenticationService.login("carol", "pw") for _ in range(20)))
+            self.assertEqual(len({session.token for session in sessions}), 20)
+
+        self.run_async(scenario)
+
+    def test_db_workers_capped_at_pool_size(self):
+        runtime = AsyncRuntime(db_workers=32)
+        self.assertEqual(runtime.db_workers, 4)
+        runtime.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+import contextlib
+import http.client
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from app.api import create_server
+from app.database import configure_pool, transaction, DB_NAME
+from app.instrumentation import query_monitor
+from app.models import Instructor, User
+from app.utils import hash_password
+
+
+class TestApi(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.server = create_server(port=0, workers=4, db_name=os.path.join(cls.tmpdir.name, "test.db"), quiet=True)
+        password_hash = hash_password("secret", rounds=4)
+        with transaction():
+            User("admin", password_hash, "admin").create()
+            teacher = User("teacher", password_hash, "instructor")
+            teacher.create()
+            Instructor(teacher.cursor.lastrowid, "S1", "Alan", "Turing", "2020-01-01").create()
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.admin = cls.login("admin", "secret")
+        cls.teacher = cls.login("teacher", "secret")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        configure_pool(DB_NAME)
+        cls.tmpdir.cleanup()
+
+    @classmethod
+    def call(cls, method, path, body=None, token=None):
+        connection = http.client.HTTPConnection(*cls.server.server_address, timeout=10)
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = connection.getresponse()
+        payload = json.loads(response.read())
+        connection.close()
+        return response.status, payload
+
+    @classmethod
+    def login(cls, username, password):
+        status, payload = cls.call("POST", "/login", {"username": username, "password": password})
+        assert status == 200, payload
+        return payload["token"]
+
+    def create_student(self, reg_no, last_name="Lovelace", major="CS"):
+        return self.call("POST", "/students", {
+            "username": reg_no.lower(), "password": "pw", "reg_no": reg_no, "first_name": "Ada",
+            "last_name": last_name, "admission_date": "2023-09-01", "major": major,
+        }, self.admin)
+
+    def test_login_and_auth_errors(self):
+        self.assertEqual(self.call("POST", "/login", {"username": "admin", "password": "wrong"})[0], 401)
+        self.assertEqual(self.call("GET", "/students")[0], 401)
+        self.assertEqual(self.call("GET", "/students", token="bogus")[0], 401)
+        self.assertEqual(self.call("GET", "/students", token=self.teacher)[0], 403)
+        self.assertEqual(self.call("GET", "/nowhere", token=self.admin)[0], 404)
+        self.assertEqual(self.call("DELETE", "/students", token=self.admin)[0], 405)
+        self.assertEqual(self.call("POST", "/students", {"username": "x"}, self.admin)[0], 400)
+
+    def test_logout(self):
+        token = self.login("admin", "secret")
+        self.assertEqual(self.call("POST", "/logout", token=token)[0], 200)
+        self.assertEqual(self.call("GET", "/students", token=token)[0], 401)
+
+    def test_student_crud_and_paging(self):
+        for i in range(5):
+            self.assertEqual(self.create_student(f"PAGE{i}", major="Paging")[0], 201)
+        self.assertEqual(self.create_student("PAGE0")[0], 409)
+
+        status, page = self.call("GET", "/students?major=Paging&limit=3", token=self.admin)
+        self.assertEqual([s["reg_no"] for s in page["students"]], ["PAGE0", "PAGE1", "PAGE2"])
+        status, page = self.call("GET", f"/students?major=Paging&limit=3&after={page['next_after']}", token=self.admin)
+        self.assertEqual([s["reg_no"] for s in page["students"]], ["PAGE3", "PAGE4"])
+        self.assertIsNone(page["next_after"])
+
+        status, student = self.call("PUT", "/students/PAGE1", {"last_name": "Byron"}, self.admin)
+        self.assertEqual((student["last_name"], student["major"]), ("Byron", "Paging"))
+        status, found = self.call("GET", "/students/search?q=byron", token=self.admin)
+        self.assertEqual([s["reg_no"] for s in found["students"]], ["PAGE1"])
+        self.assertEqual(self.call("DELETE", "/students/PAGE1", token=self.admin)[0], 200)
+        self.assertEqual(self.call("GET", "/students/PAGE1", token=self.admin)[0], 404)
+
+    def test_students_see_only_themselves(self):
+        self.create_student("SELF1")
+        self.create_student("SELF2")
+        token = self.login("self1", "pw")
+        self.assertEqual(self.call("GET", "/students/SELF1", token=token)[0], 200)
+        self.assertEqual(self.call("GET", "/students/SELF2", token=token)[0], 403)
+        self.assertEqual(self.call("GET", "/students/SELF1/transcript", token=token)[0], 200)
+
+    def test_enroll_grade_and_report(self):
+        for reg_no in ("FLOW1", "FLOW2"):
+            self.create_student(reg_no, major="Flow")
+        status, course = self.call("POST", "/courses", {
+            "course_code": "FLOW101", "title": "Flow", "credits": 3, "max_enrollment": 10, "instructor_id": 1,
+        }, self.admin)
+        self.assertEqual((status, course["instructor_id"]), (201, 1))
+
+        status, summary = self.call("POST", "/enrollments", {
+            "reg_nos": ["FLOW1", "FLOW2"], "course_codes": ["FLOW101"], "year": 2024, "semester": "Fall",
+        }, self.admin)
+        self.assertEqual((status, summary["enrolled"]), (200, 2))
+        status, missing = self.call("POST", "/enrollments", {
+            "reg_nos": ["NOBODY"], "course_codes": ["FLOW101"], "year": 2024, "semester": "Fall",
+        }, self.admin)
+        self.assertEqual(status, 404)
+
+        status, result = self.call("POST", "/grades", {
+            "rows": [["FLOW1", "FLOW101", 80], ["FLOW2", "FLOW101", 60], ["NOBODY", "FLOW101", 50]],
+        }, self.teacher)
+        self.assertEqual((status, result["imported"], len(result["rejects"])), (200, 2, 1))
+        self.assertEqual(self.call("POST", "/grades", {"rows": []}, self.admin)[0], 403)
+
+        status, report = self.call("GET", "/reports/courses/FLOW101", token=self.teacher)
+        self.assertEqual((report["statistics"][0]["graded"], report["statistics"][0]["mean"]), (2, 70))
+        status, transcript = self.call("GET", "/students/FLOW1/transcript", token=self.admin)
+        self.assertEqual(transcript["courses"][0]["mark"], 80)
+        status, cohort = self.call("GET", "/reports/cohort?major=Flow", token=self.admin)
+        self.assertEqual([s["reg_no"] for s in cohort["standings"]], ["FLOW1", "FLOW2"])
+        status, workloads = self.call("GET", "/reports/instructors", token=self.admin)
+        self.assertEqual(workloads["instructors"][0]["students"], 2)
+
+    def test_grades_rejected_for_another_instructors_course(self):
+        self.create_student("OTHER1", major="Other")
+        self.call("POST", "/courses", {"course_code": "OTHER101", "title": "Other", "credits": 3,
+                                       "max_enrollment": 10}, self.admin)
+        self.call("POST", "/enrollments", {
+            "reg_nos": ["OTHER1"], "course_codes": ["OTHER101"], "year": 2024, "semester": "Fall",
+        }, self.admin)
+
+        status, result = self.call("POST", "/grades", {"rows": [["OTHER1", "OTHER101", 90]]}, self.teacher)
+        self.assertEqual((status, result["imported"]), (200, 0))
+        self.assertEqual(result["rejects"], [{"line": 1, "reason": "OTHER101 is not your course."}])
+        status, transcript = self.call("GET", "/students/OTHER1/transcript", token=self.admin)
+        self.assertIsNone(transcript["courses"][0]["mark"])
+
+    def test_course_paging(self):
+        for i in range(5):
+            self.call("POST", "/courses", {"course_code": f"PAGE{i}", "title": "Paged", "credits": 3,
+                                           "max_enrollment": 5}, self.admin)
+        status, everything = self.call("GET", "/courses?limit=1000", token=self.admin)
+        self.assertIsNone(everything["next_after"])
+
+        codes, after = [], None
+        while True:
+            path = "/courses?limit=2" + (f"&after={after}" if after is not None else "")
+            status, page = self.call("GET", path, token=self.teacher)
+            self.assertLessEqual(len(page["courses"]), 2)
+            codes.extend(course["course_code"] for course in page["courses"])
+            after = page["next_after"]
+            if after is None:
+                break
+        self.assertEqual(codes, [course["course_code"] for course in everything["courses"]])
+        self.assertTrue({f"PAGE{i}" for i in range(5)} <= set(codes))
+        self.assertEqual(self.call("GET", "/courses?after=x", token=self.teacher)[0], 400)
+
+    def test_course_update_and_delete(self):
+        self.call("POST", "/courses", {"course_code": "UPD1", "title": "Old", "credits": 3, "max_enrollment": 5},
+                  self.admin)
+        status, course = self.call("PUT", "/courses/UPD1", {"title": "New"}, self.admin)
+        self.assertEqual((course["title"], course["credits"]), ("New", 3))
+        status, courses = self.call("GET", "/courses/search?q=new", token=self.teacher)
+        self.assertIn("UPD1", [c["course_code"] for c in courses["courses"]])
+        self.assertEqual(self.call("DELETE", "/courses/UPD1", token=self.admin)[0], 200)
+        self.assertEqual(self.call("GET", "/courses/UPD1", token=self.admin)[0], 404)
+
+    def test_query_stats_endpoints(self):
+        self.assertEqual(self.call("GET", "/admin/queries", token=self.teacher)[0], 403)
+        query_monitor.enable()
+        try:
+            self.call("GET", "/courses", token=self.admin)
+            status, payload = self.call("GET", "/admin/queries", token=self.admin)
+            self.assertEqual(status, 200)
+            self.assertTrue(payload["enabled"])
+            self.assertTrue(any("FROM Courses" in query["query"] for query in payload["queries"]))
+
+            connection = http.client.HTTPConnection(*self.server.server_address, timeout=10)
+            connection.request("GET", "/metrics", headers={"Authorization": f"Bearer {self.admin}"})
+            response = connection.getresponse()
+            text = response.read().decode()
+            connection.close()
+            self.assertEqual(response.status, 200)
+            self.assertTrue(response.getheader("Content-Type").startswith("text/plain"))
+            self.assertIn("student_db_query_duration_seconds_count", text)
+        finally:
+            query_monitor.disable()
+            query_monitor.reset()
+
+    def test_concurrent_requests(self):
+        results = []
+
+        def client():
+            for _ in range(10):
+                results.append(self.call("GET", "/courses", token=self.admin)[0])
+
+        threads = [threading.Thread(target=client) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [200] * 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
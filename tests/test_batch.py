@@ -0,0 +1,110 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from app.batch import BatchError, load_script, run_script
+from app.database import configure_pool, initialize_db, DB_NAME
+from app.models import Course, Enrollment, Instructor, Student, User
+
+SCRIPT = [
+    {"op": "add_instructor", "username": "turing", "password": "pw", "staff_no": "S1",
+     "first_name": "Alan", "last_name": "Turing", "hire_date": "2020-01-01"},
+    {"op": "add_course", "course_code": "CS101", "title": "Intro", "credits": 3, "max_enrollment": 10, "staff_no": "S1"},
+    {"op": "add_student", "username": "ada", "password": "pw", "reg_no": "REG1", "first_name": "Ada",
+     "last_name": "Lovelace", "admission_date": "2023-09-01", "major": "CS"},
+    {"op": "add_student", "username": "bob", "password": "pw", "reg_no": "REG2", "first_name": "Bob",
+     "last_name": "Smith", "admission_date": "2023-09-01", "major": "CS"},
+    {"op": "enroll", "course_codes": ["CS101"], "year": 2024, "semester": "Fall", "major": "CS"},
+    {"op": "submit_grades", "staff_no": "S1", "rows": [["REG1", "CS101", 82], ["REG2", "CS101", 64]]},
+    {"op": "report", "kind": "course_statistics", "course_code": "CS101"},
+]
+
+
+def numbered(operations):
+    return list(enumerate([dict(operation) for operation in operations], start=1))
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as script:
+            script.write(text)
+        return path
+
+    def test_full_script(self):
+        result = run_script(numbered(SCRIPT), hash_rounds=4)
+        self.assertEqual((result.succeeded, result.failures), (7, []))
+        line, name, rows = result.outputs[-1]
+        self.assertEqual((line, name, rows[0]["graded"], rows[0]["mean"]), (7, "report", 2, 73))
+        self.assertEqual(result.outputs[4][2], "2 requested, 2 enrolled, 0 duplicate, 0 over_capacity, 0 unavailable")
+        self.assertEqual(User.find_by_username("ada")[3], "student")
+        self.assertEqual(Instructor.find_by_staff_no("S1")[2], "S1")
+        self.assertEqual(set(result.timings), {"add_instructor", "add_course", "add_student", "enroll",
+                                               "submit_grades", "report", "(password hashing)"})
+        self.assertEqual(len(result.timings["add_student"]), 2)
+        self.assertIn("add_student", "\n".join(result.summary()))
+
+    def test_dry_run_changes_nothing(self):
+        result = run_script(numbered(SCRIPT), dry_run=True, hash_rounds=4)
+        self.assertEqual(result.succeeded, 7)
+        self.assertEqual(result.outputs[-1][2][0]["graded"], 2)
+        self.assertIsNone(User.find_by_username("ada"))
+        self.assertIsNone(Course.find_by_course_code("CS101"))
+
+    def test_dry_run_batches_see_earlier_batches(self):
+        result = run_script(numbered(SCRIPT), dry_run=True, batch_size=1, hash_rounds=4)
+        self.assertEqual((result.succeeded, result.failures), (7, []))
+        self.assertEqual(result.outputs[-1][2][0]["graded"], 2)
+        self.assertIsNone(User.find_by_username("ada"))
+        self.assertIsNone(Course.find_by_course_code("CS101"))
+
+    def test_failure_stops_and_rolls_back_batch(self):
+        script = SCRIPT[:2] + [{"op": "add_course", "course_code": "CS101", "title": "Dup", "credits": 3,
+                                "max_enrollment": 5}] + SCRIPT[2:3]
+        result = run_script(numbered(script), batch_size=1, hash_rounds=4)
+        self.assertEqual(result.succeeded, 2)
+        self.assertEqual([(line, name) for line, name, _ in result.failures], [(3, "add_course")])
+        self.assertEqual(result.rolled_back_from, 3)
+        self.assertIsNotNone(Course.find_by_course_code("CS101"))
+        self.assertIsNone(Student.find_by_reg_no("REG1"))
+
+        configure_pool(os.path.join(self.tmpdir.name, "other.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        result = run_script(numbered(script), hash_rounds=4)
+        self.assertIsNone(Course.find_by_course_code("CS101"))
+
+    def test_keep_going_skips_failed_operation(self):
+        script = SCRIPT[:2] + [{"op": "enroll", "course_codes": ["NOPE"], "year": 2024, "semester": "Fall"}] + SCRIPT[2:5]
+        result = run_script(numbered(script), keep_going=True, hash_rounds=4)
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn("NOPE", result.failures[0][2])
+        self.assertEqual(result.succeeded, 5)
+        self.assertEqual(len(Enrollment.get_enrollment_statistics_for_course("CS101")), 1)
+
+    def test_load_json_lines_and_yaml(self):
+        path = self.write("script.jsonl", "# setup\n\n" + "\n".join(json.dumps(op) for op in SCRIPT[:2]))
+        self.assertEqual([line for line, _ in load_script(path)], [3, 4])
+        path = self.write("script.yaml", "- op: add_course\n  course_code: CS1\n  title: T\n  credits: 3\n"
+                                         "  max_enrollment: 5\n- op: report\n  kind: instructor_workloads\n")
+        self.assertEqual([op["op"] for _, op in load_script(path)], ["add_course", "report"])
+        with self.assertRaises(BatchError):
+            load_script(self.write("bad.jsonl", '{"op": "drop_everything"}\n'))
+        with self.assertRaises(BatchError):
+            load_script(self.write("bad2.jsonl", '{"op": \n'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from benchmarks.suite import CASES, compare, run_suite, write_json
+from app.cache import report_cache
+from app.database import get_pool, DB_NAME
+
+TINY_SCALE = {"students": 60, "courses": 5, "courses_per_student": 2}
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.document = run_suite({"tiny": TINY_SCALE}, repeat=2, hash_rounds=4)
+
+    def test_every_case_runs_at_every_scale(self):
+        results = self.document["results"]["tiny"]
+        self.assertEqual(set(results), set(CASES))
+        for name, result in results.items():
+            self.assertEqual(result["repeat"], 2, name)
+            self.assertGreater(result["ops"], 0, name)
+            self.assertLessEqual(result["min_s"], result["median_s"], name)
+        self.assertEqual(results["bulk.import_students"]["ops"], 1000)
+        self.assertEqual(results["student.find_all"]["ops"], TINY_SCALE["students"])
+
+    def test_cases_bypass_report_cache(self):
+        # A cached case would time a dict lookup after its first run, not the query.
+        with mock.patch.object(report_cache, "get_or_compute", wraps=report_cache.get_or_compute) as lookups:
+            run_suite({"tiny": TINY_SCALE}, repeat=2, hash_rounds=4)
+        lookups.assert_not_called()
+
+    def test_pool_is_restored(self):
+        self.assertEqual(get_pool().db_name, DB_NAME)
+
+    def test_results_round_trip_as_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "results", "latest.json")
+            write_json(path, self.document)
+            with open(path, encoding="utf-8") as results_file:
+                self.assertEqual(json.load(results_file), self.document)
+
+    def test_compare_flags_slowdowns_beyond_threshold(self):
+        current = copy.deepcopy(self.document)
+        case = current["results"]["tiny"]["course.find_all"]
+        case["median_s"] *= 2
+        rows = {(scale, name): row for scale, name, *row in compare(current, self.document, threshold=0.25)}
+        baseline_s, current_s, ratio, regressed = rows[("tiny", "course.find_all")]
+        self.assertAlmostEqual(ratio, 2.0)
+        self.assertTrue(regressed)
+        self.assertFalse(rows[("tiny", "user.find_by_username")][3])
+
+    def test_compare_skips_cases_missing_from_baseline(self):
+        baseline = copy.deepcopy(self.document)
+        del baseline["results"]["tiny"]["auth.login"]
+        names = [name for _, name, *_ in compare(self.document, baseline)]
+        self.assertNotIn("auth.login", names)
+        self.assertEqual(compare(self.document, {}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from app.database import configure_pool, initialize_db, get_connection, DB_NAME
+from app.models import Student, Course, Enrollment
+from app.services import EnrollmentService
+
+
+class TestBulkEnrollment(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        for i in range(6):
+            major = "CS" if i < 4 else "Math"
+            Student(None, f"REG{i}", "First", "Last", f"{2023 if i % 2 else 2024}-09-01", major, "active").create()
+        Course("CS101", "Intro", 3, 3, None, "active").create()
+        Course("CS102", "Data", 3, 10, None, "active").create()
+        Course("OLD100", "Retired", 3, 10, None, "inactive").create()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def course_id(self, course_code):
+        connection = get_connection()
+        course_id = connection.execute(
+            "SELECT course_id FROM Courses WHERE course_code = ?", (course_code,)
+        ).fetchone()[0]
+        connection.close()
+        return course_id
+
+    def enrolled_in(self, course_code):
+        connection = get_connection()
+        count = connection.execute(
+            "SELECT COUNT(*) FROM Enrollments WHERE course_id = ?", (self.course_id(course_code),)
+        ).fetchone()[0]
+        connection.close()
+        return count
+
+    def test_capacity_and_duplicates(self):
+        students = Student.find_ids_by_cohort()
+        courses = [self.course_id("CS101"), self.course_id("CS102")]
+        Enrollment(None, 2024, "Fall", students[0], courses[1], "enrolled").create()
+
+        summary = Enrollment.bulk_enroll(students, courses, 2024, "Fall", batch_size=4)
+
+        self.assertEqual(summary['requested'], 12)
+        self.assertEqual(summary['duplicate'], 1)
+        self.assertEqual(summary['enrolled'], 3 + 5)
+        self.assertEqual(summary['over_capacity'], 3)
+        self.assertEqual(self.enrolled_in("CS101"), 3)
+        self.assertEqual(self.enrolled_in("CS102"), 6)
+
+    def test_rerun_is_all_duplicates(self):
+        students = Student.find_ids_by_cohort(major="Math")
+        courses = [self.course_id("CS102")]
+        Enrollment.bulk_enroll(students, courses, 2024, "Fall")
+        summary = Enrollment.bulk_enroll(students, courses, 2024, "Fall")
+        self.assertEqual(summary['enrolled'], 0)
+        self.assertEqual(summary['duplicate'], 2)
+
+    def test_withdrawn_enrollments_free_capacity(self):
+        students = Student.find_ids_by_cohort()
+        course = self.course_id("CS101")
+        Enrollment(None, 2024, "Fall", students[0], course, "withdrawn").create()
+        summary = Enrollment.bulk_enroll(students[1:], [course], 2024, "Fall")
+        self.assertEqual(summary['enrolled'], 3)
+
+    def test_inactive_course_is_unavailable(self):
+        students = Student.find_ids_by_cohort()
+        summary = Enrollment.bulk_enroll(students, [self.course_id("OLD100")], 2024, "Fall")
+        self.assertEqual(summary['unavailable'], 6)
+        self.assertEqual(summary['enrolled'], 0)
+
+    def test_enroll_cohort_by_major_and_year(self):
+        self.assertEqual(len(Student.find_ids_by_cohort(major="CS", admission_year=2024)), 2)
+        summary = EnrollmentService.enroll_cohort(["CS102"], 2024, "Fall", major="CS", admission_year=2024)
+        self.assertEqual(summary['enrolled'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from app.bulk_import import import_students, import_students_csv
+from app.database import configure_pool, initialize_db, DB_NAME
+from app.models import User, Student
+from app.services import AuthenticationService
+from app.utils import hash_passwords, verify_password
+
+HEADER = "username,password_hash,reg_no,first_name,last_name,admission_date,major,status\n"
+
+
+class TestBulkImport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def write_csv(self, lines):
+        path = os.path.join(self.tmpdir.name, "students.csv")
+        with open(path, "w", encoding="utf-8") as csv_file:
+            csv_file.write(HEADER + "".join(line + "\n" for line in lines))
+        return path
+
+    def test_imports_in_chunks(self):
+        lines = [f"user{i},hash,REG{i:04},First{i},Last{i},2024-09-01,CS,active" for i in range(25)]
+        chunks = []
+        result = import_students_csv(self.write_csv(lines), chunk_size=10, progress=lambda r: chunks.append(r.rows))
+        self.assertEqual(result.imported, 25)
+        self.assertEqual(result.rejects, [])
+        self.assertEqual(chunks, [10, 20, 25])
+        student = Student.find_by_reg_no("REG0007")
+        user = User.find_by_username("user7")
+        self.assertEqual(student[1], user[0])
+
+    def test_rejects_invalid_rows(self):
+        User("taken", "hash", "student").create()
+        lines = [
+            "ok1,hash,REG1,Ada,Lovelace,2024-09-01,CS,",
+            "ok2,hash,REG2,,Hopper,2024-09-01,CS,active",
+            "ok3,hash,REG3,Alan,Turing,2024-09-01,CS,expelled",
+            "ok1,hash,REG4,Dup,User,2024-09-01,CS,active",
+            "taken,hash,REG5,Taken,User,2024-09-01,CS,active",
+        ]
+        result = import_students_csv(self.write_csv(lines), chunk_size=100)
+        self.assertEqual(result.imported, 1)
+        self.assertEqual([line for line, _ in result.rejects], [3, 4, 5, 6])
+        self.assertEqual(Student.find_by_reg_no("REG1")[7], "active")
+
+    def test_accepts_any_iterable(self):
+        rows = iter([{
+            'username': 'gen', 'password': 'secret', 'reg_no': 'REG9', 'first_name': 'Gen',
+            'last_name': 'Erator', 'admission_date': '2024-09-01', 'major': 'Math',
+        }])
+        result = import_students(rows, hash_rounds=4, hash_workers=1)
+        self.assertEqual(result.imported, 1)
+        self.assertNotEqual(User.find_by_username('gen')[2], 'secret')
+
+
+class TestPasswordHashing(unittest.TestCase):
+    def test_process_pool_keeps_order(self):
+        passwords = [f"pw{i}" for i in range(6)]
+        hashes = hash_passwords(passwords, rounds=4, workers=2)
+        self.assertTrue(all(verify_password(p, h) for p, h in zip(passwords, hashes)))
+
+    def test_thread_pool_keeps_order(self):
+        passwords = [f"pw{i}" for i in range(6)]
+        hashes = hash_passwords(passwords, rounds=4, workers=3, use_threads=True)
+        self.assertTrue(all(verify_password(p, h) for p, h in zip(passwords, hashes)))
+
+    def test_cost_factor(self):
+        self.assertTrue(hash_passwords(["pw"], rounds=5)[0].startswith("$2b$05$"))
+
+
+class TestRegisterUsers(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_register_users_skips_existing(self):
+        User("existing", "hash", "student").create()
+        accounts = [("existing", "pw"), ("new1", "pw1"), ("new2", "pw2")]
+        created = AuthenticationService.register_users(accounts, role="instructor", rounds=4, workers=2)
+        self.assertEqual(created, 2)
+        user = User.find_by_username("new2")
+        self.assertEqual(user[3], "instructor")
+        self.assertTrue(verify_password("pw2", user[2]))
+
+    def test_register_users_skips_duplicates_in_batch(self):
+        accounts = [("dup", "first"), ("other", "pw"), ("dup", "second")]
+        created = AuthenticationService.register_users(accounts, rounds=4, workers=2, use_threads=True)
+        self.assertEqual(created, 2)
+        self.assertTrue(verify_password("first", User.find_by_username("dup")[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from app.cache import ResultCache, cached_report, get_cache_stats, report_cache
+from app.database import configure_pool, get_connection, initialize_db, transaction, DB_NAME
+from app.models import Course
+from app.reports import course_statistics
+
+
+@cached_report
+def list_courses():
+    connection = get_connection()
+    try:
+        return connection.execute("SELECT course_code FROM Courses ORDER BY course_code").fetchall()
+    finally:
+        connection.close()
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        configure_pool(self.db_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        Course("CS101", "Intro", 3, 30, None, "active").create()
+        report_cache.clear()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_repeated_report_is_served_from_cache(self):
+        before = get_cache_stats()
+        first = course_statistics(course_code="CS101")
+        with mock.patch("app.reports.get_connection") as get_connection:
+            second = course_statistics(course_code="CS101")
+        get_connection.assert_not_called()
+        self.assertEqual(first, second)
+        stats = get_cache_stats()
+        self.assertEqual(stats['hits'] - before['hits'], 1)
+        self.assertEqual(stats['misses'] - before['misses'], 1)
+
+    def test_model_write_invalidates(self):
+        self.assertEqual(len(list_courses()), 1)
+        Course("CS102", "Data", 3, 30, None, "active").create()
+        self.assertEqual(len(list_courses()), 2)
+
+    def test_transaction_commit_invalidates(self):
+        self.assertEqual(len(list_courses()), 1)
+        with transaction():
+            Course("CS102", "Data", 3, 30, None, "active").create()
+            Course("CS103", "Algorithms", 3, 30, None, "active").create()
+        self.assertEqual(len(list_courses()), 3)
+
+    def test_uncommitted_writes_bypass_cache(self):
+        self.assertEqual(len(list_courses()), 1)
+        bypassed = get_cache_stats()['bypassed']
+        with transaction():
+            Course("CS102", "Data", 3, 30, None, "active").create()
+            self.assertEqual(len(list_courses()), 2)
+        self.assertEqual(get_cache_stats()['bypassed'], bypassed + 1)
+
+    def test_external_write_invalidates(self):
+        self.assertEqual(len(list_courses()), 1)
+        other = sqlite3.connect(self.db_path)
+        other.execute("INSERT INTO Courses (course_code, title, credits, max_enrollment, status) "
+                      "VALUES ('CS102', 'Data', 3, 30, 'active')")
+        other.commit()
+        other.close()
+        self.assertEqual(len(list_courses()), 2)
+
+    def test_readers_on_other_connections_do_not_invalidate(self):
+        list_courses()
+        barrier = threading.Barrier(4)
+        before = get_cache_stats()
+
+        def read():
+            # Hold a connection so the four readers use different pooled connections.
+            connection = get_connection()
+            try:
+                barrier.wait()
+                for _ in range(5):
+                    list_courses()
+                    Course.find_all()
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(get_cache_stats()['invalidations'], before['invalidations'])
+
+    def test_read_only_connection_block_keeps_cache(self):
+        list_courses()
+        connection = get_connection()
+        with connection:
+            connection.execute("SELECT COUNT(*) FROM Courses").fetchone()
+        connection.close()
+        with mock.patch(f"{__name__}.get_connection", side_effect=AssertionError):
+            self.assertEqual(len(list_courses()), 1)
+
+    def test_callers_cannot_mutate_cached_lists(self):
+        list_courses().clear()
+        self.assertEqual(len(list_courses()), 1)
+
+    def test_lru_eviction(self):
+        small = ResultCache(max_entries=2)
+        for key in ("a", "b", "a", "c"):
+            small.get_or_compute(key, lambda: key.upper())
+        calls = []
+        small.get_or_compute("b", lambda: calls.append("b"))
+        small.get_or_compute("a", lambda: calls.append("a"))
+        self.assertEqual(calls, ["b", "a"])
+        stats = small.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['evictions'], 3)
+
+    def test_unhashable_arguments_bypass_cache(self):
+        calls = []
+
+        @cached_report
+        def report(values):
+            calls.append(values)
+            return sum(values)
+
+        self.assertEqual(report([1, 2]), 3)
+        self.assertEqual(report([1, 2]), 3)
+        self.assertEqual(len(calls), 2)
+
+    def test_reconfigured_pool_does_not_reuse_results(self):
+        self.assertEqual(len(list_courses()), 1)
+        configure_pool(os.path.join(self.tmpdir.name, "other.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        self.assertEqual(list_courses(), [])
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            ResultCache(max_entries=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
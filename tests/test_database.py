@@ -0,0 +1,292 @@
+import os
+import tempfile
+import threading
+import unittest
+import contextlib
+import io
+import sqlite3
+from unittest import mock
+from app.database import (
+    ConnectionPool, configure_pool, get_connection, get_pool, get_pool_stats, get_profile_name, initialize_db,
+    transaction, DB_NAME, PROFILE_ENV_VAR
+)
+from app.models import User, Student, BaseModel
+from app.services import StudentService
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        self.pool = ConnectionPool(self.db_path, max_size=2, timeout=0.5)
+
+    def tearDown(self):
+        self.pool.close_all()
+        self.tmpdir.cleanup()
+
+    def test_same_thread_shares_connection(self):
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+        self.assertIs(first.raw, second.raw)
+        second.close()
+        first.close()
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['idle'], 1)
+
+    def test_connection_reused_after_return(self):
+        first = self.pool.checkout()
+        raw = first.raw
+        first.close()
+        second = self.pool.checkout()
+        self.assertIs(second.raw, raw)
+        second.close()
+        self.assertEqual(self.pool.get_stats()['misses'], 1)
+
+    def test_waits_when_pool_is_exhausted(self):
+        held = self.pool.checkout()
+        results = []
+        ready = threading.Event()
+        done = threading.Event()
+
+        def worker():
+            connection = self.pool.checkout()
+            results.append(connection.raw)
+            ready.set()
+            done.wait()
+            connection.close()
+
+        other = threading.Thread(target=worker)
+        other.start()
+        ready.wait(2)
+
+        blocked = threading.Thread(target=lambda: results.append(self.pool.checkout().raw))
+        blocked.start()
+        held.close()
+        blocked.join(2)
+        done.set()
+        other.join(2)
+
+        self.assertEqual(len(results), 2)
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['waits'], 1)
+        self.assertLessEqual(stats['size'], 2)
+
+    def test_release_from_another_thread_never_shares_connection(self):
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+        raw = first.raw
+
+        def in_thread(function):
+            results = []
+            thread = threading.Thread(target=lambda: results.append(function()))
+            thread.start()
+            thread.join(2)
+            return results[0]
+
+        # One of two handles closed elsewhere: the owner still holds the connection.
+        in_thread(first.close)
+        self.assertEqual(self.pool.get_stats()['idle'], 0)
+        other = in_thread(self.pool.checkout)
+        self.assertIsNot(other.raw, raw)
+        other.close()
+
+        # The last handle closed elsewhere: the connection is returned and the
+        # owner's binding cleared, so the owner can't keep using it alongside
+        # the thread that checks it out next.
+        in_thread(second.close)
+        taken = []
+        ready = threading.Event()
+        done = threading.Event()
+
+        def holder():
+            connection = self.pool.checkout()
+            taken.append(connection.raw)
+            ready.set()
+            done.wait(2)
+            connection.close()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        ready.wait(2)
+        mine = self.pool.checkout()
+        self.assertIsNot(mine.raw, taken[0])
+        mine.close()
+        done.set()
+        thread.join(2)
+
+
+class TestPooledModels(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        initialize_db()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_finders_reuse_pooled_connection(self):
+        user = User("pool_user", "hash", "student")
+        user.create()
+        user.close()
+        for _ in range(5):
+            self.assertIsNotNone(User.find_by_username("pool_user"))
+        self.assertEqual(get_pool_stats()['misses'], 1)
+
+    def test_base_model_close_returns_connection(self):
+        base = BaseModel()
+        base.close()
+        self.assertEqual(get_pool_stats()['idle'], 1)
+
+
+class TestPerformanceProfiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def pragmas(self, profile):
+        pool = ConnectionPool(self.db_path, profile=profile)
+        connection = pool.checkout()
+        values = {
+            name: connection.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ('journal_mode', 'synchronous', 'cache_size', 'temp_store', 'busy_timeout')
+        }
+        connection.close()
+        pool.close_all()
+        return values
+
+    def test_durable_profile(self):
+        values = self.pragmas('durable')
+        self.assertEqual(values['journal_mode'], 'wal')
+        self.assertEqual(values['synchronous'], 2)
+
+    def test_throughput_profile(self):
+        values = self.pragmas('throughput')
+        self.assertEqual(values['journal_mode'], 'wal')
+        self.assertEqual(values['synchronous'], 0)
+        self.assertEqual(values['cache_size'], -64000)
+        self.assertEqual(values['temp_store'], 2)
+        self.assertEqual(values['busy_timeout'], 10000)
+
+    def test_profile_from_environment(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: 'durable'}):
+            self.assertEqual(get_profile_name(), 'durable')
+            self.assertEqual(get_profile_name('throughput'), 'throughput')
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            get_profile_name('reckless')
+
+    def test_initialize_db_with_profile(self):
+        configure_pool(self.db_path)
+        try:
+            initialize_db(profile='throughput')
+            self.assertEqual(get_pool_stats()['misses'], 1)
+            self.assertEqual(get_pool().profile, 'throughput')
+        finally:
+            configure_pool(DB_NAME)
+
+
+class TestTransactions(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        configure_pool(self.db_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def count(self, table):
+        connection = sqlite3.connect(self.db_path)
+        total = connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        connection.close()
+        return total
+
+    def test_writes_commit_once_at_end(self):
+        with transaction():
+            user = User("uow_user", "hash", "student")
+            user.create()
+            self.assertEqual(self.count("Users"), 0)
+            Student(user.cursor.lastrowid, "REG100", "Ada", "Lovelace", "2024-01-01", "CS", "active").create()
+        self.assertEqual(self.count("Users"), 1)
+        self.assertEqual(self.count("Students"), 1)
+
+    def test_failure_rolls_back_every_write(self):
+        with self.assertRaises(ValueError):
+            with transaction():
+                User("uow_user", "hash", "student").create()
+                Student(1, "REG100", "", "Lovelace", "2024-01-01", "CS", "active").create()
+        self.assertEqual(self.count("Users"), 0)
+        self.assertIsNone(User.find_by_username("uow_user"))
+
+    def test_nested_block_rolls_back_to_savepoint(self):
+        with transaction():
+            User("outer_user", "hash", "student").create()
+            with self.assertRaises(sqlite3.IntegrityError):
+                with transaction():
+                    User("inner_user", "hash", "student").create()
+                    User("inner_user", "hash", "student").create()
+        self.assertIsNotNone(User.find_by_username("outer_user"))
+        self.assertIsNone(User.find_by_username("inner_user"))
+
+    def test_static_writes_participate(self):
+        Student(None, "REG100", "Ada", "Lovelace", "2024-01-01", "CS", "active").create()
+        with self.assertRaises(RuntimeError):
+            with transaction():
+                Student.delete("REG100")
+                raise RuntimeError("abort")
+        self.assertIsNotNone(Student.find_by_reg_no("REG100"))
+
+    def test_connection_block_inside_transaction_does_not_commit(self):
+        with self.assertRaises(RuntimeError):
+            with transaction():
+                connection = get_connection()
+                with connection as raw:
+                    raw.execute("INSERT INTO Users (username, password_hash, role) VALUES ('inner', 'h', 'student')")
+                connection.close()
+                self.assertEqual(self.count("Users"), 0)
+                raise RuntimeError("abort")
+        self.assertIsNone(User.find_by_username("inner"))
+
+    def test_connection_block_failure_rolls_back_only_its_writes(self):
+        with transaction():
+            User("kept", "hash", "student").create()
+            connection = get_connection()
+            with self.assertRaises(RuntimeError):
+                with connection as raw:
+                    raw.execute("INSERT INTO Users (username, password_hash, role) VALUES ('dropped', 'h', 'student')")
+                    raise RuntimeError("abort")
+            connection.close()
+        self.assertIsNotNone(User.find_by_username("kept"))
+        self.assertIsNone(User.find_by_username("dropped"))
+
+    def test_transaction_refuses_uncommitted_writes(self):
+        connection = get_connection()
+        connection.execute("INSERT INTO Users (username, password_hash, role) VALUES ('pending', 'h', 'student')")
+        with self.assertRaises(sqlite3.OperationalError):
+            with transaction():
+                User("other", "hash", "student").create()
+        self.assertEqual(self.count("Users"), 0)
+        connection.rollback()
+        connection.close()
+        self.assertIsNone(User.find_by_username("pending"))
+
+    def test_add_student_is_atomic(self):
+        answers = ["svc_user", "secret", "REG200", "Grace", "", "2024-01-01", "CS"]
+        with mock.patch("builtins.input", side_effect=answers), \
+                contextlib.redirect_stdout(io.StringIO()):
+            StudentService.add_student()
+        self.assertEqual(self.count("Users"), 0)
+        self.assertEqual(self.count("Students"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
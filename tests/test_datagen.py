@@ -0,0 +1,104 @@
+import contextlib
+import filecmp
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from app.database import configure_pool, initialize_db, DB_NAME
+from app.datagen import TABLES, DatasetGenerator, write_csv, write_sqlite
+from app.models import Grade, User
+from app.utils import verify_password
+
+SIZES = {"students": 300, "instructors": 12, "courses": 40, "enrollments": 3000}
+
+
+def generator(seed=1, **overrides):
+    return DatasetGenerator(seed=seed, hash_rounds=4, batch_size=100, **dict(SIZES, **overrides))
+
+
+class TestDatagen(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.tmpdir.name, "generated.db")
+        cls.counts = write_sqlite(generator(), cls.db_path)
+        cls.connection = sqlite3.connect(cls.db_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.connection.close()
+        configure_pool(DB_NAME)
+        cls.tmpdir.cleanup()
+
+    def scalar(self, query):
+        return self.connection.execute(query).fetchone()[0]
+
+    def test_row_counts(self):
+        self.assertEqual(self.counts["Students"], 300)
+        self.assertEqual(self.counts["Instructors"], 12)
+        self.assertEqual(self.counts["Courses"], 40)
+        self.assertEqual(self.counts["Users"], 1 + 12 + 300)
+        self.assertAlmostEqual(self.counts["Enrollments"], 3000, delta=300)
+        for table, count in self.counts.items():
+            self.assertEqual(self.scalar(f"SELECT COUNT(*) FROM {table}"), count, table)
+
+    def test_data_is_schema_valid(self):
+        self.assertEqual(self.connection.execute("PRAGMA foreign_key_check").fetchall(), [])
+        self.assertEqual(self.scalar("PRAGMA integrity_check"), "ok")
+        # Only finished, non-withdrawn enrollments are graded.
+        self.assertEqual(self.scalar("""
+            SELECT COUNT(*) FROM Grades g JOIN Enrollments e USING (enrollment_id) WHERE e.status != 'completed'
+        """), 0)
+        self.assertEqual(self.scalar("""
+            SELECT COUNT(*) FROM (
+                SELECT COUNT(*) AS enrolled, c.max_enrollment FROM Enrollments e JOIN Courses c USING (course_id)
+                GROUP BY e.course_id, e.year, e.semester
+            ) WHERE enrolled > max_enrollment
+        """), 0)
+
+    def test_database_is_migrated_and_usable(self):
+        configure_pool(self.db_path)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            initialize_db()
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(self.scalar("SELECT COUNT(*) FROM StudentGPA"),
+                         self.scalar("SELECT COUNT(DISTINCT student_id) FROM Enrollments WHERE status = 'completed'"))
+        user = User.find_by_username("staff00001")
+        self.assertTrue(verify_password("password", user[2]))
+        student_id = self.scalar("SELECT student_id FROM StudentGPA LIMIT 1")
+        self.assertAlmostEqual(Grade.calculate_gpa(student_id), Grade.get_gpa_record(student_id)[0], places=6)
+
+    def test_course_popularity_is_skewed(self):
+        sizes = [row[0] for row in self.connection.execute(
+            "SELECT COUNT(*) FROM Enrollments GROUP BY course_id ORDER BY 1 DESC")]
+        self.assertGreater(sizes[0], 5 * sizes[len(sizes) // 2])
+
+    def test_same_seed_gives_identical_csv(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first, second, other = (os.path.join(tmpdir, name) for name in ("first", "second", "other"))
+            counts = write_csv(generator(), first)
+            write_csv(generator(), second)
+            write_csv(generator(seed=2), other)
+            self.assertEqual(counts, self.counts)
+            names = [f"{table}.csv" for table in TABLES]
+            _, mismatch, errors = filecmp.cmpfiles(first, second, names, shallow=False)
+            self.assertEqual((mismatch, errors), ([], []))
+            _, mismatch, _ = filecmp.cmpfiles(first, other, names, shallow=False)
+            self.assertIn("Enrollments.csv", mismatch)
+            with open(os.path.join(first, "Grades.csv"), encoding="utf-8") as grades:
+                self.assertEqual(grades.readline().strip(), ",".join(TABLES["Grades"]))
+
+    def test_refuses_to_overwrite(self):
+        with self.assertRaises(FileExistsError):
+            write_sqlite(generator(), self.db_path)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_csv(generator(students=5, enrollments=10), tmpdir)
+            with self.assertRaises(FileExistsError):
+                write_csv(generator(students=5, enrollments=10), tmpdir)
+            write_csv(generator(students=5, enrollments=10), tmpdir, overwrite=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
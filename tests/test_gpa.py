@@ -0,0 +1,110 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from app.database import configure_pool, initialize_db, get_connection, DB_NAME
+from app.gpa import check_gpa_table, rebuild_gpa_table
+from app.grade_upload import upload_grades
+from app.models import Student, Course, Enrollment, Grade
+
+
+class TestStudentGPA(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        Student(None, "REG1", "Ada", "Lovelace", "2024-09-01", "CS", "active").create()
+        Student(None, "REG2", "Alan", "Turing", "2024-09-01", "CS", "active").create()
+        Course("CS101", "Intro", 3, 30, 1, "active").create()
+        Course("CS102", "Data", 4, 30, 1, "active").create()
+        self.student_ids = Student.find_ids_by_cohort()
+        course_ids = [Course.find_by_course_code(code)[0] for code in ("CS101", "CS102")]
+        Enrollment.bulk_enroll(self.student_ids, course_ids, 2024, "Fall")
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def enrollment_id(self, reg_no, course_code):
+        connection = get_connection()
+        enrollment_id = connection.execute("""
+            SELECT e.enrollment_id FROM Enrollments e
+            JOIN Students s ON s.student_id = e.student_id
+            JOIN Courses c ON c.course_id = e.course_id
+            WHERE s.reg_no = ? AND c.course_code = ?
+        """, (reg_no, course_code)).fetchone()[0]
+        connection.close()
+        return enrollment_id
+
+    def test_insert_updates_aggregate(self):
+        Grade(self.enrollment_id("REG1", "CS101"), numeric_grade=85, submitted_by=1).create()
+        Grade(self.enrollment_id("REG1", "CS102"), numeric_grade=65, submitted_by=1).create()
+        gpa, weighted_gpa, honours, grade_count = Grade.get_gpa_record(self.student_ids[0])
+        self.assertEqual(grade_count, 2)
+        self.assertEqual(gpa, Grade.calculate_gpa(self.student_ids[0]))
+        self.assertEqual(gpa, 4.5)
+        self.assertEqual(weighted_gpa, round((5.0 * 3 + 4.0 * 4) / 7, 2))
+        self.assertEqual(honours, "First Class Honours (1st)")
+        self.assertEqual(Grade.calculate_gpa(self.student_ids[1]), 0.0)
+
+    def test_update_and_delete(self):
+        upload_grades([("REG1", "CS101", 85), ("REG1", "CS102", 65)], submitted_by=1)
+        connection = get_connection()
+        connection.execute("UPDATE Grades SET numeric_grade = 45 WHERE enrollment_id = ?",
+                           (self.enrollment_id("REG1", "CS101"),))
+        connection.commit()
+        self.assertEqual(Grade.get_gpa_record(self.student_ids[0])[0], 3.0)
+
+        connection.execute("DELETE FROM Grades")
+        connection.commit()
+        connection.close()
+        self.assertEqual(Grade.get_gpa_record(self.student_ids[0])[3], 0)
+        self.assertEqual(check_gpa_table(), [])
+
+    def test_resubmission_keeps_table_consistent(self):
+        upload_grades([("REG1", "CS101", 85), ("REG2", "CS101", 30)], submitted_by=1)
+        upload_grades([("REG1", "CS101", 55), ("REG2", "CS102", 72)], submitted_by=1)
+        self.assertEqual(check_gpa_table(), [])
+        self.assertEqual(Grade.get_gpa_record(self.student_ids[1])[3], 2)
+
+    def test_checker_detects_drift_and_rebuild_fixes_it(self):
+        upload_grades([("REG1", "CS101", 85), ("REG2", "CS101", 30)], submitted_by=1)
+        connection = get_connection()
+        connection.execute("UPDATE StudentGPA SET gpa = 1.0 WHERE student_id = ?", (self.student_ids[0],))
+        connection.execute("DELETE FROM StudentGPA WHERE student_id = ?", (self.student_ids[1],))
+        connection.commit()
+        connection.close()
+
+        problems = check_gpa_table()
+        self.assertEqual({(student_id, field) for student_id, field, _, _ in problems},
+                         {(self.student_ids[0], 'gpa'), (self.student_ids[1], 'missing')})
+        rebuild_gpa_table()
+        self.assertEqual(check_gpa_table(), [])
+
+    def test_credit_change_reweights_aggregate(self):
+        upload_grades([("REG1", "CS101", 85), ("REG1", "CS102", 65), ("REG2", "CS102", 72)], submitted_by=1)
+        connection = get_connection()
+        connection.execute("UPDATE Courses SET credits = 6 WHERE course_code = 'CS102'")
+        connection.commit()
+        connection.close()
+        self.assertEqual(Grade.get_gpa_record(self.student_ids[0])[1], round((5.0 * 3 + 4.0 * 6) / 9, 2))
+        self.assertEqual(check_gpa_table(), [])
+
+    def test_checker_detects_stale_credits(self):
+        upload_grades([("REG1", "CS101", 85), ("REG1", "CS102", 65)], submitted_by=1)
+        connection = get_connection()
+        connection.execute("DROP TRIGGER trg_courses_gpa_credits")
+        connection.execute("UPDATE Courses SET credits = 6 WHERE course_code = 'CS102'")
+        connection.commit()
+        connection.close()
+
+        problems = check_gpa_table()
+        self.assertEqual({field for _, field, _, _ in problems}, {'total_credits', 'weighted_points', 'weighted_gpa'})
+        rebuild_gpa_table()
+        self.assertEqual(check_gpa_table(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from app.database import configure_pool, initialize_db, get_connection, DB_NAME
+from app.grade_upload import upload_grades, upload_grades_csv
+from app.grading import get_scale
+from app.models import Student, Course, Enrollment, Grade
+
+
+class TestGradeUpload(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        for i in range(3):
+            Student(None, f"REG{i}", "First", "Last", "2024-09-01", "CS", "active").create()
+        Course("CS101", "Intro", 3, 30, 1, "active").create()
+        Course("CS102", "Data", 3, 30, 1, "active").create()
+        course_id = Course.find_by_course_code("CS101")[0]
+        for student_id in Student.find_ids_by_cohort():
+            Enrollment(None, 2023, "Fall", student_id, course_id, "completed").create()
+            Enrollment(None, 2024, "Fall", student_id, course_id, "enrolled").create()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def grades(self):
+        connection = get_connection()
+        rows = connection.execute("""
+            SELECT s.reg_no, e.year, g.grade_value, g.numeric_grade, g.submitted_by
+            FROM Grades g
+            JOIN Enrollments e ON e.enrollment_id = g.enrollment_id
+            JOIN Students s ON s.student_id = e.student_id
+            ORDER BY s.reg_no
+        """).fetchall()
+        connection.close()
+        return rows
+
+    def test_upload_matches_latest_enrollment(self):
+        result = upload_grades([
+            ("REG0", "CS101", 85, "Great"),
+            ("REG1", "CS101", "64.5", None),
+            ("REG2", "CS101", 12),
+        ], submitted_by=1)
+        self.assertEqual(result.imported, 3)
+        self.assertEqual(result.rejects, [])
+        self.assertEqual(self.grades(), [
+            ("REG0", 2024, "A+", 85, 1),
+            ("REG1", 2024, "B", 64.5, 1),
+            ("REG2", 2024, "F", 12, 1),
+        ])
+
+    def test_upload_for_specific_term(self):
+        upload_grades([("REG0", "CS101", 70)], submitted_by=1, year=2023, semester="Fall")
+        self.assertEqual(self.grades()[0][1], 2023)
+
+    def test_rejects_and_resubmission(self):
+        upload_grades([("REG0", "CS101", 50)], submitted_by=1)
+        result = upload_grades([
+            ("REG0", "CS101", 40),
+            ("REG1", "CS102", 70),
+            ("REG9", "CS101", 70),
+            ("REG2", "CS101", "abc"),
+            ("REG2", "CS101", 101),
+            ("REG0", "CS101", 90),
+        ], submitted_by=1)
+        self.assertEqual(result.imported, 1)
+        self.assertEqual([line for line, _ in result.rejects], [1, 2, 3, 4, 5])
+        self.assertEqual(self.grades(), [("REG0", 2024, "A+", 90, 1)])
+
+    def test_rejects_other_instructors_course_and_short_rows(self):
+        Course("MA101", "Calculus", 3, 30, 2, "active").create()
+        Enrollment(None, 2024, "Fall", Student.find_ids_by_cohort()[0], Course.find_by_course_code("MA101")[0],
+                   "enrolled").create()
+        result = upload_grades([
+            ("REG0", "MA101", 70),
+            ("REG0", "CS101"),
+            ("REG1", "CS101", 60),
+        ], submitted_by=1)
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.rejects, [
+            (1, "MA101 is not your course."),
+            (2, "Expected reg_no, course_code and numeric_grade."),
+        ])
+        self.assertEqual(upload_grades([("REG1", "CS101", 90)], submitted_by=2).rejects,
+                         [(1, "CS101 is not your course.")])
+        self.assertEqual(self.grades(), [("REG1", 2024, "B-", 60, 1)])
+
+    def test_csv_upload(self):
+        path = os.path.join(self.tmpdir.name, "grades.csv")
+        with open(path, "w", encoding="utf-8") as csv_file:
+            csv_file.write("reg_no,course_code,numeric_grade,comments\nREG1,CS101,72,\nREG2,CS101,,\n")
+        result = upload_grades_csv(path, submitted_by=1)
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.rejects[0][0], 3)
+
+    def test_sql_grades_match_calculate_grade(self):
+        connection = get_connection()
+        for mark in range(0, 101):
+            sql_grade = connection.execute(f"SELECT {get_scale().sql_case('?1')}", (mark,)).fetchone()[0]
+            self.assertEqual(sql_grade, Grade.calculate_grade(None, mark), mark)
+        connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
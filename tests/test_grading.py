@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+from app.grading import GradingScale, get_scale, load_scales, GRADE_POINTS, HONOURS_CLASSIFICATIONS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def legacy_grade(numeric_grade):
+    for grade, details in GRADE_POINTS.items():
+        range_min, range_max = map(int, details['range'].split('-'))
+        if range_min <= numeric_grade <= range_max:
+            return grade
+    return 'F'
+
+
+class TestGradingScale(unittest.TestCase):
+    def setUp(self):
+        self.scale = get_scale()
+
+    def test_matches_range_table_for_whole_marks(self):
+        for mark in range(0, 101):
+            self.assertEqual(self.scale.classify(mark), legacy_grade(mark), mark)
+
+    def test_fractional_marks(self):
+        self.assertEqual(self.scale.classify(79.5), 'A')
+        self.assertEqual(self.scale.classify(79.99), 'A')
+        self.assertEqual(self.scale.classify(39.9), 'F')
+        self.assertEqual(self.scale.classify(64.5), 'B')
+
+    def test_out_of_range_marks(self):
+        self.assertEqual(self.scale.classify(-5), 'F')
+        self.assertEqual(self.scale.classify(120), 'A+')
+
+    def test_points_and_gpa(self):
+        self.assertEqual(self.scale.points(85), 5.0)
+        self.assertEqual(self.scale.gpa([85, 65, 30]), 3.0)
+        self.assertEqual(self.scale.gpa([]), 0.0)
+
+    def test_classify_many(self):
+        self.assertEqual(self.scale.classify_many([85, 72, 41, 12]), ['A+', 'A-', 'D-', 'F'])
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_classify_many_numpy(self):
+        marks = np.array([85, 72.5, 41, 12])
+        self.assertEqual(list(self.scale.classify_many(marks)), ['A+', 'A-', 'D-', 'F'])
+        self.assertEqual(list(self.scale.points_many(marks)), [5.0, 4.5, 1.0, 0.0])
+
+    def test_honours(self):
+        self.assertEqual(self.scale.classify_honours(72), 'First Class Honours (1st)')
+        self.assertEqual(self.scale.classify_honours(60), 'Upper Second Class Honours (2:1)')
+        self.assertEqual(self.scale.classify_honours(12), 'Fail')
+
+
+class TestNamedScales(unittest.TestCase):
+    def test_load_scales_from_config(self):
+        config = {
+            "pass_fail": {
+                "grade_points": {
+                    "P": {"points": 1.0, "range": "50-100"},
+                    "F": {"points": 0.0, "range": "0-49"},
+                },
+            },
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "scales.json")
+            with open(path, "w", encoding="utf-8") as config_file:
+                json.dump(config, config_file)
+            self.assertEqual(load_scales(path), ["pass_fail"])
+        scale = get_scale("pass_fail")
+        self.assertEqual(scale.classify(49.5), "F")
+        self.assertEqual(scale.classify(50), "P")
+        self.assertEqual(scale.classify_honours(75), HONOURS_CLASSIFICATIONS['First Class']['description'])
+
+    def test_unknown_scale(self):
+        with self.assertRaises(ValueError):
+            get_scale("nonexistent")
+
+    def test_empty_scale_rejected(self):
+        with self.assertRaises(ValueError):
+            GradingScale("empty", {}, HONOURS_CLASSIFICATIONS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from app.database import configure_pool, get_connection, initialize_db, transaction, DB_NAME
+from app.instrumentation import InstrumentedCursor, normalize_query, query_monitor, write_query_stats
+from app.models import Course, Student, User
+from app.services import ReportingService
+
+
+class TestNormalizeQuery(unittest.TestCase):
+    def test_literals_and_whitespace(self):
+        self.assertEqual(normalize_query("SELECT *\n  FROM Courses WHERE status = 'active' LIMIT 10;"),
+                         "SELECT * FROM Courses WHERE status = ? LIMIT ?")
+        self.assertEqual(normalize_query("SELECT 'it''s', -1.5, t1.x FROM t1"), "SELECT ?, ..., t1.x FROM t1")
+
+    def test_placeholder_lists_fold(self):
+        self.assertEqual(normalize_query("SELECT id FROM t WHERE id IN (?, ?, ?)"),
+                         normalize_query("SELECT id FROM t WHERE id IN (?,?)"))
+
+
+class TestEnvironment(unittest.TestCase):
+    def monitor_settings(self, **env):
+        script = "from app.instrumentation import query_monitor as m; print(m.enabled, m.slow_query_seconds)"
+        environment = {key: value for key, value in os.environ.items()
+                       if key not in ("STUDENT_DB_QUERY_STATS", "STUDENT_DB_SLOW_QUERY_MS")}
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        completed = subprocess.run([sys.executable, "-c", script], cwd=root, env={**environment, **env},
+                                   capture_output=True, text=True, check=True)
+        return completed.stdout.split()
+
+    def test_slow_query_threshold_implies_monitoring(self):
+        self.assertEqual(self.monitor_settings(), ["False", "0.1"])
+        self.assertEqual(self.monitor_settings(STUDENT_DB_SLOW_QUERY_MS="250"), ["True", "0.25"])
+        self.assertEqual(self.monitor_settings(STUDENT_DB_QUERY_STATS="1"), ["True", "0.1"])
+
+
+class TestQueryMonitor(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        query_monitor.reset()
+        query_monitor.enable(slow_query_ms=10_000)
+
+    def tearDown(self):
+        query_monitor.disable()
+        query_monitor.reset()
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def stats_for(self, fragment, exact=False):
+        matches = [query for query in query_monitor.get_stats()
+                   if (query['query'] == fragment if exact else fragment in query['query'])]
+        self.assertEqual(len(matches), 1, [query['query'] for query in query_monitor.get_stats()])
+        return matches[0]
+
+    def test_counts_rows_and_latency_per_shape(self):
+        for i in range(5):
+            User(f"user{i}", "hash", "student").create()
+        for i in range(3):
+            User.find_by_username(f"user{i}")
+        self.assertEqual(len(User.find_all()), 5)
+
+        insert = self.stats_for("INSERT INTO Users")
+        self.assertEqual((insert['count'], insert['rows']), (5, 5))
+        lookup = self.stats_for("WHERE username = ?")
+        self.assertEqual((lookup['count'], lookup['rows']), (3, 3))
+        self.assertEqual(self.stats_for("SELECT * FROM Users", exact=True)['rows'], 5)
+        self.assertGreater(lookup['total_s'], 0)
+        self.assertLessEqual(lookup['p50_s'], lookup['p99_s'])
+        self.assertLessEqual(lookup['p99_s'], lookup['max_s'])
+
+    def test_streamed_and_batched_statements(self):
+        with transaction() as connection:
+            connection.executemany(
+                "INSERT INTO Students (reg_no, first_name, last_name, admission_date, major, status) "
+                "VALUES (?, 'A', 'B', '2023-09-01', 'CS', 'active')",
+                ((f"R{i}",) for i in range(7)),
+            )
+        self.assertEqual(len(list(Student.stream(page_size=3))), 7)
+        self.assertEqual(self.stats_for("INSERT INTO Students")['rows'], 7)
+        self.assertEqual(self.stats_for("FROM Students ORDER BY")['rows'], 3)
+        self.assertEqual(self.stats_for("BEGIN")['count'], 1)
+
+    def test_slow_queries_are_logged_with_plan(self):
+        Course("CS101", "Intro", 3, 30, None, "active").create()
+        query_monitor.enable(slow_query_ms=0)
+        with self.assertLogs("app.slow_queries", level="WARNING") as logs:
+            Course.find_by_course_code("CS101")
+        slow = query_monitor.get_slow_queries()
+        self.assertEqual(len(slow), 1)
+        self.assertIn("course_code = ?", slow[0]['query'])
+        self.assertTrue(any("Courses" in line for line in slow[0]['plan']), slow[0]['plan'])
+        self.assertIn("Slow query", logs.output[0])
+        self.assertEqual(self.stats_for("course_code = ?")['slow'], 1)
+
+    def test_disabled_monitor_records_nothing(self):
+        query_monitor.disable()
+        User.find_all()
+        connection = get_connection()
+        self.assertNotIsInstance(connection.cursor(), InstrumentedCursor)
+        connection.close()
+        self.assertEqual(query_monitor.get_stats(), [])
+
+    def test_json_and_prometheus_dumps(self):
+        User.find_by_username('say "hi"')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path, prom_path = os.path.join(tmpdir, "stats.json"), os.path.join(tmpdir, "stats.prom")
+            write_query_stats(json_path)
+            write_query_stats(prom_path)
+            with open(json_path, encoding="utf-8") as json_file:
+                dump = json.load(json_file)
+            with open(prom_path, encoding="utf-8") as prom_file:
+                text = prom_file.read()
+        self.assertTrue(dump['enabled'])
+        self.assertIn("SELECT * FROM Users WHERE username = ?", [query['query'] for query in dump['queries']])
+        self.assertIn("# TYPE student_db_query_duration_seconds summary", text)
+        self.assertIn('student_db_query_duration_seconds_count{query="SELECT * FROM Users WHERE username = ?"} 1',
+                      text)
+        self.assertIn('quantile="0.99"', text)
+        for line in text.splitlines():
+            if not line.startswith("#"):
+                float(line.rsplit(" ", 1)[1])
+
+    def test_admin_report(self):
+        query_monitor.enable(slow_query_ms=0)
+        with self.assertLogs("app.slow_queries"):
+            User.find_all()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            stats = ReportingService.query_performance_report()
+        self.assertTrue(stats)
+        self.assertIn("SELECT * FROM Users", output.getvalue())
+        self.assertIn("SCAN Users", output.getvalue())
+
+    def test_admin_report_offers_to_enable(self):
+        query_monitor.disable()
+        with mock.patch('builtins.input', return_value="y"), contextlib.redirect_stdout(io.StringIO()):
+            ReportingService.query_performance_report()
+        self.assertTrue(query_monitor.enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
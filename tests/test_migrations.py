@@ -0,0 +1,101 @@
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from app.database import configure_pool, initialize_db, extract_table_creation_sql, DB_NAME
+from app.migrations import migrate, get_schema_version, LATEST_VERSION
+
+
+def create_baseline(path):
+    """
+    Builds a version-0 database from schema.sql, as older installs have.
+    """
+    with open("schema.sql", "r") as schema_file:
+        schema_script = schema_file.read()
+    connection = sqlite3.connect(path)
+    for table in ['Users', 'Students', 'Instructors', 'Courses', 'Enrollments', 'Grades']:
+        connection.execute(extract_table_creation_sql(schema_script, table))
+    connection.execute(
+        "INSERT INTO Courses (course_code, title, credits, max_enrollment, instructor_id, status) "
+        "VALUES ('CS101', 'Intro to CS', 3, 30, 1, 'active')"
+    )
+    connection.commit()
+    return connection
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        self.connection = create_baseline(self.db_path)
+
+    def tearDown(self):
+        self.connection.close()
+        self.tmpdir.cleanup()
+
+    def plan(self, query, parameters=()):
+        rows = self.connection.execute("EXPLAIN QUERY PLAN " + query, parameters).fetchall()
+        return " | ".join(row[3] for row in rows)
+
+    def test_migrates_existing_database_in_place(self):
+        self.assertEqual(get_schema_version(self.connection), 0)
+        applied = migrate(self.connection)
+        self.assertEqual([version for version, _ in applied], list(range(1, LATEST_VERSION + 1)))
+        self.assertEqual(get_schema_version(self.connection), LATEST_VERSION)
+        count = self.connection.execute("SELECT COUNT(*) FROM Courses").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_migrate_is_idempotent(self):
+        migrate(self.connection)
+        self.assertEqual(migrate(self.connection), [])
+
+    def test_enrollment_statistics_use_covering_indexes(self):
+        migrate(self.connection)
+        plan = self.plan("""
+            SELECT c.course_code, c.title, COUNT(e.student_id)
+            FROM Enrollments e
+            INNER JOIN Courses c ON e.course_id = c.course_id
+            WHERE c.status = 'active'
+            GROUP BY c.course_code, c.title
+        """)
+        self.assertIn("COVERING INDEX idx_enrollments_course", plan)
+        self.assertNotIn("SCAN e", plan)
+
+    def test_assigned_courses_use_covering_index(self):
+        migrate(self.connection)
+        plan = self.plan("""
+            SELECT course_id, course_code, title, credits, max_enrollment
+            FROM Courses
+            WHERE instructor_id = ?
+        """, (1,))
+        self.assertIn("COVERING INDEX idx_courses_instructor", plan)
+
+    def test_gpa_join_uses_covering_index(self):
+        migrate(self.connection)
+        plan = self.plan("""
+            SELECT numeric_grade FROM Grades
+            INNER JOIN Enrollments ON Grades.enrollment_id = Enrollments.enrollment_id
+            WHERE Enrollments.student_id = ?
+        """, (1,))
+        self.assertIn("COVERING INDEX idx_grades_enrollment", plan)
+        self.assertNotIn("SCAN", plan)
+
+    def test_student_status_uses_index(self):
+        migrate(self.connection)
+        plan = self.plan("SELECT * FROM Students WHERE status = ?", ("active",))
+        self.assertIn("idx_students_status", plan)
+
+    def test_initialize_db_applies_migrations(self):
+        configure_pool(self.db_path)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                initialize_db()
+        finally:
+            configure_pool(DB_NAME)
+        self.assertEqual(get_schema_version(self.connection), LATEST_VERSION)
+
+
+if __name__ == "__main__":
+    unittest.main()
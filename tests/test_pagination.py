@@ -0,0 +1,78 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from app.database import configure_pool, get_pool_stats, initialize_db, DB_NAME
+from app.models import BaseModel, Course, Instructor, Student, User
+from app.services import CourseService, StudentService
+
+
+class TestKeysetPagination(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        for i in range(25):
+            major = "CS" if i % 2 else "Math"
+            status = "graduated" if i % 5 == 0 else "active"
+            Student(None, f"REG{i:02d}", "First", f"Last{i}", "2023-09-01", major, status).create()
+        for i in range(7):
+            User(f"user{i}", "hash", "student" if i < 5 else "admin").create()
+        Instructor(None, "S1", "Alan", "Turing", "2020-01-01").create()
+        for i in range(6):
+            Course(f"CS{i}", f"Course {i}", 3, 30, 1 if i < 3 else None, "archived" if i == 5 else "active").create()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_pages_cover_table_in_order(self):
+        pages = list(Student.find_pages(page_size=10))
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([row for page in pages for row in page], Student.find_all())
+
+    def test_exact_multiple_of_page_size(self):
+        self.assertEqual([len(page) for page in Student.find_pages(page_size=5)], [5] * 5)
+
+    def test_filters(self):
+        rows = list(Student.stream(status="active", major="CS", page_size=3))
+        expected = [s for s in Student.find_all() if s[6] == "CS" and s[7] == "active"]
+        self.assertEqual(rows, expected)
+        self.assertEqual(len(list(User.stream(role="admin", page_size=1))), 2)
+        self.assertEqual(list(Student.stream(major="History")), [])
+
+    def test_courses_match_find_all(self):
+        self.assertEqual(list(Course.stream(page_size=2)), Course.find_all())
+        self.assertEqual(len(list(Course.stream(status=None, page_size=2))), 6)
+
+    def test_stream_is_lazy(self):
+        checkouts = get_pool_stats()['checkouts']
+        stream = Student.stream(page_size=10)
+        self.assertEqual(get_pool_stats()['checkouts'], checkouts)
+        next(stream)
+        self.assertEqual(get_pool_stats()['checkouts'], checkouts + 1)
+
+    def test_invalid_page_size(self):
+        with self.assertRaises(ValueError):
+            next(BaseModel.iter_pages("*", "Users", "user_id", page_size=0))
+
+    def test_paged_display_stops_on_request(self):
+        output = io.StringIO()
+        with mock.patch("builtins.input", side_effect=["", "", "q"]) as prompt, contextlib.redirect_stdout(output):
+            StudentService.view_all_students()
+        self.assertIn("20 shown", prompt.call_args[0][0])
+        self.assertIn("REG19", output.getvalue())
+        self.assertNotIn("REG24", output.getvalue())
+
+        output = io.StringIO()
+        with mock.patch("builtins.input", side_effect=[]), contextlib.redirect_stdout(output):
+            CourseService.view_all_courses()
+        self.assertIn("Alan Turing", output.getvalue())
+        self.assertNotIn("CS5", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from app.database import configure_pool, initialize_db, DB_NAME
+from app.grade_upload import upload_grades
+from app.models import Student, Course, Enrollment, Grade, Instructor
+from app.reports import cohort_standings, course_statistics, instructor_workloads
+
+
+class TestCohortStandings(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        cohort = [("REG1", "CS", "2023"), ("REG2", "CS", "2023"), ("REG3", "CS", "2024"),
+                  ("REG4", "Math", "2023"), ("REG5", "CS", "2023")]
+        for reg_no, major, year in cohort:
+            Student(None, reg_no, "First", reg_no, f"{year}-09-01", major, "active").create()
+        Course("CS101", "Intro", 3, 30, 1, "active").create()
+        Course("CS102", "Data", 3, 30, 1, "active").create()
+        course_ids = [Course.find_by_course_code(code)[0] for code in ("CS101", "CS102")]
+        Enrollment.bulk_enroll(Student.find_ids_by_cohort(), course_ids, 2024, "Fall")
+        upload_grades([
+            ("REG1", "CS101", 85), ("REG1", "CS102", 72),
+            ("REG2", "CS101", 55), ("REG2", "CS102", 58),
+            ("REG3", "CS101", 90), ("REG3", "CS102", 90),
+            ("REG4", "CS101", 30),
+            ("REG5", "CS101", 57), ("REG5", "CS102", 58),
+        ], submitted_by=1)
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_ranked_cohort(self):
+        standings = cohort_standings(major="CS", admission_year=2023)
+        self.assertEqual([s.reg_no for s in standings], ["REG1", "REG5", "REG2"])
+        self.assertEqual([s.rank for s in standings], [1, 2, 2])
+        self.assertEqual([s.percentile for s in standings], [66.7, 0.0, 0.0])
+        self.assertEqual(standings[0].honours, "First Class Honours (1st)")
+        self.assertEqual(standings[2].honours, "Lower Second Class Honours (2:2)")
+
+    def test_matches_per_student_calculation(self):
+        for standing in cohort_standings():
+            self.assertEqual(standing.gpa, Grade.calculate_gpa(standing.student_id))
+            self.assertEqual(standing.gpa, Grade.get_gpa_record(standing.student_id)[0])
+
+    def test_pure_python_ranking_matches(self):
+        with_default = cohort_standings()
+        # A None entry in sys.modules makes "import numpy" raise ImportError.
+        with mock.patch.dict(sys.modules, {"numpy": None}):
+            self.assertEqual(cohort_standings.__wrapped__(), with_default)
+
+    def test_empty_cohort(self):
+        self.assertEqual(cohort_standings(major="History"), [])
+
+
+class TestCourseStatistics(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        for i in range(6):
+            Student(None, f"REG{i}", "First", "Last", "2023-09-01", "CS", "active").create()
+        Course("CS101", "Intro", 3, 30, 1, "active").create()
+        Course("CS102", "Data", 3, 30, 1, "active").create()
+        Course("CS103", "Empty", 3, 30, 1, "active").create()
+        Course("MA101", "Calculus", 3, 30, 2, "active").create()
+        students = Student.find_ids_by_cohort()
+        cs101 = Course.find_by_course_code("CS101")[0]
+        Enrollment.bulk_enroll(students[:4], [cs101], 2023, "Fall")
+        Enrollment.bulk_enroll(students[2:], [cs101], 2024, "Fall")
+        Enrollment.bulk_enroll(students, [Course.find_by_course_code("CS102")[0]], 2024, "Fall")
+        self.fall_2023 = [85, 72, 40, 64]
+        upload_grades([(f"REG{i}", "CS101", mark) for i, mark in enumerate(self.fall_2023)],
+                      submitted_by=1, year=2023, semester="Fall")
+        upload_grades([("REG4", "CS101", 55), ("REG5", "CS101", 30)], submitted_by=1, year=2024, semester="Fall")
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_single_course(self):
+        marks = self.fall_2023 + [55, 30]
+        (stats,) = course_statistics(course_code="CS101")
+        self.assertEqual((stats.enrolled, stats.graded), (8, 6))
+        self.assertEqual(stats.mean, round(statistics.mean(marks), 2))
+        self.assertEqual(stats.median, statistics.median(marks))
+        self.assertEqual(stats.std_dev, round(statistics.pstdev(marks), 2))
+        self.assertEqual((stats.minimum, stats.maximum), (30, 85))
+        self.assertEqual(stats.histogram['A+'], 1)
+        self.assertEqual(stats.histogram['F'], 1)
+        self.assertEqual(sum(stats.histogram.values()), 6)
+
+    def test_breakdown_by_term(self):
+        fall_2023, fall_2024 = course_statistics(course_code="CS101", by_term=True)
+        self.assertEqual((fall_2023.year, fall_2023.enrolled, fall_2023.graded), (2023, 4, 4))
+        self.assertEqual(fall_2023.median, statistics.median(self.fall_2023))
+        self.assertEqual((fall_2024.year, fall_2024.enrolled, fall_2024.graded), (2024, 4, 2))
+        self.assertEqual(fall_2024.median, 42.5)
+
+    def test_all_instructor_courses(self):
+        stats = course_statistics(instructor_id=1)
+        self.assertEqual([s.course_code for s in stats], ["CS101", "CS102", "CS103"])
+        self.assertEqual((stats[1].enrolled, stats[1].graded, stats[1].mean), (6, 0, None))
+        self.assertEqual(stats[2].enrolled, 0)
+
+    def test_requires_one_selector(self):
+        with self.assertRaises(ValueError):
+            course_statistics()
+
+    def test_course_model_aggregates(self):
+        average, students = Course.get_course_aggregates("CS101")
+        self.assertEqual(students, 6)
+        self.assertEqual(len(Course.get_course_students("CS101")), 8)
+
+
+class TestInstructorWorkloads(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        Instructor(None, "S2", "Grace", "Hopper", "2020-01-01").create()
+        Instructor(None, "S1", "Alan", "Turing", "2020-01-01").create()
+        Instructor(None, "S3", "Idle", "Zed", "2020-01-01").create()
+        Course("CS101", "Intro", 3, 30, 1, "active").create()
+        Course("CS102", "Data", 4, 30, 1, "active").create()
+        Course("CS103", "Algorithms", 2, 30, 2, "active").create()
+        for reg_no in ("REG1", "REG2", "REG3"):
+            Student(None, reg_no, "First", reg_no, "2023-09-01", "CS", "active").create()
+        course_ids = [Course.find_by_course_code(code)[0] for code in ("CS101", "CS102")]
+        Enrollment.bulk_enroll(Student.find_ids_by_cohort(), course_ids, 2024, "Fall")
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_workloads(self):
+        workloads = instructor_workloads()
+        self.assertEqual([w.name for w in workloads], ["Grace Hopper", "Alan Turing", "Idle Zed"])
+        self.assertEqual(workloads[0][3:], (2, 7, 6))
+        self.assertEqual(workloads[1][3:], (1, 2, 0))
+        self.assertEqual(workloads[2][3:], (0, 0, 0))
+
+    def test_matches_per_instructor_count(self):
+        for workload in instructor_workloads():
+            self.assertEqual(workload.courses, Instructor.get_course_count(workload.instructor_id))
+
+    def test_single_instructor(self):
+        self.assertEqual([w.staff_no for w in instructor_workloads(instructor_id=2)], ["S1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from app.database import configure_pool, get_connection, initialize_db, DB_NAME
+from app.models import Course, Student
+from app.search import build_match_query, rebuild_search_index, search_courses, search_students
+from app.services import StudentService
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        students = [
+            ("CS/2023/001", "Alice", "Smith", "Computer Science", "active"),
+            ("CS/2023/002", "Alan", "Smithers", "Computer Science", "active"),
+            ("MA/2023/001", "Bob", "Alison", "Mathematics", "active"),
+            ("MA/2022/007", "José", "Núñez", "Mathematics", "graduated"),
+        ]
+        for reg_no, first_name, last_name, major, status in students:
+            Student(None, reg_no, first_name, last_name, "2023-09-01", major, status).create()
+        Course("CS101", "Introduction to Programming", 3, 30, None, "active").create()
+        Course("CS201", "Data Structures", 3, 30, None, "active").create()
+        Course("CS301", "Programming Languages", 3, 30, None, "archived").create()
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def reg_nos(self, text, **filters):
+        return [row[1] for row in search_students(text, **filters)]
+
+    def test_prefix_search_on_names(self):
+        self.assertEqual(sorted(self.reg_nos("smith")), ["CS/2023/001", "CS/2023/002"])
+        self.assertEqual(self.reg_nos("ali smi"), ["CS/2023/001"])
+
+    def test_reg_no_and_major(self):
+        self.assertEqual(self.reg_nos("MA 2022"), ["MA/2022/007"])
+        self.assertEqual(len(self.reg_nos("math")), 2)
+        self.assertEqual(self.reg_nos("math", status="active"), ["MA/2023/001"])
+
+    def test_diacritics_are_folded(self):
+        self.assertEqual(self.reg_nos("jose nunez"), ["MA/2022/007"])
+
+    def test_ranking_prefers_identifier_matches(self):
+        Course("CS401", "Prog Tips", 3, 30, None, "active").create()
+        Course("PROG1", "Basics", 3, 30, None, "active").create()
+        self.assertEqual([row[1] for row in search_courses("prog")][:2], ["PROG1", "CS401"])
+
+    def test_index_follows_updates_and_deletes(self):
+        student = Student.find_by_reg_no("CS/2023/001")
+        Student(student[1], *student[2:]).update("Alice", "Jones", "Computer Science", "active")
+        self.assertEqual(self.reg_nos("smith"), ["CS/2023/002"])
+        self.assertEqual(self.reg_nos("jones"), ["CS/2023/001"])
+        Student.delete("CS/2023/002")
+        self.assertEqual(self.reg_nos("smith"), [])
+
+    def test_courses(self):
+        self.assertEqual([row[1] for row in search_courses("program")], ["CS101"])
+        self.assertEqual(sorted(row[1] for row in search_courses("program", status=None)), ["CS101", "CS301"])
+        Course.delete("CS101")
+        self.assertEqual(search_courses("intro"), [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(build_match_query('NEAR(" OR *'), '"NEAR"* "OR"*')
+        self.assertIsNone(build_match_query("  -- "))
+        self.assertEqual(search_students('"'), [])
+
+    def test_rebuild_matches_triggers(self):
+        connection = get_connection()
+        connection.execute("DELETE FROM StudentSearch_idx")
+        connection.commit()
+        connection.close()
+        rebuild_search_index()
+        self.assertEqual(len(self.reg_nos("smith")), 2)
+
+    def test_service(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            rows = StudentService.search_students("alan")
+        self.assertEqual([row[1] for row in rows], ["CS/2023/002"])
+        self.assertIn("Alan Smithers", output.getvalue())
+
+    def test_service_lists_student_without_major(self):
+        connection = get_connection()
+        connection.execute("INSERT INTO Students (reg_no, first_name, last_name, admission_date, major, status) "
+                           "VALUES ('XX/2023/001', 'Alan', 'Nomajor', '2023-09-01', NULL, 'active')")
+        connection.commit()
+        connection.close()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            rows = StudentService.search_students("alan")
+        self.assertEqual(sorted(row[1] for row in rows), ["CS/2023/002", "XX/2023/001"])
+        self.assertIn("Alan Nomajor", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
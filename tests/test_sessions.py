@@ -0,0 +1,126 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from app.database import configure_pool, initialize_db, DB_NAME
+from app.models import Instructor, Student, User
+from app.services import AuthenticationService, SessionManager, role_required
+from app.sessions import SessionStore, session_store
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        for username, role in (("admin", "admin"), ("teacher", "instructor"), ("pupil", "student")):
+            User(username, "hash", role).create()
+        Instructor(User.find_by_username("teacher")[0], "S1", "Alan", "Turing", "2020-01-01").create()
+        Student(User.find_by_username("pupil")[0], "REG1", "Ada", "Lovelace", "2023-09-01", "CS", "active").create()
+        self.clock = FakeClock()
+        self.store = SessionStore(ttl=60, max_sessions=3, clock=self.clock)
+
+    def tearDown(self):
+        SessionManager.logout_user()
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_session_caches_profile(self):
+        session = self.store.create(User.find_by_username("teacher"))
+        self.assertEqual((session.username, session.role), ("teacher", "instructor"))
+        self.assertEqual((session.instructor_id, session.student_id), (1, None))
+        self.assertEqual(self.store.create(User.find_by_username("pupil")).student_id, 1)
+        self.assertGreaterEqual(len(session.token), 32)
+
+    def test_password_reset_revokes_sessions(self):
+        old_token = session_store.create(User.find_by_username("pupil")).token
+        other_token = session_store.create(User.find_by_username("teacher")).token
+        with mock.patch('app.services.hash_password', return_value="new-hash"), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(AuthenticationService.reset_password("pupil", "new password"))
+        self.assertIsNone(session_store.get(old_token))
+        self.assertIsNotNone(session_store.get(other_token))
+        self.assertEqual(User.find_by_username("pupil")[2], "new-hash")
+        session_store.revoke(other_token)
+
+    def test_tokens_are_unique(self):
+        user = User.find_by_username("admin")
+        self.assertNotEqual(self.store.create(user).token, self.store.create(user).token)
+
+    def test_ttl_is_sliding(self):
+        token = self.store.create(User.find_by_username("admin")).token
+        self.clock.now += 50
+        self.assertIsNotNone(self.store.get(token))
+        self.clock.now += 50
+        self.assertIsNotNone(self.store.get(token))
+        self.clock.now += 61
+        self.assertIsNone(self.store.get(token))
+        self.assertEqual(self.store.get_stats()['expired'], 1)
+
+    def test_lru_eviction(self):
+        user = User.find_by_username("admin")
+        first, second, third = (self.store.create(user).token for _ in range(3))
+        self.store.get(first)
+        self.store.create(user)
+        self.assertIsNone(self.store.get(second))
+        self.assertIsNotNone(self.store.get(first))
+        self.assertIsNotNone(self.store.get(third))
+        self.assertEqual(self.store.get_stats()['evicted'], 1)
+
+    def test_expired_sessions_are_purged_before_evicting(self):
+        user = User.find_by_username("admin")
+        old = self.store.create(user).token
+        self.clock.now += 30
+        live = [self.store.create(user).token for _ in range(2)]
+        self.clock.now += 31
+        self.store.create(user)
+        self.assertEqual(len(self.store), 3)
+        self.assertIsNone(self.store.get(old))
+        self.assertTrue(all(self.store.get(token) for token in live))
+        self.assertEqual(self.store.get_stats()['evicted'], 0)
+
+    def test_revoke(self):
+        admin = self.store.create(User.find_by_username("admin")).token
+        pupil = self.store.create(User.find_by_username("pupil")).token
+        self.assertTrue(self.store.revoke(admin))
+        self.assertFalse(self.store.revoke(admin))
+        self.assertEqual(self.store.revoke_user(User.find_by_username("pupil")[0]), 1)
+        self.assertIsNone(self.store.get(pupil))
+
+    def test_role_checks_do_not_query_database(self):
+        admin = session_store.create(User.find_by_username("admin")).token
+        pupil = session_store.create(User.find_by_username("pupil")).token
+        with mock.patch("app.database.ConnectionPool.checkout") as checkout, \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertTrue(SessionManager.has_role("admin", admin))
+            self.assertFalse(SessionManager.has_role("admin", pupil))
+            self.assertIsNotNone(role_required("student", pupil))
+            self.assertIsNone(role_required("admin", pupil))
+            self.assertIsNone(role_required("admin", "bogus"))
+        checkout.assert_not_called()
+        self.assertIn("admin role required", output.getvalue())
+        self.assertIn("not authenticated", output.getvalue())
+
+    def test_console_session(self):
+        SessionManager.login_user(User.find_by_username("teacher"))
+        self.assertTrue(SessionManager.has_role("instructor"))
+        self.assertEqual(SessionManager.get_instructor_id(), 1)
+        token = SessionManager.current_token
+        SessionManager.logout_user()
+        self.assertFalse(SessionManager.is_authenticated())
+        self.assertIsNone(session_store.get(token))
+
+
+if __name__ == "__main__":
+    unittest.main()
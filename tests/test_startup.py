@@ -0,0 +1,64 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from benchmarks.bench_startup import ROOT, prepare_database, time_startup
+from app.database import configure_pool, get_connection, initialize_db, DB_NAME
+
+# Generous, so slow CI machines pass; a regression back to eager imports of
+# multiprocessing and every service still shows up in the benchmark itself.
+STARTUP_BUDGET_SECONDS = 2.0
+
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        prepare_database(self.db_path)
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_initialize_db_on_current_schema_runs_one_pragma(self):
+        configure_pool(self.db_path, max_size=1)
+        connection = get_connection()
+        statements = []
+        connection.raw.set_trace_callback(statements.append)
+        connection.close()
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            initialize_db()
+
+        self.assertEqual(statements, ["PRAGMA user_version"])
+        self.assertEqual(output.getvalue(), "")
+
+    def test_initialize_db_still_creates_new_database(self):
+        configure_pool(os.path.join(self.tmpdir.name, "new.db"))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            initialize_db()
+        self.assertIn("Missing tables created", output.getvalue())
+
+    def test_menus_import_defers_heavy_modules(self):
+        script = ("import sys, app.menus; "
+                  "print(' '.join(m for m in ('bcrypt', 'multiprocessing', 'concurrent.futures.process', 'secrets', "
+                  "'numpy') "
+                  "if m in sys.modules))")
+        completed = subprocess.run([sys.executable, "-c", script], cwd=ROOT,
+                                   capture_output=True, text=True, check=True)
+        self.assertEqual(completed.stdout.strip(), "")
+
+    def test_startup_within_budget(self):
+        elapsed, imports, stdout = time_startup(self.db_path)
+        self.assertEqual(stdout, "")
+        self.assertIn("app.menus", [module for module, _, _ in imports])
+        self.assertLess(elapsed, STARTUP_BUDGET_SECONDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
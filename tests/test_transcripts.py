@@ -0,0 +1,95 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from app.database import configure_pool, get_connection, initialize_db, DB_NAME
+from app.grade_upload import upload_grades
+from app.models import Student, Course, Enrollment, Grade
+from app.services import StudentService
+from app.transcripts import fetch_transcripts, generate_transcripts, render_html, render_text, write_transcripts
+
+
+class TestTranscripts(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_pool(os.path.join(self.tmpdir.name, "test.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_db()
+        for i in range(5):
+            Student(None, f"CS/{i:03}/2020", "Student", f"No{i}", "2020-09-01", "CS", "graduated").create()
+        Course("CS101", "Intro <Programming>", 3, 30, 1, "active").create()
+        Course("CS102", "Data Structures", 4, 30, 1, "active").create()
+        self.student_ids = Student.find_ids_by_cohort(status="graduated")
+        Enrollment.bulk_enroll(self.student_ids, [Course.find_by_course_code("CS101")[0]], 2021, "Fall")
+        Enrollment.bulk_enroll(self.student_ids, [Course.find_by_course_code("CS102")[0]], 2022, "Spring")
+        upload_grades([(f"CS/{i:03}/2020", "CS101", 60 + i * 5) for i in range(5)], submitted_by=1)
+
+    def tearDown(self):
+        configure_pool(DB_NAME)
+        self.tmpdir.cleanup()
+
+    def test_fetch_groups_courses_by_term(self):
+        transcript = fetch_transcripts([self.student_ids[4]])[0]
+        self.assertEqual(transcript.reg_no, "CS/004/2020")
+        self.assertEqual([term for term, _ in transcript.terms()], [(2021, "Fall"), (2022, "Spring")])
+        self.assertEqual(transcript.gpa, 5.0)
+
+    def test_renderers(self):
+        transcript = fetch_transcripts([self.student_ids[0]])[0]
+        text = render_text(transcript)
+        self.assertIn("CS101", text)
+        self.assertIn("B-", text)
+        self.assertIn("Upper Second", text)
+        page = render_html(transcript)
+        self.assertIn("Intro &lt;Programming&gt;", page)
+        self.assertTrue(page.startswith("<!DOCTYPE html>"))
+
+    def test_generate_with_process_pool(self):
+        output_dir = os.path.join(self.tmpdir.name, "out")
+        progress = []
+        run = generate_transcripts(iter(self.student_ids), output_dir, workers=2, chunk_size=2,
+                                   progress=lambda r: progress.append(r.written))
+        self.assertEqual(run.written, 5)
+        self.assertEqual(run.chunks, 3)
+        self.assertEqual(progress[-1], 5)
+        self.assertEqual(len(os.listdir(output_dir)), 10)
+        path = os.path.join(output_dir, f"CS_002_2020_{self.student_ids[2]}.txt")
+        with open(path, encoding="utf-8") as transcript_file:
+            self.assertIn("CS/002/2020", transcript_file.read())
+
+    def test_similar_reg_nos_get_separate_files(self):
+        Student(None, "CS_000_2020", "Other", "Student", "2020-09-01", "CS", "graduated").create()
+        student_ids = Student.find_ids_by_cohort(status="graduated")
+        output_dir = os.path.join(self.tmpdir.name, "out")
+        os.makedirs(output_dir)
+        write_transcripts(student_ids, output_dir, formats=("txt",))
+        self.assertEqual(len(os.listdir(output_dir)), 6)
+
+    def test_gpa_uses_the_grades_shown(self):
+        connection = get_connection()
+        enrollment_id = connection.execute("""
+            SELECT enrollment_id FROM Enrollments e JOIN Courses c ON c.course_id = e.course_id
+            WHERE e.student_id = ? AND c.course_code = 'CS101'
+        """, (self.student_ids[4],)).fetchone()[0]
+        connection.close()
+        # A second grade row for the same enrollment, as a direct resubmission leaves.
+        Grade(enrollment_id, numeric_grade=30, submitted_by=1).create()
+        transcript = fetch_transcripts([self.student_ids[4]])[0]
+        self.assertEqual(transcript.courses[0][-1], 30)
+        self.assertEqual((transcript.gpa, transcript.weighted_gpa), (0.0, 0.0))
+        self.assertEqual(transcript.honours, "Fail")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            generate_transcripts(self.student_ids, self.tmpdir.name, formats=("pdf",))
+
+    def test_generate_transcript_service(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            transcript = StudentService.generate_transcript("CS/001/2020")
+        self.assertEqual(transcript.reg_no, "CS/001/2020")
+        self.assertIn("OFFICIAL TRANSCRIPT", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()